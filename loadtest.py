@@ -0,0 +1,409 @@
+"""Нагрузочный прогон проектов ya_news и ya_note без HTTP-сервера.
+
+WSGI-приложение из yanews/wsgi.py или yanote/wsgi.py вызывается
+напрямую из пула потоков или процессов. Запросы смешиваются: доля
+авторизованных (--authenticated) и доля POST среди них (--post).
+Сессии пользователей создаются заранее, без проверки пароля. Данные
+можно подготовить командами generate_news и generate_notes.
+
+Результат — JSON с p50/p95/p99 задержки и числом запросов в секунду,
+общими и по маршрутам, чтобы сравнивать прогоны между собой:
+
+    python loadtest.py ya_news --requests 5000 --concurrency 16
+
+С --cold-start вместо нагрузки замеряются старт нового процесса и
+первые запросы к нему без прогрева и с прогревом (медиана в мс):
+
+    python loadtest.py ya_news --cold-start 5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import import_module
+from pathlib import Path
+from urllib.parse import urlencode
+
+from shared.wsgi_client import call_wsgi
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Страницы, на которых замеряется первый запрос к новому процессу.
+COLD_START_ROUTES = {
+    'ya_news': ('news:home', 'users:login'),
+    'ya_note': ('notes:home', 'users:login'),
+}
+
+PROJECTS = {
+    'ya_news': 'yanews',
+    'ya_note': 'yanote',
+}
+
+_application = None
+
+
+def setup_django(project, settings_module=None):
+    """Настраивает Django проекта и возвращает его WSGI-приложение."""
+    sys.path.insert(0, str(BASE_DIR / project))
+    os.environ['DJANGO_SETTINGS_MODULE'] = (
+        settings_module or f'{PROJECTS[project]}.settings'
+    )
+    return import_module(f'{PROJECTS[project]}.wsgi').application
+
+
+def init_worker(project, settings_module):
+    global _application
+    _application = setup_django(project, settings_module)
+
+
+def perform(request):
+    """Выполняет один запрос плана и замеряет его длительность."""
+    route, method, path, cookies, data = request
+    started = time.perf_counter()
+    try:
+        status = call_wsgi(_application, method, path, cookies, data)
+    except Exception:
+        status = 0
+    return route, status, time.perf_counter() - started
+
+
+def percentile(sorted_values, share):
+    """Значение по методу ближайшего ранга."""
+    if not sorted_values:
+        return None
+    index = max(0, round(share * len(sorted_values) + 0.5) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def latency_summary(durations):
+    durations = sorted(durations)
+    return {
+        name: round(percentile(durations, share) * 1000, 3)
+        for name, share in (
+            ('p50', 0.5), ('p95', 0.95), ('p99', 0.99), ('max', 1.0)
+        )
+    } if durations else {}
+
+
+def create_sessions(usernames):
+    """Сессии и CSRF-токены пользователей для авторизованных запросов."""
+    from django.conf import settings
+    from django.contrib.auth import get_user_model, login
+    from django.http import HttpRequest
+    from django.middleware.csrf import get_token
+
+    engine = import_module(settings.SESSION_ENGINE)
+    sessions = {}
+    for user in get_user_model().objects.filter(username__in=usernames):
+        request = HttpRequest()
+        request.session = engine.SessionStore()
+        login(request, user, settings.AUTHENTICATION_BACKENDS[0])
+        request.session.save()
+        token = get_token(request)
+        sessions[user.pk] = (
+            {
+                settings.SESSION_COOKIE_NAME: request.session.session_key,
+                settings.CSRF_COOKIE_NAME: request.META['CSRF_COOKIE'],
+            },
+            token,
+        )
+    return sessions
+
+
+class NewsTraffic:
+    """Маршруты ya_news из news/urls.py и авторизации."""
+
+    search_words = ('город', 'матч', 'новый', 'погода', 'театр')
+
+    def __init__(self, users):
+        from news.models import Comment, News
+
+        self.news_ids = list(News.objects.values_list('pk', flat=True)[:1000])
+        self.own_comments = defaultdict(list)
+        for pk, author_id in Comment.objects.filter(
+            author_id__in=users
+        ).values_list('pk', 'author_id')[:10000]:
+            self.own_comments[author_id].append(pk)
+
+    def get(self, rng, user_id):
+        from django.urls import reverse
+
+        routes = ['news:home', 'news:archive', 'news:search', 'users:login']
+        if self.news_ids:
+            routes += ['news:detail', 'news:detail', 'news:comments']
+        if user_id is not None and self.own_comments[user_id]:
+            routes.append('news:edit')
+        route = rng.choice(routes)
+        if route in ('news:detail', 'news:comments'):
+            return route, reverse(route, args=(rng.choice(self.news_ids),))
+        if route == 'news:edit':
+            return route, reverse(
+                route, args=(rng.choice(self.own_comments[user_id]),)
+            )
+        if route == 'news:search':
+            return route, reverse(route) + '?' + urlencode(
+                {'q': rng.choice(self.search_words)}
+            )
+        return route, reverse(route)
+
+    def post(self, rng, user_id):
+        from django.urls import reverse
+
+        if not self.news_ids:
+            return None
+        return (
+            'news:detail',
+            reverse('news:detail', args=(rng.choice(self.news_ids),)),
+            {'text': f'Комментарий нагрузочного теста {uuid.uuid4().hex}'},
+        )
+
+
+class NotesTraffic:
+    """Маршруты ya_note из notes/urls.py и авторизации."""
+
+    def __init__(self, users):
+        from notes.models import Note
+
+        self.own_notes = defaultdict(list)
+        for slug, author_id in Note.objects.filter(
+            author_id__in=users
+        ).values_list('slug', 'author_id')[:10000]:
+            self.own_notes[author_id].append(slug)
+
+    def get(self, rng, user_id):
+        from django.urls import reverse
+
+        if user_id is None:
+            route = rng.choice(('notes:home', 'users:login', 'users:signup'))
+            return route, reverse(route)
+        routes = ['notes:home', 'notes:list', 'notes:add', 'notes:success']
+        if self.own_notes[user_id]:
+            routes += ['notes:detail', 'notes:detail', 'notes:edit']
+        route = rng.choice(routes)
+        if route in ('notes:detail', 'notes:edit'):
+            return route, reverse(
+                route, args=(rng.choice(self.own_notes[user_id]),)
+            )
+        return route, reverse(route)
+
+    def post(self, rng, user_id):
+        from django.urls import reverse
+
+        marker = uuid.uuid4().hex
+        return (
+            'notes:add',
+            reverse('notes:add'),
+            {
+                'title': 'Заметка нагрузочного теста',
+                'text': 'Текст',
+                'slug': f'load-{marker}',
+            },
+        )
+
+
+def build_plan(traffic, sessions, options):
+    rng = random.Random(options.seed)
+    user_ids = list(sessions)
+    plan = []
+    for _ in range(options.requests):
+        user_id = None
+        cookies = None
+        if user_ids and rng.random() < options.authenticated:
+            user_id = rng.choice(user_ids)
+            cookies, token = sessions[user_id]
+        post = (
+            traffic.post(rng, user_id)
+            if user_id is not None and rng.random() < options.post
+            else None
+        )
+        if post:
+            route, path, data = post
+            data['csrfmiddlewaretoken'] = token
+            plan.append((f'POST {route}', 'POST', path, cookies, data))
+        else:
+            route, path = traffic.get(rng, user_id)
+            prefix = 'GET' if user_id is None else 'GET auth'
+            plan.append((f'{prefix} {route}', 'GET', path, cookies, None))
+    return plan
+
+
+def run(plan, options):
+    if options.pool == 'process':
+        executor = ProcessPoolExecutor(
+            max_workers=options.concurrency,
+            initializer=init_worker,
+            initargs=(options.project, options.settings),
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=options.concurrency)
+    with executor:
+        # Прогрев: пул процессов поднимается, шаблоны компилируются.
+        list(executor.map(perform, plan[:options.concurrency]))
+        started = time.perf_counter()
+        results = list(executor.map(
+            perform, plan, chunksize=max(1, len(plan) // (
+                options.concurrency * 16
+            ))
+        ))
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def report(results, elapsed, options):
+    by_route = defaultdict(list)
+    statuses = Counter()
+    for route, status, duration in results:
+        by_route[route].append((status, duration))
+        statuses[status] += 1
+
+    def is_error(status):
+        return status == 0 or status >= 500
+
+    return {
+        'project': options.project,
+        'pool': options.pool,
+        'concurrency': options.concurrency,
+        'requests': len(results),
+        'elapsed': round(elapsed, 3),
+        'rps': round(len(results) / elapsed, 1) if elapsed else None,
+        'errors': sum(
+            count for status, count in statuses.items() if is_error(status)
+        ),
+        'statuses': {str(status): count for status, count in statuses.items()},
+        'latency_ms': latency_summary(
+            [duration for _, _, duration in results]
+        ),
+        'routes': {
+            route: {
+                'requests': len(items),
+                'errors': sum(is_error(status) for status, _ in items),
+                'latency_ms': latency_summary(
+                    [duration for _, duration in items]
+                ),
+            }
+            for route, items in sorted(by_route.items())
+        },
+    }
+
+
+def first_requests(project, settings_module, warmup):
+    """Старт нового процесса и первые запросы к нему.
+
+    Выполняется в отдельном интерпретаторе: замер включает импорт
+    Django, настройку приложения и, если он включён, прогрев.
+    """
+    os.environ['DJANGO_WARMUP'] = '1' if warmup else '0'
+    started = time.perf_counter()
+    application = setup_django(project, settings_module)
+    timings = {'startup': time.perf_counter() - started}
+
+    from django.urls import reverse
+
+    for route in COLD_START_ROUTES[project]:
+        path = reverse(route)
+        for attempt in ('first', 'second'):
+            started = time.perf_counter()
+            status = call_wsgi(application, 'GET', path)
+            timings[f'{attempt} {route}'] = time.perf_counter() - started
+            if status != 200:
+                raise RuntimeError(f'{path}: {status}')
+    return timings
+
+
+def cold_start_report(options):
+    settings_module = (
+        options.settings or f'{PROJECTS[options.project]}.settings_production'
+    )
+    context = multiprocessing.get_context('spawn')
+    result = {'project': options.project, 'settings': settings_module}
+    for name, warmup in (('cold', False), ('warm', True)):
+        runs = []
+        for _ in range(options.cold_start):
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                runs.append(executor.submit(
+                    first_requests, options.project, settings_module, warmup
+                ).result())
+        result[name] = {
+            key: round(statistics.median(
+                run[key] for run in runs
+            ) * 1000, 3)
+            for key in runs[0]
+        }
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('project', choices=sorted(PROJECTS))
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument(
+        '--pool', choices=('thread', 'process'), default='thread'
+    )
+    parser.add_argument(
+        '--authenticated', type=float, default=0.3,
+        help='Доля запросов от авторизованных пользователей.',
+    )
+    parser.add_argument(
+        '--post', type=float, default=0.05,
+        help='Доля POST среди авторизованных запросов.',
+    )
+    parser.add_argument('--user-prefix', default='user')
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument(
+        '--settings',
+        help='Модуль настроек, например yanews.settings_production.',
+    )
+    parser.add_argument(
+        '--cold-start', type=int, metavar='RUNS',
+        help='Вместо нагрузки замерить первый запрос в RUNS новых '
+             'процессах с прогревом и без него.',
+    )
+    parser.add_argument('--output', help='Файл для JSON вместо stdout.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    global _application
+    options = parse_args(argv)
+    if options.cold_start:
+        return write_output(cold_start_report(options), options)
+    _application = setup_django(options.project, options.settings)
+
+    from django.contrib.auth import get_user_model
+    from django.db import connections
+
+    usernames = get_user_model().objects.filter(
+        username__startswith=options.user_prefix
+    ).order_by('pk').values_list(
+        'username', flat=True
+    )[:options.sessions]
+    sessions = create_sessions(list(usernames))
+    traffic_class = (
+        NewsTraffic if options.project == 'ya_news' else NotesTraffic
+    )
+    plan = build_plan(traffic_class(list(sessions)), sessions, options)
+    # Соединения родителя не должны наследоваться процессами пула.
+    connections.close_all()
+    results, elapsed = run(plan, options)
+    write_output(report(results, elapsed, options), options)
+
+
+def write_output(result, options):
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if options.output:
+        Path(options.output).write_text(output + '\n', encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""Общий код проектов ya_news и ya_note.
+
+Каталог репозитория добавляется в sys.path из settings.py каждого
+проекта, пакет подключается как приложение Django ради команд
+управления и тегов шаблонов.
+"""
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class SharedConfig(AppConfig):
+    name = 'shared'
+
+    def ready(self):
+        from . import vendored  # noqa: F401
@@ -0,0 +1,13 @@
+"""Общий формат ETag проектов.
+
+Все валидаторы строятся одной функцией: md5 от значений, соединённых
+двоеточием. Кавычки добавляет condition или quote_etag при отдаче.
+"""
+import hashlib
+
+
+def make_etag(*values):
+    """Штамп ETag без кавычек из значений, влияющих на ответ."""
+    return hashlib.md5(
+        ':'.join(str(value) for value in values).encode()
+    ).hexdigest()
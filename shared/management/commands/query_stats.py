@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from shared.querybudget import aggregate_stats
+
+
+class Command(BaseCommand):
+    help = 'Сводка по SQL-запросам представлений из QUERY_BUDGET_STATS_FILE.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=3)
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Очистить файл статистики после вывода.'
+        )
+
+    def handle(self, *args, **options):
+        path = settings.QUERY_BUDGET_STATS_FILE
+        if not path:
+            raise CommandError('Не задан QUERY_BUDGET_STATS_FILE.')
+        try:
+            views = aggregate_stats(path)
+        except FileNotFoundError:
+            raise CommandError(f'Файл статистики {path} не найден.')
+        for name, view in sorted(
+            views.items(), key=lambda item: -item[1]['queries']
+        ):
+            requests = view['requests']
+            self.stdout.write(
+                f'{name}: запросов {requests}, '
+                f'SQL в среднем {view["queries"] / requests:.1f} '
+                f'(макс. {view["max_queries"]}), '
+                f'время SQL {view["duration"] / requests * 1000:.2f} мс'
+            )
+            for statement, count in view['repeated'].most_common(
+                options['top']
+            ):
+                self.stdout.write(f'    повторы {count}: {statement}')
+        if options['reset']:
+            open(path, 'w').close()
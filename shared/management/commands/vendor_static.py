@@ -0,0 +1,38 @@
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from shared.vendored import matches
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает сторонние файлы VENDORED_STATIC в первый каталог '
+        'STATICFILES_DIRS и проверяет их хэш SRI. С --check только '
+        'проверяет уже загруженные файлы, без сети.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true')
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        root = Path(settings.STATICFILES_DIRS[0])
+        for name, (url, integrity) in settings.VENDORED_STATIC.items():
+            path = root / name
+            if path.is_file() and matches(path.read_bytes(), integrity):
+                self.stdout.write(f'{name}: актуален')
+                continue
+            if options['check']:
+                raise CommandError(f'{name}: нет файла или не совпал хэш.')
+            with urlopen(url, timeout=options['timeout']) as response:
+                data = response.read()
+            if not matches(data, integrity):
+                raise CommandError(f'{name}: хэш {url} не совпал с SRI.')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            self.stdout.write(self.style.SUCCESS(
+                f'{name}: загружен, {len(data)} байт'
+            ))
@@ -0,0 +1,178 @@
+"""Учёт SQL-запросов на один HTTP-запрос.
+
+Middleware считает запросы, их суммарное время и повторы одинаковых
+выражений (признак N+1) и сравнивает число запросов с бюджетом
+представления. Настройки:
+
+QUERY_BUDGET — бюджет по умолчанию, None отключает проверку;
+QUERY_BUDGET_PER_VIEW — бюджеты по имени маршрута ('news:detail');
+QUERY_BUDGET_REPEATED_THRESHOLD — сколько одинаковых выражений
+считать N+1;
+QUERY_BUDGET_RAISE — бросать QueryBudgetExceeded вместо предупреждения
+в лог;
+QUERY_BUDGET_STATS_FILE — файл NDJSON для команды query_stats.
+
+Middleware работает и под ASGI. Текущий регистратор хранится в
+contextvar, и код, выполняющий запросы к БД в других потоках, может
+подключить его через recording().
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_stats_lock = threading.Lock()
+_current_recorder = contextvars.ContextVar('query_recorder', default=None)
+
+LITERALS_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r'\bIN \((?:\?|%s)(?:, (?:\?|%s))*\)')
+SPACES_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """Выражение без литералов: одинаково для запросов N+1."""
+    sql = LITERALS_RE.sub('?', SPACES_RE.sub(' ', sql.strip()))
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+class QueryRecorder:
+    """execute_wrapper, собирающий статистику запросов."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+@contextmanager
+def recording(recorder=None):
+    """Подключает регистратор ко всем соединениям текущего потока.
+
+    По умолчанию берётся регистратор текущего запроса, если он есть.
+    """
+    recorder = recorder or _current_recorder.get()
+    with ExitStack() as stack:
+        if recorder is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+        yield
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        token = _current_recorder.set(recorder)
+        try:
+            with recording(recorder):
+                response = self.get_response(request)
+        finally:
+            _current_recorder.reset(token)
+        self.process_stats(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = _current_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_recorder.reset(token)
+        self.process_stats(request, recorder)
+        return response
+
+    def process_stats(self, request, recorder):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else request.path_info
+        repeated = recorder.repeated(settings.QUERY_BUDGET_REPEATED_THRESHOLD)
+        if settings.QUERY_BUDGET_STATS_FILE:
+            write_stats(settings.QUERY_BUDGET_STATS_FILE, {
+                'view': view_name,
+                'queries': recorder.count,
+                'duration': recorder.duration,
+                'repeated': repeated,
+            })
+        budget = settings.QUERY_BUDGET_PER_VIEW.get(
+            view_name, settings.QUERY_BUDGET
+        )
+        problems = []
+        if budget is not None and recorder.count > budget:
+            problems.append(
+                f'{recorder.count} запросов при бюджете {budget}'
+            )
+        problems.extend(
+            f'{count} раз: {statement}'
+            for statement, count in repeated.items()
+        )
+        if not problems:
+            return
+        message = f'{request.method} {view_name}: ' + '; '.join(problems)
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def write_stats(path, record):
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with _stats_lock, open(path, 'a', encoding='utf-8') as stats_file:
+        stats_file.write(line)
+
+
+def aggregate_stats(path):
+    """Сводка по представлениям из файла QUERY_BUDGET_STATS_FILE."""
+    views = defaultdict(lambda: {
+        'requests': 0,
+        'queries': 0,
+        'max_queries': 0,
+        'duration': 0.0,
+        'repeated': Counter(),
+    })
+    with open(path, encoding='utf-8') as stats_file:
+        for line in stats_file:
+            record = json.loads(line)
+            view = views[record['view']]
+            view['requests'] += 1
+            view['queries'] += record['queries']
+            view['max_queries'] = max(view['max_queries'], record['queries'])
+            view['duration'] += record['duration']
+            view['repeated'].update(record['repeated'])
+    return dict(views)
@@ -0,0 +1,12 @@
+"""Бэкенд SQLite с настраиваемыми PRAGMA.
+
+ENGINE = 'shared.sqlite'. В OPTIONS можно передать:
+
+pragmas — словарь PRAGMA, дополняющий DEFAULT_PRAGMAS (None убирает
+PRAGMA из списка);
+read_only — соединение только для чтения (PRAGMA query_only), его
+использует маршрутизатор shared.routers.ReadReplicaRouter.
+
+Остальные ключи OPTIONS, как и в стандартном бэкенде, передаются
+в sqlite3.connect.
+"""
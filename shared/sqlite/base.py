@@ -0,0 +1,53 @@
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+# WAL позволяет читать во время записи, synchronous=NORMAL в режиме WAL
+# не рискует целостностью базы. Размеры: mmap — в байтах, отрицательный
+# cache_size — в КиБ.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+    'busy_timeout': 5000,
+}
+
+# Эти PRAGMA меняют файл базы, а не соединение.
+PERSISTENT_PRAGMAS = ('journal_mode',)
+
+PRAGMA_RE = re.compile(r'^[A-Za-z_]+$')
+VALUE_RE = re.compile(r'^-?\w+$')
+
+
+def get_pragmas(options):
+    pragmas = {**DEFAULT_PRAGMAS, **options.get('pragmas', {})}
+    if options.get('read_only'):
+        for name in PERSISTENT_PRAGMAS:
+            pragmas.pop(name, None)
+        pragmas['query_only'] = 'ON'
+    pragmas = {
+        name: value for name, value in pragmas.items() if value is not None
+    }
+    for name, value in pragmas.items():
+        if not PRAGMA_RE.match(name) or not VALUE_RE.match(str(value)):
+            raise ImproperlyConfigured(
+                f'Недопустимая PRAGMA в настройках БД: {name} = {value}'
+            )
+    return pragmas
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('read_only', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in get_pragmas(self.settings_dict['OPTIONS']).items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
@@ -0,0 +1,130 @@
+"""Статика из STATIC_ROOT без CDN.
+
+CompressedManifestStaticFilesStorage после collectstatic сохраняет
+рядом с каждым файлом с хэшем в имени сжатые копии .gz и, если
+установлен пакет brotli, .br. PrecompressedStaticFilesHandler и
+ASGIPrecompressedStaticFilesHandler отдают файлы из STATIC_ROOT
+в обход middleware, выбирая сжатую копию по Accept-Encoding. Файлы
+с хэшем в имени кэшируются навсегда (immutable), остальные — с
+обязательной перепроверкой.
+"""
+import gzip
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.handlers import (
+    ASGIStaticFilesHandler, StaticFilesHandler
+)
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Кодировки в порядке предпочтения.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def compress(data):
+    """Сжатые варианты содержимого: суффикс -> байты."""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data)
+    return variants
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    compress_extensions = ('.css', '.js', '.svg', '.json', '.txt', '.map')
+    compress_min_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(self.compress_extensions):
+                self.compress_file(name)
+
+    def compress_file(self, name):
+        path = Path(self.path(name))
+        data = path.read_bytes()
+        if len(data) < self.compress_min_size:
+            return
+        for suffix, compressed in compress(data).items():
+            if len(compressed) < len(data):
+                path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+def accepted_encodings(request):
+    return {
+        token.split(';')[0].strip()
+        for token in request.META.get('HTTP_ACCEPT_ENCODING', '').split(',')
+    }
+
+
+def serve_precompressed(request, path):
+    """Файл из STATIC_ROOT, сжатый заранее, если клиент это принимает."""
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404('Файл не найден.')
+    if not fullpath.is_file():
+        raise Http404('Файл не найден.')
+    mtime = fullpath.stat().st_mtime
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'), mtime
+    ):
+        return HttpResponseNotModified()
+    served, encoding = fullpath, None
+    accepted = accepted_encodings(request)
+    for name, suffix in ENCODINGS:
+        candidate = fullpath.with_name(fullpath.name + suffix)
+        if name in accepted and candidate.is_file():
+            served, encoding = candidate, name
+            break
+    content_type, _ = mimetypes.guess_type(fullpath.name)
+    response = FileResponse(
+        served.open('rb'),
+        content_type=content_type or 'application/octet-stream',
+        filename=fullpath.name,
+    )
+    response['Last-Modified'] = http_date(mtime)
+    if encoding is not None:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if HASHED_NAME_RE.search(fullpath.name):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+class PrecompressedMixin:
+
+    def serve(self, request):
+        return serve_precompressed(request, self.file_path(request.path))
+
+
+class PrecompressedStaticFilesHandler(PrecompressedMixin, StaticFilesHandler):
+    pass
+
+
+class ASGIPrecompressedStaticFilesHandler(
+    PrecompressedMixin, ASGIStaticFilesHandler
+):
+    pass
@@ -0,0 +1,17 @@
+"""Общие части генераторов синтетических данных.
+
+Используются командами generate_news и generate_notes.
+"""
+from itertools import accumulate
+
+
+def zipf_cum_weights(count, exponent):
+    """Накопленные веса Zipf: элемент ранга k весит 1 / k ** exponent."""
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, count + 1)
+    ))
+
+
+def sentence(rng, words, length, end=''):
+    """Фраза из length случайных слов words с заглавной буквы."""
+    return ' '.join(rng.choices(words, k=length)).capitalize() + end
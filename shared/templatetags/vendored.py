@@ -0,0 +1,33 @@
+"""Ссылки на сторонние файлы VENDORED_STATIC.
+
+Ссылка ведёт на свою статику. Только с DEBUG, пока файл не загружен
+командой vendor_static, она ведёт на источник из VENDORED_STATIC с тем
+же хэшем SRI. Без DEBUG отсутствующий файл не подменяется CDN: об этом
+сообщает manage.py check --deploy, см. shared/vendored.py.
+"""
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+def vendored_url(name):
+    # Файл ищется заново при каждом вызове: загруженный vendor_static
+    # файл подхватывается без перезапуска.
+    if settings.DEBUG and not finders.find(name):
+        url, _ = settings.VENDORED_STATIC[name]
+        return url
+    return static(name)
+
+
+@register.simple_tag
+def vendored_stylesheet(name):
+    _, integrity = settings.VENDORED_STATIC[name]
+    return format_html(
+        '<link rel="stylesheet" href="{}" integrity="{}" '
+        'crossorigin="anonymous">',
+        vendored_url(name), integrity,
+    )
@@ -0,0 +1,45 @@
+"""Сторонние файлы VENDORED_STATIC: проверка хэша SRI.
+
+Файлы загружает команда vendor_static. Проверка развёртывания
+(manage.py check --deploy) сообщает об ошибке, если файла нет или его
+хэш не совпал: без DEBUG страницы ссылаются только на свою статику.
+"""
+import base64
+import hashlib
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.checks import Error, Tags, register
+
+
+def sri_hash(data, algorithm):
+    digest = hashlib.new(algorithm, data).digest()
+    return f'{algorithm}-{base64.b64encode(digest).decode()}'
+
+
+def matches(data, integrity):
+    algorithm = integrity.split('-', 1)[0]
+    return sri_hash(data, algorithm) == integrity
+
+
+def is_vendored(name):
+    """Загружен ли файл name и совпал ли его хэш с VENDORED_STATIC."""
+    _, integrity = settings.VENDORED_STATIC[name]
+    path = finders.find(name)
+    return bool(path) and matches(Path(path).read_bytes(), integrity)
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_vendored_static(app_configs, **kwargs):
+    return [
+        Error(
+            f'Сторонний файл {name} не загружен или его хэш не совпал '
+            'с VENDORED_STATIC.',
+            hint='Выполните manage.py vendor_static и сохраните файл '
+                 'в репозитории.',
+            id='shared.E001',
+        )
+        for name in getattr(settings, 'VENDORED_STATIC', {})
+        if not is_vendored(name)
+    ]
@@ -0,0 +1,75 @@
+"""Прогрев процесса до первого запроса.
+
+Компилирует все шаблоны из каталогов TEMPLATES['DIRS'] и шаблоны
+виджетов форм (с кэширующим загрузчиком они остаются в памяти), строит
+таблицы reverse() всех пространств имён URL и загружает каталог
+переводов. Вызывается из
+wsgi.py и asgi.py, если включён WARMUP_ON_START.
+"""
+import logging
+import time
+from pathlib import Path
+
+from django import forms
+from django.conf import settings
+from django.forms.renderers import get_default_renderer
+from django.template import engines
+from django.urls import URLResolver, get_resolver
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+
+def warm_templates():
+    """Компилирует шаблоны проекта; возвращает их число."""
+    count = 0
+    for engine in engines.all():
+        for directory in engine.engine.dirs:
+            directory = Path(directory)
+            for path in sorted(directory.rglob('*.html')):
+                engine.get_template(path.relative_to(directory).as_posix())
+                count += 1
+    return count
+
+
+def warm_form_widgets():
+    """Компилирует шаблоны виджетов в движке отрисовщика форм."""
+    renderer = get_default_renderer()
+    directory = Path(forms.__file__).parent / 'templates'
+    count = 0
+    for path in sorted(directory.glob('django/forms/widgets/*.html')):
+        renderer.get_template(path.relative_to(directory).as_posix())
+        count += 1
+    return count
+
+
+def warm_urls(resolver=None):
+    """Компилирует шаблоны URL и таблицы reverse(); возвращает число
+    именованных маршрутов.
+    """
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    count = 0
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            count += warm_urls(pattern)
+        elif pattern.name:
+            count += 1
+    return count
+
+
+def warm_up():
+    started = time.perf_counter()
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('')
+    stats = {
+        'templates': warm_templates() + warm_form_widgets(),
+        'urls': warm_urls(),
+        'seconds': time.perf_counter() - started,
+    }
+    logger.info(
+        'Прогрев: %(templates)d шаблонов, %(urls)d маршрутов '
+        'за %(seconds).3f с', stats
+    )
+    return stats
@@ -0,0 +1,43 @@
+"""Вызов WSGI-приложения без HTTP-сервера.
+
+Используется loadtest.py и командой bench_asgi.
+"""
+import io
+import sys
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+
+def call_wsgi(application, method, path, cookies=None, data=None):
+    """Выполняет запрос и возвращает код ответа."""
+    path, _, query = path.partition('?')
+    body = urlencode(data or {}).encode()
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost',
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.url_scheme': 'http',
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if cookies:
+        cookie = SimpleCookie(cookies)
+        environ['HTTP_COOKIE'] = cookie.output(header='', sep=';').strip()
+    statuses = []
+    response = application(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return int(statuses[0].split()[0])
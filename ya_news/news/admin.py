@@ -1,11 +1,51 @@
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.forms.models import BaseInlineFormSet
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.html import format_html
 
 from .models import Comment, News
+from .pagination import EstimatedCountPaginator
 
 
-class CommentInline(admin.StackedInline):
+class LatestCommentsFormSet(BaseInlineFormSet):
+    """Только последние комментарии новости, а не все её комментарии."""
+
+    limit = 20
+
+    def get_queryset(self):
+        if not hasattr(self, '_latest_queryset'):
+            self._latest_queryset = super().get_queryset().order_by(
+                '-created', '-pk'
+            )[:self.limit]
+        return self._latest_queryset
+
+
+class CommentInline(admin.TabularInline):
+    """Последние комментарии только для чтения.
+
+    Все комментарии новости редактируются в CommentAdmin, ссылка на
+    отфильтрованный список есть на странице новости.
+    """
     model = Comment
+    formset = LatestCommentsFormSet
+    fields = ('author', 'text', 'created')
+    readonly_fields = fields
     extra = 0
+    can_delete = False
+    show_change_link = True
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(News)
@@ -13,3 +53,73 @@ class NewsAdmin(admin.ModelAdmin):
     inlines = [
         CommentInline,
     ]
+    list_display = ('title', 'date', 'comment_count')
+    readonly_fields = ('comment_count', 'all_comments')
+    search_fields = ('title',)
+    date_hierarchy = 'date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description='Все комментарии')
+    def all_comments(self, obj):
+        if obj.pk is None:
+            return '-'
+        url = reverse('admin:news_comment_changelist')
+        return format_html(
+            '<a href="{}?news__id__exact={}">{} шт.</a>',
+            url, obj.pk, obj.comment_count,
+        )
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'news', 'author', 'created')
+    list_select_related = ('news', 'author')
+    raw_id_fields = ('news', 'author')
+    # Новые сначала по первичному ключу: индекса, который начинается
+    # с created, нет, и Meta.ordering или date_hierarchy по created
+    # сортировали бы всю таблицу на каждой странице списка.
+    ordering = ('-pk',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ('delete_all_comments_by_authors',)
+
+    def delete_queryset(self, request, queryset):
+        """Массовое удаление одной инструкцией, без сигналов."""
+        queryset.bulk_delete()
+
+    @admin.action(
+        description='Удалить ВСЕ комментарии авторов выбранных комментариев',
+        permissions=('delete',),
+    )
+    def delete_all_comments_by_authors(self, request, queryset):
+        """Удаляет все комментарии авторов, а не только выбранные.
+
+        Как и delete_selected, сначала показывает страницу
+        подтверждения с авторами и числом их комментариев.
+        """
+        author_ids = set(queryset.values_list('author_id', flat=True))
+        comments = Comment.objects.filter(author__in=author_ids)
+        if request.POST.get('post'):
+            deleted = comments.bulk_delete()
+            self.message_user(request, f'Удалено комментариев: {deleted}')
+            return None
+        authors = get_user_model().objects.filter(
+            pk__in=author_ids
+        ).annotate(comments=Count('comment')).order_by('username')
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request,
+            'admin/news/comment/delete_authors_comments.html',
+            {
+                **self.admin_site.each_context(request),
+                'title': 'Удалить все комментарии авторов?',
+                'opts': self.model._meta,
+                'media': self.media,
+                'queryset': queryset,
+                'authors': authors,
+                'count': sum(author.comments for author in authors),
+                'action': 'delete_all_comments_by_authors',
+                'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
@@ -0,0 +1,135 @@
+"""JSON API чтения новостей и комментариев.
+
+Лента новостей и комментарии новости отдаются страницами по ключу
+с подписанным курсором и ETag. Выгрузка всех новостей или комментариев
+идёт потоком NDJSON: строки читаются из БД пачками
+NEWS_API_EXPORT_CHUNK_SIZE, поэтому память не зависит от объёма.
+"""
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import condition, require_safe
+
+from shared.etags import make_etag
+from .cache import get_generation
+from .conditional import news_etag
+from .models import Comment, News
+from .pagination import KeysetPaginator
+
+NEWS_FIELDS = ('id', 'title', 'date', 'excerpt', 'comment_count')
+COMMENT_FIELDS = ('id', 'news_id', 'author_username', 'created', 'text')
+JSON_PARAMS = {'ensure_ascii': False}
+
+
+def comment_values(queryset):
+    return queryset.annotate(
+        author_username=F('author__username')
+    ).values(*COMMENT_FIELDS)
+
+
+def page_etag(base, request):
+    """Версия данных и курсор страницы, свёрнутые в ETag."""
+    if not base:
+        return None
+    cursor = request.GET.get('cursor', '')
+    return make_etag(base, cursor)
+
+
+def feed_etag(request):
+    return page_etag(get_generation(), request)
+
+
+def comments_etag(request, pk):
+    return page_etag(news_etag(request, pk), request)
+
+
+def page_response(request, page):
+    next_url = None
+    if page.has_next:
+        next_url = request.path + '?' + urlencode({
+            'cursor': page.next_cursor
+        })
+    return JsonResponse(
+        {'results': list(page), 'next': next_url},
+        json_dumps_params=JSON_PARAMS,
+    )
+
+
+@require_safe
+@condition(etag_func=feed_etag)
+def news_list(request):
+    """Лента новостей, от новых к старым."""
+    paginator = KeysetPaginator(
+        News.objects.values(*NEWS_FIELDS),
+        keys=('-date', '-id'),
+        per_page=settings.NEWS_API_PAGE_SIZE,
+    )
+    return page_response(request, paginator.get_page(
+        request.GET.get('cursor')
+    ))
+
+
+@require_safe
+@condition(etag_func=news_etag)
+def news_detail(request, pk):
+    news = News.objects.filter(pk=pk).values(*NEWS_FIELDS, 'text').first()
+    if news is None:
+        raise Http404('Новость не найдена.')
+    news['comments'] = reverse('news:api_comments', args=(pk,))
+    return JsonResponse(news, json_dumps_params=JSON_PARAMS)
+
+
+@require_safe
+@condition(etag_func=comments_etag)
+def news_comments(request, pk):
+    """Комментарии новости в порядке написания."""
+    if not News.objects.filter(pk=pk).exists():
+        raise Http404('Новость не найдена.')
+    paginator = KeysetPaginator(
+        comment_values(Comment.objects.filter(news_id=pk)),
+        keys=('created', 'id'),
+        per_page=settings.NEWS_API_PAGE_SIZE,
+    )
+    return page_response(request, paginator.get_page(
+        request.GET.get('cursor')
+    ))
+
+
+EXPORTS = {
+    'news': lambda: News.objects.order_by('pk').values(*NEWS_FIELDS, 'text'),
+    'comments': lambda: comment_values(Comment.objects.order_by('pk')),
+}
+
+
+def ndjson_chunks(rows, chunk_size):
+    """Строки NDJSON, склеенные пачками: по одной записи в ответ
+    сервер писал бы слишком мелкими кусками.
+    """
+    encode = DjangoJSONEncoder(**JSON_PARAMS).encode
+    lines = []
+    for row in rows:
+        lines.append(encode(row))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+@require_safe
+def export(request, kind):
+    """Все новости или все комментарии потоком NDJSON."""
+    if kind not in EXPORTS:
+        raise Http404('Неизвестная выгрузка.')
+    chunk_size = settings.NEWS_API_EXPORT_CHUNK_SIZE
+    rows = EXPORTS[kind]().iterator(chunk_size=chunk_size)
+    response = StreamingHttpResponse(
+        ndjson_chunks(rows, chunk_size),
+        content_type='application/x-ndjson; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{kind}.ndjson"'
+    return response
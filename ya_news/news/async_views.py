@@ -0,0 +1,151 @@
+"""Асинхронные представления чтения для работы под ASGI.
+
+Синхронный ORM вызывается в отдельном ограниченном пуле потоков
+(NEWS_ASYNC_DB_WORKERS), а не через единственный поток
+thread_sensitive-режима sync_to_async. Шаблоны рендерятся прямо в
+цикле событий: к этому моменту все данные, включая request.user,
+уже загружены, и рендеринг к БД не обращается.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import Http404, HttpResponseNotAllowed
+from django.shortcuts import get_object_or_404, render
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.log import log_response
+
+from shared.querybudget import recording
+from . import views_count
+from .conditional import news_etag
+from .forms import CommentForm
+from .models import News
+from .views import (
+    NewsComment, add_pending_comments, get_comments_page,
+    render_home_news_list
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.NEWS_ASYNC_DB_WORKERS,
+                    thread_name_prefix='news-db',
+                )
+    return _executor
+
+
+def _call_with_connection(func, *args):
+    # Соединения потоков пула живут дольше запроса: закрываем устаревшие
+    # так же, как это делают сигналы начала и конца запроса.
+    close_old_connections()
+    with recording():
+        return func(*args)
+
+
+async def run_db(func, *args):
+    """Выполняет синхронную работу с БД в пуле потоков.
+
+    Контекст (например, urlconf запроса) копируется в поток пула.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(),
+        functools.partial(context.run, _call_with_connection, func, *args),
+    )
+
+
+def require_http_methods(methods):
+    """Асинхронный аналог django.views.decorators.http.
+
+    Декораторы Django 3.2 оборачивают представление синхронной
+    функцией, и обработчик не распознал бы в нём корутину.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in methods:
+                response = HttpResponseNotAllowed(methods)
+                log_response(
+                    'Method Not Allowed (%s): %s', request.method,
+                    request.path, response=response, request=request,
+                )
+                return response
+            return await view(request, *args, **kwargs)
+        return inner
+    return decorator
+
+
+require_safe = require_http_methods(['GET', 'HEAD'])
+
+
+def load_user(request):
+    """Загружает ленивого request.user, пока мы в потоке пула."""
+    return request.user.is_authenticated
+
+
+def post_comment(request, pk):
+    with recording():
+        return NewsComment.as_view()(request, pk=pk)
+
+
+def home_context(request):
+    load_user(request)
+    return {'news_list': render_home_news_list(
+        News.objects.defer('text')[:settings.NEWS_COUNT_ON_HOME_PAGE]
+    )}
+
+
+def detail_context(request, pk):
+    news = get_object_or_404(News, pk=pk)
+    context = {
+        'object': news,
+        'news': news,
+        'comments': get_comments_page(pk),
+    }
+    add_pending_comments(request, pk, context['comments'])
+    if load_user(request):
+        context['form'] = CommentForm()
+    return context
+
+
+@require_safe
+async def news_list(request):
+    """Асинхронная главная страница."""
+    context = await run_db(home_context, request)
+    return render(request, 'news/home.html', context)
+
+
+@require_http_methods(['GET', 'HEAD', 'POST'])
+async def news_detail(request, pk):
+    """Асинхронная страница новости с условным GET.
+
+    Отправка комментария остаётся синхронной.
+    """
+    if request.method == 'POST':
+        return await sync_to_async(post_comment)(request, pk)
+    etag = await run_db(news_etag, request, pk)
+    if etag is None:
+        raise Http404('Новость не найдена.')
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        context = await run_db(detail_context, request, pk)
+        response = render(request, 'news/detail.html', context)
+    response['ETag'] = etag
+    if views_count.hit(request, pk, response):
+        await run_db(views_count.counter.flush)
+    return response
@@ -0,0 +1,90 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+GENERATION_KEY = 'news:generation'
+FRAGMENT_KEY = 'news:fragment:{name}'
+VERSIONED_KEY = 'news:versioned:{name}'
+
+
+def get_cache():
+    return caches[settings.NEWS_CACHE_ALIAS]
+
+
+def get_generation():
+    """Текущее поколение данных новостей.
+
+    Если ключа нет (кэш очищен или запись вытеснена), поколение
+    начинается с текущего времени в наносекундах: так оно никогда
+    не совпадёт с поколением уже закэшированных фрагментов.
+    """
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """Инвалидирует все фрагменты, построенные по новостям."""
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        get_generation()
+
+
+def cached_fragment(name, build):
+    """Возвращает фрагмент текущего поколения, при промахе строит его.
+
+    В режиме NEWS_CACHE_STALE_WHILE_REVALIDATE фрагмент хранится под
+    постоянным ключом вместе с поколением. После инвалидации его
+    пересобирает только процесс, взявший блокировку через cache.add(),
+    остальные до окончания сборки отдают прежнюю версию.
+    """
+    cache = get_cache()
+    generation = get_generation()
+    timeout = settings.NEWS_CACHE_TIMEOUT
+    key = FRAGMENT_KEY.format(name=name)
+    if not settings.NEWS_CACHE_STALE_WHILE_REVALIDATE:
+        key = f'{key}:{generation}'
+        content = cache.get(key)
+        if content is None:
+            content = build()
+            cache.set(key, content, timeout)
+        return content
+
+    cached = cache.get(key)
+    lock_key = f'{key}:lock'
+    locked = False
+    if cached is not None:
+        cached_generation, content = cached
+        if cached_generation == generation:
+            return content
+        locked = cache.add(lock_key, 1, settings.NEWS_CACHE_LOCK_TIMEOUT)
+        if not locked:
+            return content
+    content = build()
+    cache.set(key, (generation, content), timeout)
+    if locked:
+        cache.delete(lock_key)
+    return content
+
+
+def cached_version(name, version, build):
+    """Содержимое, закэшированное вместе с версией своих данных.
+
+    В отличие от cached_fragment не зависит от поколения: пересобирается
+    только при смене version, которую вызывающий код вычисляет по
+    своим строкам.
+    """
+    cache = get_cache()
+    key = VERSIONED_KEY.format(name=name)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    content = build()
+    cache.set(key, (version, content), settings.NEWS_CACHE_TIMEOUT)
+    return content
@@ -0,0 +1,48 @@
+from django.db.models import OuterRef, Subquery
+
+from shared.etags import make_etag
+
+from .cache import get_generation
+from .ingest import pending_entries
+from .models import Comment, News
+
+
+def news_etag(request, pk):
+    """Штамп ETag страницы новости без её рендеринга; None, если её нет.
+
+    Дата новости, число и последний комментарий читаются одним
+    запросом; результат запоминается на request. Правка текста
+    комментария или новости не меняет эти поля, поэтому в ETag входит
+    поколение данных новостей, а также пользователь: от него зависят
+    ссылки на редактирование комментариев, и число комментариев
+    автора, ещё ждущих в очереди записи. Записанное число просмотров
+    тоже выводится на странице и входит в ETag.
+
+    Last-Modified не отдаётся: ни одно время не растёт при удалении
+    комментария и не отличает страницы разных пользователей.
+    """
+    if not hasattr(request, '_news_etag'):
+        # Последний комментарий берётся с конца индекса (news, created,
+        # id), а не агрегатом по всем комментариям новости. Без order_by:
+        # first() отсортировал бы результат во временном B-дереве.
+        last = Comment.objects.filter(news_id=OuterRef('pk')).order_by(
+            '-created', '-pk'
+        )
+        row = next(iter(News.objects.filter(pk=pk).order_by().annotate(
+            last_comment=Subquery(last.values('created')[:1]),
+            last_comment_pk=Subquery(last.values('pk')[:1]),
+        ).values_list(
+            'date', 'comment_count', 'views_count',
+            'last_comment', 'last_comment_pk',
+        )[:1]), None)
+        request._news_etag = None
+        if row is not None:
+            (date, comment_count, views_count,
+             last_comment, last_comment_pk) = row
+            request._news_etag = make_etag(
+                pk, date, comment_count, views_count,
+                last_comment, last_comment_pk,
+                get_generation(), request.user.pk,
+                len(pending_entries(request, pk)),
+            )
+    return request._news_etag
@@ -0,0 +1,90 @@
+"""Ленты RSS и Atom последних новостей.
+
+Готовая лента кэшируется вместе с версией: хэшем pk и времени
+изменения новостей, попадающих в ленту. Пока они не менялись, лента
+не пересобирается, а клиенту с тем же ETag отвечаем 304.
+"""
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition, require_safe
+
+from shared.etags import make_etag
+from .cache import cached_version
+from .models import News
+
+
+def latest_news():
+    return News.objects.defer('text').order_by('-date', '-pk')[
+        :settings.NEWS_FEED_SIZE
+    ]
+
+
+def feed_version(request):
+    """Версия ленты; запоминается на request, как news_etag."""
+    if not hasattr(request, '_feed_version'):
+        rows = latest_news().values_list('pk', 'updated')
+        request._feed_version = make_etag(
+            request.build_absolute_uri('/'),
+            *(f'{pk}@{updated.isoformat()}' for pk, updated in rows),
+        )
+    return request._feed_version
+
+
+class LatestNewsFeed(Feed):
+    title = 'YaNews'
+    description = 'Последние новости'
+
+    def link(self):
+        return reverse('news:home')
+
+    def items(self):
+        return latest_news().iterator()
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_link(self, item):
+        return reverse('news:detail', args=(item.pk,))
+
+    def item_pubdate(self, item):
+        return timezone.make_aware(datetime.combine(item.date, time.min))
+
+    def item_updateddate(self, item):
+        return item.updated
+
+
+class LatestNewsAtomFeed(LatestNewsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestNewsFeed.description
+
+
+def feed_view(feed_class):
+    feed = feed_class()
+
+    def render(request):
+        response = feed(request)
+        return response['Content-Type'], response.content
+
+    @require_safe
+    @condition(etag_func=feed_version)
+    def view(request):
+        content_type, content = cached_version(
+            f'feed:{feed_class.__name__}', feed_version(request),
+            lambda: render(request),
+        )
+        return HttpResponse(content, content_type=content_type)
+
+    return view
+
+
+rss = feed_view(LatestNewsFeed)
+atom = feed_view(LatestNewsAtomFeed)
@@ -0,0 +1,245 @@
+"""Отложенная запись комментариев через файл очереди.
+
+Проверенный формой комментарий дописывается строкой JSON в файл
+settings.COMMENT_QUEUE_FILE с fsync, и пользователь сразу получает
+редирект. Команда drain_comment_queue переносит очередь в БД пачками
+bulk_create, по транзакции на пачку, и обновляет счётчики.
+
+Запись и забор очереди согласуются блокировкой отдельного файла
+<очередь>.lock: разборщик под блокировкой переименовывает очередь в
+<очередь>.draining, поэтому новые строки в разбираемый файл не
+попадают. Смещение последней зафиксированной пачки хранится в
+<очередь>.offset; после сбоя разбор продолжается с него. Доставка
+«хотя бы один раз»: сбой между коммитом пачки и записью смещения
+повторит эту пачку.
+
+Чтобы автор сразу видел свой комментарий, ещё не записанные в БД
+комментарии хранятся в его сессии до появления в БД.
+
+Где что хранится. Очередь — файл на диске: запись в неё переживает
+падение процесса, но не потерю диска, и общая только для процессов,
+которые видят этот файл. При нескольких серверах каждый пишет в свою
+очередь, и drain_comment_queue запускается на каждом (или файл лежит
+на общем диске с поддержкой flock). Строка, оборванная падением
+посреди записи, отделяется переводом строки при следующей записи,
+а разборщик пропускает её с предупреждением в лог. Список
+неразобранных комментариев автора живёт в его сессии, то есть там,
+где её хранит SESSION_ENGINE: в БД или кэше он общий для всех
+процессов, с signed_cookies — в cookie браузера. Потеря этого списка
+только скрывает комментарий до разбора очереди.
+"""
+import fcntl
+import json
+import logging
+import os
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .cache import bump_generation
+from .models import Comment, News
+from .rankings import change_activity, comment_activity
+from .signals import change_comment_counts
+
+logger = logging.getLogger(__name__)
+
+PENDING_SESSION_KEY = 'pending_comments'
+
+
+def is_enabled():
+    return bool(settings.COMMENT_QUEUE_FILE)
+
+
+@contextmanager
+def locked(path, flags=fcntl.LOCK_EX):
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file, flags)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def enqueue(comment):
+    """Дописывает комментарий в очередь; возвращает запись очереди."""
+    path = os.fspath(settings.COMMENT_QUEUE_FILE)
+    entry = {
+        'news': comment.news_id,
+        'author': comment.author_id,
+        'text': comment.text,
+        'created': comment.created.isoformat(),
+    }
+    line = json.dumps(entry, ensure_ascii=False).encode() + b'\n'
+    with locked(f'{path}.lock'), open(path, 'ab+') as queue:
+        if queue.tell():
+            queue.seek(-1, os.SEEK_END)
+            if queue.read(1) != b'\n':
+                # Строка, оборванная падением, не склеивается с новой.
+                line = b'\n' + line
+        queue.write(line)
+        queue.flush()
+        os.fsync(queue.fileno())
+    return entry
+
+
+def remember_pending(request, entry):
+    pending = request.session.get(PENDING_SESSION_KEY, [])
+    pending.append(entry)
+    request.session[PENDING_SESSION_KEY] = (
+        pending[-settings.COMMENT_QUEUE_PENDING_LIMIT:]
+    )
+
+
+def pending_entries(request, news_pk):
+    """Записи сессии о ещё не разобранных комментариях к новости."""
+    session = getattr(request, 'session', None)
+    if session is None or PENDING_SESSION_KEY not in session:
+        return []
+    return [
+        entry for entry in session[PENDING_SESSION_KEY]
+        if entry['news'] == news_pk
+    ]
+
+
+def pending_comments(request, news_pk):
+    """Комментарии автора к новости, которых ещё нет в БД.
+
+    Уже записанные комментарии узнаются по времени создания и
+    удаляются из сессии.
+    """
+    entries = pending_entries(request, news_pk)
+    if not entries:
+        return []
+    stored = set(Comment.objects.filter(
+        news_id=news_pk,
+        author_id=request.user.pk,
+        created__in=[
+            datetime.fromisoformat(entry['created']) for entry in entries
+        ],
+    ).values_list('created', flat=True))
+    comments = []
+    for entry in entries:
+        created = datetime.fromisoformat(entry['created'])
+        if created in stored:
+            request.session[PENDING_SESSION_KEY].remove(entry)
+            request.session.modified = True
+            continue
+        comment = Comment(
+            news_id=news_pk,
+            author_id=request.user.pk,
+            text=entry['text'],
+            created=created,
+        )
+        comment.update_text_html()
+        comment.author_username = request.user.get_username()
+        comments.append(comment)
+    return comments
+
+
+def read_entries(queue_file):
+    """Записи очереди со смещением конца каждой строки.
+
+    Строки, которые не разбираются как JSON, пропускаются.
+    """
+    for line in iter(queue_file.readline, b''):
+        if not line.endswith(b'\n'):
+            # Недописанная строка после сбоя записи.
+            return
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            logger.warning(
+                'Пропущена испорченная строка очереди: %r', line[:200]
+            )
+            continue
+        yield entry, queue_file.tell()
+
+
+def write_offset(path, offset):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as offset_file:
+        offset_file.write(str(offset))
+        offset_file.flush()
+        os.fsync(offset_file.fileno())
+    os.replace(temporary, path)
+
+
+def insert_batch(entries):
+    """Записывает пачку в одной транзакции; возвращает число вставок.
+
+    Комментарии к удалённым новостям и от удалённых пользователей
+    отбрасываются.
+    """
+    news_ids = set(News.objects.filter(
+        pk__in={entry['news'] for entry in entries}
+    ).values_list('pk', flat=True))
+    author_ids = set(get_user_model().objects.filter(
+        pk__in={entry['author'] for entry in entries}
+    ).values_list('pk', flat=True))
+    comments = []
+    for entry in entries:
+        if entry['news'] not in news_ids or entry['author'] not in author_ids:
+            continue
+        comment = Comment(
+            news_id=entry['news'],
+            author_id=entry['author'],
+            text=entry['text'],
+            created=datetime.fromisoformat(entry['created']),
+        )
+        comment.update_text_html()
+        comments.append(comment)
+    with transaction.atomic():
+        Comment.objects.bulk_create(comments)
+        change_comment_counts(
+            Counter(comment.news_id for comment in comments)
+        )
+        change_activity(comment_activity(comments))
+    return len(comments)
+
+
+def drain(batch_size=None):
+    """Переносит очередь в БД; возвращает число записанных комментариев.
+
+    Одновременно работает только один разборщик.
+    """
+    batch_size = batch_size or settings.COMMENT_QUEUE_BATCH_SIZE
+    path = os.fspath(settings.COMMENT_QUEUE_FILE)
+    with locked(f'{path}.drain.lock'):
+        return _drain(path, batch_size)
+
+
+def _drain(path, batch_size):
+    draining = f'{path}.draining'
+    offset_path = f'{path}.offset'
+    with locked(f'{path}.lock'):
+        if not os.path.exists(draining):
+            if not os.path.exists(path):
+                return 0
+            os.replace(path, draining)
+    offset = 0
+    if os.path.exists(offset_path):
+        with open(offset_path) as offset_file:
+            offset = int(offset_file.read() or 0)
+    inserted = 0
+    with open(draining, 'rb') as queue_file:
+        queue_file.seek(offset)
+        entries = read_entries(queue_file)
+        while True:
+            batch = list(islice(entries, batch_size))
+            if not batch:
+                break
+            inserted += insert_batch([entry for entry, _ in batch])
+            write_offset(offset_path, batch[-1][1])
+    # Сначала смещение: сбой между удалениями повторит разбор файла,
+    # а не применит старое смещение к следующей очереди.
+    if os.path.exists(offset_path):
+        os.remove(offset_path)
+    os.remove(draining)
+    if inserted:
+        bump_generation()
+    return inserted
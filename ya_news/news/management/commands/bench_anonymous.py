@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from news.models import News
+from shared.wsgi_client import call_wsgi
+
+FAST_PATH_MIDDLEWARE = 'yanews.anonymous.AnonymousFastPathMiddleware'
+
+
+class Command(BaseCommand):
+    help = (
+        'Анонимные запросы к главной и страницам новостей в секунду '
+        'без быстрого пути и с ним (AnonymousFastPathMiddleware).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+
+    def measure(self, application, routes, count):
+        for route in routes:
+            call_wsgi(application, 'GET', route)
+        paths = [routes[index % len(routes)] for index in range(count)]
+        started = time.perf_counter()
+        statuses = [call_wsgi(application, 'GET', path) for path in paths]
+        elapsed = time.perf_counter() - started
+        return count / elapsed, sum(status != 200 for status in statuses)
+
+    def handle(self, *args, **options):
+        news_ids = list(News.objects.values_list('pk', flat=True)[:20])
+        if not news_ids:
+            raise CommandError('Нет новостей: загрузите данные.')
+        groups = (
+            ('главная', ['/']),
+            ('новости', [f'/news/{pk}/' for pk in news_ids]),
+        )
+        slow = [
+            name for name in settings.MIDDLEWARE
+            if name != FAST_PATH_MIDDLEWARE
+        ]
+        for name, middleware in (
+            ('Без быстрого пути', slow),
+            ('Быстрый путь', settings.MIDDLEWARE),
+        ):
+            with override_settings(MIDDLEWARE=middleware):
+                application = WSGIHandler()
+                results = [
+                    (group, *self.measure(
+                        application, routes, options['requests']
+                    ))
+                    for group, routes in groups
+                ]
+                with CaptureQueriesContext(connection) as queries:
+                    call_wsgi(application, 'GET', '/')
+            self.stdout.write(f'{name}: ' + '; '.join(
+                f'{group} {rps:.0f} запросов/с, ошибок {errors}'
+                for group, rps, errors in results
+            ) + f'; запросов к БД на главной {len(queries)}')
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from news.models import Comment, News
+from shared.wsgi_client import call_wsgi
+
+
+class Command(BaseCommand):
+    help = (
+        'Строк в секунду: JSON API против HTML-страниц с теми же '
+        'данными и потоковая выгрузка комментариев NDJSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300)
+
+    def rows_per_second(self, application, path, rows, requests):
+        call_wsgi(application, 'GET', path)
+        started = time.perf_counter()
+        for _ in range(requests):
+            status = call_wsgi(application, 'GET', path)
+            if status != 200:
+                raise CommandError(f'{path}: ответ {status}')
+        return rows * requests / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        news = News.objects.order_by('-comment_count').first()
+        if news is None:
+            raise CommandError('Нет новостей: загрузите данные.')
+        news_count = News.objects.count()
+        comments_rows = min(
+            news.comment_count, settings.COMMENTS_COUNT_ON_DETAIL_PAGE
+        )
+        cases = (
+            ('Лента, HTML (архив)', reverse('news:archive'),
+             min(news_count, settings.NEWS_COUNT_ON_ARCHIVE_PAGE)),
+            ('Лента, JSON', reverse('news:api_news_list'),
+             min(news_count, settings.NEWS_API_PAGE_SIZE)),
+            ('Комментарии, HTML', reverse('news:comments', args=(news.pk,)),
+             comments_rows),
+            ('Комментарии, JSON',
+             reverse('news:api_comments', args=(news.pk,)),
+             min(news.comment_count, settings.NEWS_API_PAGE_SIZE)),
+        )
+        application = WSGIHandler()
+        for name, path, rows in cases:
+            rate = self.rows_per_second(
+                application, path, rows, options['requests']
+            )
+            self.stdout.write(f'{name}: {rate:.0f} строк/с')
+        total = Comment.objects.count()
+        path = reverse('news:api_export', args=('comments',))
+        rate = self.rows_per_second(application, path, total, 1)
+        self.stdout.write(
+            f'Выгрузка комментариев NDJSON: {total} строк, {rate:.0f} строк/с'
+        )
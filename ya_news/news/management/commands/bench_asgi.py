@@ -0,0 +1,89 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.models import News
+from shared.wsgi_client import call_wsgi
+
+
+async def asgi_get(application, path):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]['status']
+
+
+def run_wsgi(application, paths, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(
+            lambda path: call_wsgi(application, 'GET', path), paths
+        ))
+
+
+async def run_asgi(application, paths, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(path):
+        async with semaphore:
+            return await asgi_get(application, path)
+
+    return await asyncio.gather(*(limited(path) for path in paths))
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность WSGI и ASGI на главной '
+        'и страницах новостей при конкурентной нагрузке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=32)
+
+    def handle(self, *args, **options):
+        from yanews.asgi import application as asgi_application
+        from yanews.wsgi import application as wsgi_application
+
+        news_ids = list(News.objects.values_list('pk', flat=True)[:20])
+        if not news_ids:
+            raise CommandError('Нет новостей: загрузите данные.')
+        routes = ['/'] + [f'/news/{pk}/' for pk in news_ids]
+        paths = [
+            routes[index % len(routes)]
+            for index in range(options['requests'])
+        ]
+        concurrency = options['concurrency']
+        for name, run in (
+            ('WSGI', lambda: run_wsgi(wsgi_application, paths, concurrency)),
+            ('ASGI', lambda: asyncio.run(
+                run_asgi(asgi_application, paths, concurrency)
+            )),
+        ):
+            started = time.perf_counter()
+            statuses = run()
+            elapsed = time.perf_counter() - started
+            errors = sum(status != 200 for status in statuses)
+            self.stdout.write(
+                f'{name}: {len(paths) / elapsed:.0f} запросов/с, '
+                f'ошибок {errors}, конкурентность {concurrency}'
+            )
@@ -0,0 +1,76 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.profanity import Automaton
+
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюяabcdefghijklmnopqrstuvwxyz'
+
+
+def random_word(rng, min_length=4, max_length=12):
+    return ''.join(
+        rng.choice(ALPHABET)
+        for _ in range(rng.randint(min_length, max_length))
+    )
+
+
+def loop_find(words, text):
+    """Прежняя реализация CommentForm.clean_text."""
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return word
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает автомат Ахо — Корасик с перебором слов '
+        'на длинных комментариях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=40000)
+        parser.add_argument('--length', type=int, default=5000)
+        parser.add_argument('--texts', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        words = [random_word(rng) for _ in range(options['words'])]
+        # Чистые тексты — худший случай для перебора: проверяются все слова.
+        # Буквы ё в алфавите нет: перебор её не нормализует.
+        texts = []
+        while len(texts) < options['texts']:
+            text = ' '.join(
+                random_word(rng, 2, 8)
+                for _ in range(options['length'] // 6)
+            )[:options['length']]
+            if loop_find(words, text) is None:
+                texts.append(text)
+
+        started = time.perf_counter()
+        automaton = Automaton(words)
+        build_time = time.perf_counter() - started
+
+        results = {}
+        for name, find in (
+            ('loop', lambda text: loop_find(words, text)),
+            ('automaton', automaton.find),
+        ):
+            started = time.perf_counter()
+            for text in texts:
+                assert find(text) is None
+            results[name] = (time.perf_counter() - started) / len(texts)
+
+        self.stdout.write(
+            f'Слов: {len(words)}, длина текста: {options["length"]}, '
+            f'текстов: {len(texts)}'
+        )
+        self.stdout.write(f'Сборка автомата: {build_time * 1000:.1f} мс')
+        for name, seconds in results.items():
+            self.stdout.write(f'{name}: {seconds * 1000:.2f} мс на текст')
+        self.stdout.write(
+            f'Ускорение: {results["loop"] / results["automaton"]:.1f}x'
+        )
@@ -0,0 +1,80 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from news.models import News
+from news.rankings import (
+    DAY, hour_of, ranked_news, rebuild_activity, update_rankings,
+    window_start
+)
+
+
+def live_most_discussed(since):
+    """Тот же список агрегатом по комментариям на каждый запрос."""
+    return list(News.objects.annotate(
+        recent=Count('comment', filter=Q(comment__created__gte=since))
+    ).filter(recent__gt=0).order_by('-recent', '-pk').values_list(
+        'pk', 'recent'
+    )[:settings.NEWS_RANKING_SIZE])
+
+
+def live_recently_discussed(since):
+    return list(News.objects.annotate(
+        last=Max('comment__created')
+    ).filter(last__gte=since).order_by('-last', '-pk').values_list(
+        'pk', 'last'
+    )[:settings.NEWS_RANKING_SIZE])
+
+
+class Command(BaseCommand):
+    help = (
+        'Миллисекунд на список рейтинга: агрегат по комментариям против '
+        'чтения NewsRanking; время пересчёта рейтингов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def timed(self, func, repeat):
+        result = func()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat * 1000, result
+
+    def handle(self, *args, **options):
+        if not News.objects.exists():
+            raise CommandError('Нет новостей: загрузите данные.')
+        now = timezone.now()
+        for name, func in (
+            ('Активность с нуля', lambda: rebuild_activity(now)),
+            ('Пересчёт рейтингов', lambda: update_rankings(now)),
+        ):
+            elapsed, _ = self.timed(func, 1)
+            self.stdout.write(f'{name}: {elapsed:.0f} мс')
+        # Окна рейтингов начинаются с целого часа.
+        day_start, week_start = hour_of(now - DAY), window_start(now)
+        cases = (
+            ('day', lambda: live_most_discussed(day_start), 'comments_day'),
+            ('week', lambda: live_most_discussed(week_start),
+             'comments_week'),
+            ('recent', lambda: live_recently_discussed(week_start),
+             'last_comment'),
+        )
+        for kind, live, field in cases:
+            live_ms, expected = self.timed(live, options['repeat'])
+            table_ms, rankings = self.timed(
+                lambda: list(ranked_news(kind)), options['repeat']
+            )
+            same = expected == [
+                (ranking.news_id, getattr(ranking, field))
+                for ranking in rankings
+            ]
+            self.stdout.write(
+                f'{kind}: агрегат {live_ms:.2f} мс, NewsRanking '
+                f'{table_ms:.2f} мс, в {live_ms / table_ms:.0f} раз быстрее; '
+                f'списки {"совпадают" if same else "различаются"}'
+            )
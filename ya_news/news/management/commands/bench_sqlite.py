@@ -0,0 +1,215 @@
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import F
+from django.utils import timezone
+
+from news.models import Comment, News
+from shared.sqlite.base import DatabaseWrapper
+
+User = get_user_model()
+
+# Настройки стандартного бэкенда: журнал отката, полная синхронизация,
+# кэш 2 МиБ, соединение на каждый запрос (CONN_MAX_AGE = 0).
+CONFIGURATIONS = (
+    ('sqlite3 по умолчанию', {
+        'pragmas': {
+            'journal_mode': 'DELETE',
+            'synchronous': 'FULL',
+            'mmap_size': 0,
+            'cache_size': -2000,
+        },
+    }, False),
+    ('shared.sqlite', {}, True),
+)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def copy_database(target):
+    """Копия базы через backup API: замер не меняет рабочую базу."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    connection.ensure_connection()
+    destination = sqlite3.connect(target)
+    try:
+        connection.connection.backup(destination)
+    finally:
+        destination.close()
+
+
+def open_connection(path, options, alias):
+    return DatabaseWrapper({
+        **connections[DEFAULT_DB_ALIAS].settings_dict,
+        'NAME': path,
+        'OPTIONS': options,
+    }, alias)
+
+
+class Workload:
+    """Читатели повторяют запросы главной и страницы новости, писатель
+    без пауз добавляет комментарии и обновляет их счётчик.
+    """
+
+    def __init__(self, path, options, persistent, news_ids, author_id):
+        self.path = path
+        self.options = options
+        self.persistent = persistent
+        self.news_ids = news_ids
+        self.author_id = author_id
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.reads = 0
+        self.writes = 0
+        self.errors = 0
+
+    def read_queries(self, connection):
+        home = News.objects.defer('text')[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        queries = [home.query.get_compiler(connection=connection).as_sql()]
+        for news_id in self.news_ids:
+            comments = Comment.objects.filter(news_id=news_id).only(
+                'pk', 'author', 'created', 'text_html'
+            ).annotate(author_username=F('author__username')).order_by(
+                'created', 'pk'
+            )[:settings.COMMENTS_COUNT_ON_DETAIL_PAGE + 1]
+            queries.append(
+                comments.query.get_compiler(connection=connection).as_sql()
+            )
+        return queries
+
+    def reader(self, number):
+        connection = open_connection(
+            self.path, {**self.options, 'read_only': True}, f'reader-{number}'
+        )
+        queries = self.read_queries(connection)
+        rng = random.Random(number)
+        latencies = []
+        reads = errors = 0
+        try:
+            while not self.stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with connection.cursor() as cursor:
+                        for sql, params in (queries[0], rng.choice(
+                            queries[1:]
+                        )):
+                            cursor.execute(sql, params)
+                            cursor.fetchall()
+                except OperationalError:
+                    errors += 1
+                else:
+                    reads += 1
+                    latencies.append(time.perf_counter() - started)
+                if not self.persistent:
+                    connection.close()
+        finally:
+            connection.close()
+        with self.lock:
+            self.latencies.extend(latencies)
+            self.reads += reads
+            self.errors += errors
+
+    def writer(self):
+        connection = open_connection(self.path, self.options, 'writer')
+        insert = (
+            f'INSERT INTO {Comment._meta.db_table} '
+            '(news_id, author_id, text, text_html, created) '
+            'VALUES (%s, %s, %s, %s, %s)'
+        )
+        update = (
+            f'UPDATE {News._meta.db_table} '
+            'SET comment_count = comment_count + 1 WHERE id = %s'
+        )
+        rng = random.Random(0)
+        writes = errors = 0
+        try:
+            with connection.cursor() as cursor:
+                while not self.stop.is_set():
+                    news_id = rng.choice(self.news_ids)
+                    created = connection.ops.adapt_datetimefield_value(
+                        timezone.now()
+                    )
+                    try:
+                        cursor.execute('BEGIN IMMEDIATE')
+                        cursor.execute(insert, [
+                            news_id, self.author_id, 'Комментарий',
+                            'Комментарий', created,
+                        ])
+                        cursor.execute(update, [news_id])
+                        cursor.execute('COMMIT')
+                    except OperationalError:
+                        errors += 1
+                        if connection.connection.in_transaction:
+                            cursor.execute('ROLLBACK')
+                    else:
+                        writes += 1
+        finally:
+            connection.close()
+        with self.lock:
+            self.writes += writes
+            self.errors += errors
+
+    def run(self, readers, seconds):
+        threads = [threading.Thread(target=self.writer)] + [
+            threading.Thread(target=self.reader, args=(number,))
+            for number in range(readers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        self.stop.set()
+        for thread in threads:
+            thread.join()
+
+
+class Command(BaseCommand):
+    help = (
+        'Пропускная способность чтения при непрерывной записи '
+        'комментариев: стандартный бэкенд SQLite против WAL, PRAGMA '
+        'и постоянных соединений shared.sqlite. Замер идёт на копии '
+        'базы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--readers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        news_ids = list(News.objects.values_list('pk', flat=True)[:20])
+        author_id = User.objects.values_list('pk', flat=True).first()
+        if not news_ids or author_id is None:
+            raise CommandError('Нет новостей или пользователей.')
+        directory = Path(tempfile.mkdtemp())
+        try:
+            for index, (name, db_options, persistent) in enumerate(
+                CONFIGURATIONS
+            ):
+                path = directory / f'{index}.sqlite3'
+                copy_database(path)
+                workload = Workload(
+                    path, db_options, persistent, news_ids, author_id
+                )
+                workload.run(options['readers'], options['seconds'])
+                self.stdout.write(
+                    f'{name}: чтений {workload.reads / options["seconds"]:.0f}'
+                    f'/с, p99 чтения '
+                    f'{percentile(workload.latencies, 0.99) * 1000:.1f} мс, '
+                    f'записей {workload.writes / options["seconds"]:.0f}/с, '
+                    f'ошибок {workload.errors}'
+                )
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,96 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.loader import get_template
+from django.utils import timezone
+
+from news.models import Comment, News
+from news.pagination import KeysetPage
+
+# Прежние варианты шаблонов получаются заменой готовых полей фильтрами.
+OLD_EXPRESSIONS = {
+    'includes/comments.html': (
+        'comment.text_html|safe', 'comment.text|linebreaksbr'
+    ),
+    'includes/news_list.html': ('news.excerpt', 'news.text|truncatewords:15'),
+}
+WORDS = (
+    'сегодня', 'в', 'городе', 'открыли', 'новый', 'мост', 'через', 'реку',
+    'жители', 'довольны', 'движение', 'стало', 'быстрее', 'и', 'удобнее',
+)
+
+
+def paragraph(rng, lines, words):
+    return '\n'.join(
+        ' '.join(rng.choices(WORDS, k=words)) for _ in range(lines)
+    )
+
+
+def old_template(name):
+    template = get_template(name)
+    new, old = OLD_EXPRESSIONS[name]
+    source = template.template.source
+    assert new in source
+    return engines['django'].from_string(source.replace(new, old))
+
+
+def measure(render, repeat):
+    render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - started) / repeat
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендеринга списка комментариев и главной '
+        'с фильтрами linebreaksbr и truncatewords и с предвычисленными '
+        'text_html и excerpt. БД не используется.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=500)
+        parser.add_argument('--news', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        comments = []
+        for pk in range(1, options['comments'] + 1):
+            comment = Comment(
+                pk=pk, author_id=pk, created=timezone.now(),
+                text=paragraph(rng, rng.randint(1, 5), 20),
+            )
+            comment.update_text_html()
+            comment.author_username = 'Автор'
+            comments.append(comment)
+        news_list = []
+        for pk in range(1, options['news'] + 1):
+            news = News(
+                pk=pk, title='Заголовок', date=timezone.localdate(),
+                text=paragraph(rng, 3, 200),
+            )
+            news.update_excerpt()
+            news_list.append(news)
+
+        cases = (
+            (
+                'комментарии', 'includes/comments.html',
+                {'comments': KeysetPage(comments, None), 'news_pk': 1},
+            ),
+            ('главная', 'includes/news_list.html', {'object_list': news_list}),
+        )
+        for name, template_name, context in cases:
+            old = old_template(template_name)
+            new = get_template(template_name)
+            old_time = measure(lambda: old.render(context), options['repeat'])
+            new_time = measure(lambda: new.render(context), options['repeat'])
+            self.stdout.write(
+                f'{name}: фильтры {old_time * 1000:.2f} мс, '
+                f'готовые поля {new_time * 1000:.2f} мс, '
+                f'ускорение {old_time / new_time:.1f}x'
+            )
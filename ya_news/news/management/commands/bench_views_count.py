@@ -0,0 +1,65 @@
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from news import views_count
+from news.models import News
+from shared.wsgi_client import call_wsgi
+
+
+class Command(BaseCommand):
+    help = (
+        'Запросы к страницам новостей в секунду без счётчика просмотров '
+        'и с ним; число UPDATE на время замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--rounds', type=int, default=3)
+
+    def measure(self, application, paths, count):
+        for path in paths:
+            call_wsgi(application, 'GET', path)
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            for index in range(count):
+                status = call_wsgi(
+                    application, 'GET', paths[index % len(paths)]
+                )
+                if status != 200:
+                    raise CommandError(f'Ответ {status}')
+        updates = sum(
+            query['sql'].startswith('UPDATE') for query in queries
+        )
+        return count / (time.perf_counter() - started), updates
+
+    def handle(self, *args, **options):
+        paths = [
+            f'/news/{pk}/'
+            for pk in News.objects.values_list('pk', flat=True)[:50]
+        ]
+        if not paths:
+            raise CommandError('Нет новостей: загрузите данные.')
+        application = WSGIHandler()
+        best = {}
+        # Раунды чередуются, чтобы прогрев и фон сказывались на обоих
+        # вариантах одинаково; берётся лучший результат.
+        for _ in range(options['rounds']):
+            for enabled in (False, True):
+                with override_settings(NEWS_VIEWS_COUNT=enabled):
+                    rate, updates = self.measure(
+                        application, paths, options['requests']
+                    )
+                if rate > best.get(enabled, (0, 0))[0]:
+                    best[enabled] = (rate, updates)
+        views_count.counter.flush()
+        for enabled, name in ((False, 'Без счётчика'), (True, 'Со счётчиком')):
+            rate, updates = best[enabled]
+            self.stdout.write(
+                f'{name}: {rate:.0f} запросов/с, UPDATE за замер {updates}'
+            )
+        overhead = 1 - best[True][0] / best[False][0]
+        self.stdout.write(f'Потеря пропускной способности: {overhead:.1%}')
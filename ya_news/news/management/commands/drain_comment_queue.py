@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news import ingest
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит комментарии из очереди COMMENT_QUEUE_FILE в БД '
+        'пачками bulk_create. С --interval работает постоянно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument(
+            '--interval', type=float,
+            help='Пауза между разборами в секундах; без неё — один разбор.',
+        )
+
+    def handle(self, *args, **options):
+        if not ingest.is_enabled():
+            raise CommandError('Очередь комментариев не настроена.')
+        while True:
+            inserted = ingest.drain(options['batch_size'])
+            if inserted or not options['interval']:
+                self.stdout.write(f'Записано комментариев: {inserted}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
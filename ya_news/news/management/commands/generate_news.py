@@ -0,0 +1,120 @@
+import random
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from news.cache import bump_generation
+from news.models import Comment, News
+from news.rankings import change_activity, comment_activity
+from news.signals import change_comment_counts
+from shared.synthetic import sentence, zipf_cum_weights
+
+User = get_user_model()
+
+WORDS = (
+    'город', 'выборы', 'погода', 'спорт', 'наука', 'рынок', 'театр',
+    'школа', 'дорога', 'музей', 'завод', 'парк', 'мост', 'фестиваль',
+    'матч', 'концерт', 'выставка', 'ремонт', 'бюджет', 'проект', 'станция',
+    'новый', 'главный', 'большой', 'местный', 'летний', 'зимний', 'первый',
+    'открыли', 'перенесли', 'обсудили', 'построили', 'объявили', 'выиграли',
+)
+
+
+def make_news(rng, today, days):
+    news = News(
+        title=sentence(rng, WORDS, rng.randint(2, 4), '.')[:50],
+        text=' '.join(
+            sentence(rng, WORDS, rng.randint(5, 12), '.')
+            for _ in range(rng.randint(2, 6))
+        ),
+        date=today - timedelta(days=rng.randrange(days)),
+    )
+    news.update_excerpt()
+    return news
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетических пользователей, новости и комментарии. '
+        'Число комментариев на новость распределено по Zipf: немного '
+        'популярных новостей собирают большую часть обсуждения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--news', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument('--zipf', type=float, default=1.1)
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--user-prefix', default='user')
+        parser.add_argument('--password', default='password')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        prefix = options['user_prefix']
+        # Хеш пароля считается один раз: он намеренно медленный.
+        password = make_password(options['password'])
+        today = timezone.localdate()
+        now = timezone.now()
+        with transaction.atomic():
+            User.objects.bulk_create(
+                (
+                    User(username=f'{prefix}{index}', password=password)
+                    for index in range(options['users'])
+                ),
+                batch_size,
+                ignore_conflicts=True,
+            )
+            user_ids = list(User.objects.filter(
+                username__startswith=prefix
+            ).values_list('pk', flat=True))
+            # SQLite не возвращает pk из bulk_create: новые новости
+            # находятся по pk больше прежнего максимума.
+            last_pk = News.objects.aggregate(last_pk=Max('pk'))['last_pk']
+            News.objects.bulk_create(
+                (
+                    make_news(rng, today, options['days'])
+                    for _ in range(options['news'])
+                ),
+                batch_size,
+            )
+            news = list(News.objects.filter(
+                pk__gt=last_pk or 0
+            ).values_list('pk', 'date'))
+            # Популярность не зависит от даты: ранги раздаются случайно.
+            rng.shuffle(news)
+            cum_weights = zipf_cum_weights(len(news), options['zipf'])
+            counts = Counter()
+            comments = []
+            for _ in range(options['comments'] if news else 0):
+                (news_id, date), = rng.choices(news, cum_weights=cum_weights)
+                published = timezone.make_aware(
+                    datetime.combine(date, time.min)
+                )
+                comment = Comment(
+                    news_id=news_id,
+                    author_id=rng.choice(user_ids),
+                    text=sentence(rng, WORDS, rng.randint(3, 15), '.'),
+                    created=published + (now - published) * rng.random(),
+                )
+                comment.update_text_html()
+                comments.append(comment)
+                counts[news_id] += 1
+            Comment.objects.bulk_create(comments, batch_size)
+            change_comment_counts(counts)
+            change_activity(comment_activity(comments))
+        bump_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пользователей: {len(user_ids)}, новостей: {len(news)}, '
+            f'комментариев: {len(comments)}; '
+            f'у самой популярной новости {max(counts.values(), default=0)}'
+        ))
@@ -0,0 +1,215 @@
+import json
+import sys
+import time
+from collections import Counter
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from news.cache import bump_generation
+from news.models import Comment, News
+from news.rankings import change_activity, comment_activity
+from news.signals import change_comment_counts
+
+User = get_user_model()
+
+READ_SIZE = 64 * 1024
+# Предел одной записи JSON-массива: буфер не растёт до конца файла.
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+JSON_SKIP = ' \t\r\n,'
+JSON_TOKEN_TAIL = len('\\uXXXX')
+
+
+def iter_ndjson(stream, rejected):
+    """Записи NDJSON; номера некорректных строк считаются в rejected.
+
+    Строки с ошибкой JSON пропускаются и не хранятся: в rejected
+    попадают их число и номер первой.
+    """
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            rejected['lines'] += 1
+            rejected.setdefault('first', number)
+
+
+def is_truncated(error, buffer):
+    """Ошибка разбора из-за конца буфера, а не испорченной записи.
+
+    Оборванные escape-последовательность вида uXXXX и литерал false
+    дают ошибку не дальше JSON_TOKEN_TAIL символов от конца буфера,
+    оборванная строка — в её начале.
+    """
+    return (
+        error.pos >= len(buffer) - JSON_TOKEN_TAIL
+        or error.msg.startswith('Unterminated string')
+    )
+
+
+def iter_json_array(stream):
+    """Элементы JSON-массива по одному, без чтения файла целиком."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(READ_SIZE).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Ожидался JSON-массив.')
+    position = 1
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_SKIP:
+            position += 1
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            record, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if not is_truncated(error, buffer):
+                raise CommandError(f'Некорректный JSON: {error}.')
+            if len(buffer) - position > MAX_RECORD_SIZE:
+                raise CommandError(
+                    f'Запись JSON длиннее {MAX_RECORD_SIZE} символов.'
+                )
+            chunk = stream.read(READ_SIZE)
+            if not chunk:
+                raise CommandError('Файл оборвался посреди JSON-массива.')
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield record
+
+
+class Loader:
+    """Вставляет записи фикстур пакетами bulk_create.
+
+    Авторы комментариев ищутся в словаре username -> id, который
+    загружается один раз. Счётчики комментариев обновляются после
+    каждой пачки комментариев, сигналы не вызываются.
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.user_ids = dict(User.objects.values_list('username', 'id'))
+        self.news = []
+        self.comments = []
+        self.loaded = Counter()
+
+    def author_id(self, author):
+        if isinstance(author, int):
+            return author
+        if isinstance(author, list):
+            author, = author
+        try:
+            return self.user_ids[author]
+        except KeyError:
+            raise CommandError(f'Неизвестный автор комментария: {author}')
+
+    def add(self, record):
+        model = record.get('model')
+        fields = record['fields']
+        if model == 'news.news':
+            news = News(pk=record.get('pk'))
+            for name in ('title', 'text', 'date'):
+                if name in fields:
+                    setattr(news, name, News._meta.get_field(
+                        name
+                    ).to_python(fields[name]))
+            news.update_excerpt()
+            self.news.append(news)
+        elif model == 'news.comment':
+            comment = Comment(
+                pk=record.get('pk'),
+                news_id=fields['news'],
+                author_id=self.author_id(fields['author']),
+                text=fields['text'],
+            )
+            if 'created' in fields:
+                comment.created = Comment._meta.get_field(
+                    'created'
+                ).to_python(fields['created'])
+            comment.update_text_html()
+            self.comments.append(comment)
+        else:
+            raise CommandError(f'Неподдерживаемая модель: {model}')
+        if len(self.news) + len(self.comments) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # Новости вставляются раньше комментариев той же пачки.
+        if self.news:
+            News.objects.bulk_create(self.news, self.batch_size)
+            self.loaded['news'] += len(self.news)
+            self.news = []
+        if self.comments:
+            Comment.objects.bulk_create(self.comments, self.batch_size)
+            change_comment_counts(
+                Counter(comment.news_id for comment in self.comments)
+            )
+            change_activity(comment_activity(self.comments))
+            self.loaded['comments'] += len(self.comments)
+            self.comments = []
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает новости и комментарии из JSON-фикстуры '
+        'или NDJSON пакетами bulk_create. Каждая транзакция фиксирует '
+        '--transaction-size записей: при ошибке уже загруженные части '
+        'остаются в БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл или - для stdin.')
+        parser.add_argument(
+            '--format', choices=('auto', 'json', 'ndjson'), default='auto'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--transaction-size', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        data_format = options['format']
+        if data_format == 'auto':
+            data_format = (
+                'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json'
+            )
+        stream = (
+            sys.stdin if path == '-' else open(path, encoding='utf-8')
+        )
+        loader = Loader(options['batch_size'])
+        rejected = Counter()
+        started = time.perf_counter()
+        try:
+            records = (
+                iter_ndjson(stream, rejected) if data_format == 'ndjson'
+                else iter_json_array(stream)
+            )
+            while True:
+                chunk = list(islice(records, options['transaction_size']))
+                if not chunk:
+                    break
+                with transaction.atomic():
+                    for record in chunk:
+                        loader.add(record)
+                    loader.flush()
+                total = sum(loader.loaded.values())
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'Загружено {total} записей, '
+                    f'{total / elapsed:.0f} записей/с'
+                )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        bump_generation()
+        if rejected:
+            self.stderr.write(
+                f'Пропущено строк с некорректным JSON: {rejected["lines"]}, '
+                f'первая — строка {rejected["first"]}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Новостей: {loader.loaded["news"]}, '
+            f'комментариев: {loader.loaded["comments"]}'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from news.search import REBUILD_SQL
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс новостей и комментариев.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            for sql in REBUILD_SQL:
+                cursor.execute(sql)
+            cursor.execute('SELECT count(*) FROM news_search')
+            count, = cursor.fetchone()
+        self.stdout.write(f'В индексе записей: {count}')
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from news.models import Comment, News
+
+
+def comment_count_subquery():
+    """Подзапрос с фактическим числом комментариев новости."""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(news=OuterRef('pk'))
+            .order_by()
+            .values('news')
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованный счётчик комментариев News.'
+
+    def handle(self, *args, **options):
+        updated = News.objects.update(comment_count=comment_count_subquery())
+        self.stdout.write(f'Пересчитано новостей: {updated}')
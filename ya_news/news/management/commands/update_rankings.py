@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from news.rankings import rebuild_activity, update_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги новостей по почасовой активности. '
+        'Запускается периодически, например раз в несколько минут.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Сначала заново посчитать активность по комментариям '
+                 'недели: после миграции или для ремонта.',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            rebuild_activity()
+        ranked = update_rankings()
+        self.stdout.write(f'Новостей в рейтингах: {ranked}')
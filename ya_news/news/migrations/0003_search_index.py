@@ -0,0 +1,110 @@
+from django.db import migrations
+
+# Полнотекстовый индекс SQLite FTS5 по новостям и комментариям.
+# rowid = 2 * id для новости и 2 * id + 1 для комментария. Индекс
+# поддерживается триггерами, поэтому в него попадают и строки,
+# вставленные bulk_create. Буква ё заменяется на е, так как unicode61
+# её не сворачивает.
+FTS_TEXT = "replace(replace({}, 'ё', 'е'), 'Ё', 'Е')"
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE news_search USING fts5(
+        title, text, news_id UNINDEXED,
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    # Совпадение в заголовке весит больше, чем в тексте.
+    "INSERT INTO news_search(news_search, rank) "
+    "VALUES('rank', 'bm25(10.0, 1.0)')",
+    f"""
+    CREATE TRIGGER news_search_news_insert AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_search(rowid, title, text, news_id) VALUES (
+            new.id * 2, {FTS_TEXT.format('new.title')},
+            {FTS_TEXT.format('new.text')}, new.id
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER news_search_news_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        UPDATE news_search SET
+            title = {FTS_TEXT.format('new.title')},
+            text = {FTS_TEXT.format('new.text')}
+        WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_news_delete AFTER DELETE ON news_news BEGIN
+        DELETE FROM news_search WHERE rowid = old.id * 2;
+    END
+    """,
+    f"""
+    CREATE TRIGGER news_search_comment_insert
+    AFTER INSERT ON news_comment BEGIN
+        INSERT INTO news_search(rowid, title, text, news_id) VALUES (
+            new.id * 2 + 1, '', {FTS_TEXT.format('new.text')}, new.news_id
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER news_search_comment_update
+    AFTER UPDATE OF text ON news_comment BEGIN
+        UPDATE news_search SET text = {FTS_TEXT.format('new.text')}
+        WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_comment_delete
+    AFTER DELETE ON news_comment BEGIN
+        DELETE FROM news_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+REBUILD_SQL = [
+    'DELETE FROM news_search',
+    f"""
+    INSERT INTO news_search(rowid, title, text, news_id)
+    SELECT id * 2, {FTS_TEXT.format('title')}, {FTS_TEXT.format('text')}, id
+    FROM news_news
+    """,
+    f"""
+    INSERT INTO news_search(rowid, title, text, news_id)
+    SELECT id * 2 + 1, '', {FTS_TEXT.format('text')}, news_id
+    FROM news_comment
+    """,
+    "INSERT INTO news_search(news_search) VALUES('optimize')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS news_search_news_insert',
+    'DROP TRIGGER IF EXISTS news_search_news_update',
+    'DROP TRIGGER IF EXISTS news_search_news_delete',
+    'DROP TRIGGER IF EXISTS news_search_comment_insert',
+    'DROP TRIGGER IF EXISTS news_search_comment_update',
+    'DROP TRIGGER IF EXISTS news_search_comment_delete',
+    'DROP TABLE IF EXISTS news_search',
+]
+
+
+def run_sql(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_news_comment_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sql(CREATE_SQL + REBUILD_SQL), run_sql(DROP_SQL)
+        ),
+    ]
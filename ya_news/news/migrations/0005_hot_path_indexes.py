@@ -0,0 +1,40 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_comment_created_default'),
+    ]
+
+    # Индекс внешнего ключа удаляется вручную: AlterField на SQLite
+    # пересоздал бы таблицу news_comment вместе с триггерами поиска.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX IF EXISTS "news_comment_news_id_18ce08a8"',
+                    'CREATE INDEX "news_comment_news_id_18ce08a8" '
+                    'ON "news_comment" ("news_id")',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='comment',
+                    name='news',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='news.news'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['news', 'created', 'id'], name='news_commen_news_id_e02baf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['date', 'id'], name='news_news_date_ba5a42_idx'),
+        ),
+    ]
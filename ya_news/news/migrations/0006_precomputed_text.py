@@ -0,0 +1,41 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_hot_path_indexes'),
+    ]
+
+    # Столбцы добавляются через ALTER TABLE: AddField на SQLite
+    # пересоздал бы таблицы вместе с триггерами поиска.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE "news_comment" ADD COLUMN "text_html" '
+                    "text NOT NULL DEFAULT ''",
+                    'ALTER TABLE "news_comment" DROP COLUMN "text_html"',
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE "news_news" ADD COLUMN "excerpt" '
+                    "text NOT NULL DEFAULT ''",
+                    'ALTER TABLE "news_news" DROP COLUMN "excerpt"',
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='comment',
+                    name='text_html',
+                    field=models.TextField(default='', editable=False),
+                ),
+                migrations.AddField(
+                    model_name='news',
+                    name='excerpt',
+                    field=models.TextField(default='', editable=False),
+                ),
+            ],
+        ),
+    ]
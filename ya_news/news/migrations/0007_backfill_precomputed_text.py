@@ -0,0 +1,44 @@
+from django.db import migrations
+
+from news.text import make_excerpt, render_text_html
+
+CHUNK_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    """Заполняет столбцы пачками по CHUNK_SIZE строк.
+
+    Каждая пачка фиксируется отдельно, прерванное заполнение можно
+    повторить. Триггеры поиска срабатывают только на изменение text,
+    поэтому индекс не перестраивается.
+    """
+    for model_name, source, target, render in (
+        ('News', 'text', 'excerpt', make_excerpt),
+        ('Comment', 'text', 'text_html', render_text_html),
+    ):
+        model = apps.get_model('news', model_name)
+        last_pk = 0
+        while True:
+            chunk = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('pk', source)[:CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+            for obj in chunk:
+                setattr(obj, target, render(getattr(obj, source)))
+            model.objects.bulk_update(chunk, [target])
+            last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('news', '0006_precomputed_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
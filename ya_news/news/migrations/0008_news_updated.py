@@ -0,0 +1,36 @@
+# Generated by Django 3.2.15 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_backfill_precomputed_text'),
+    ]
+
+    # Столбец добавляется через ALTER TABLE: AddField на SQLite
+    # пересоздал бы таблицу вместе с триггерами поиска. Существующим
+    # новостям время изменения ставится по их дате.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE "news_news" ADD COLUMN "updated" '
+                    "datetime NOT NULL DEFAULT '1970-01-01 00:00:00'",
+                    'ALTER TABLE "news_news" DROP COLUMN "updated"',
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='news',
+                    name='updated',
+                    field=models.DateTimeField(auto_now=True),
+                ),
+            ],
+        ),
+        migrations.RunSQL(
+            'UPDATE "news_news" SET "updated" = "date" || \' 00:00:00\'',
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_news_updated'),
+    ]
+
+    # Как и в 0008: ALTER TABLE вместо AddField, чтобы SQLite
+    # не пересоздавал таблицу вместе с триггерами поиска.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE "news_news" ADD COLUMN "views_count" '
+                    'integer unsigned NOT NULL DEFAULT 0 '
+                    'CHECK ("views_count" >= 0)',
+                    'ALTER TABLE "news_news" DROP COLUMN "views_count"',
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='news',
+                    name='views_count',
+                    field=models.PositiveIntegerField(
+                        default=0, editable=False
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_news_views_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('comments', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Активность новости',
+                'verbose_name_plural': 'Активность новостей',
+            },
+        ),
+        migrations.CreateModel(
+            name='NewsRanking',
+            fields=[
+                ('news', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='news.news')),
+                ('comments_day', models.PositiveIntegerField(default=0)),
+                ('comments_week', models.PositiveIntegerField(default=0)),
+                ('score', models.FloatField(default=0)),
+                ('last_comment', models.DateTimeField(null=True)),
+            ],
+            options={
+                'verbose_name': 'Рейтинг новости',
+                'verbose_name_plural': 'Рейтинги новостей',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='newsranking',
+            index=models.Index(fields=['comments_day', 'news'], name='news_newsra_comment_b2ac4a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsranking',
+            index=models.Index(fields=['comments_week', 'news'], name='news_newsra_comment_60e21f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsranking',
+            index=models.Index(fields=['score', 'news'], name='news_newsra_score_224460_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsranking',
+            index=models.Index(fields=['last_comment', 'news'], name='news_newsra_last_co_97396f_idx'),
+        ),
+        migrations.AddField(
+            model_name='newsactivity',
+            name='news',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='news.news'),
+        ),
+        migrations.AddIndex(
+            model_name='newsactivity',
+            index=models.Index(fields=['hour'], name='news_newsac_hour_311655_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='newsactivity',
+            constraint=models.UniqueConstraint(fields=('news', 'hour'), name='news_activity_news_hour'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.15 on 2026-10-18 23:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0010_rankings'),
+    ]
+
+    # Меняется только состояние: у столбца уже есть значение по
+    # умолчанию в БД, а AlterField на SQLite пересоздал бы таблицу
+    # вместе с триггерами поиска.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='news',
+                    name='updated',
+                    field=models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+            ],
+        ),
+    ]
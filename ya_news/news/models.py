@@ -1,37 +1,172 @@
+from collections import Counter
 from datetime import datetime
 
 from django.conf import settings
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
+
+from .text import make_excerpt, render_text_html
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    excerpt = models.TextField(default='', editable=False)
+    # По времени изменения проверяется актуальность лент и карты сайта.
+    # Не auto_now: loaddata сохраняет в обход pre_save, и без значения
+    # по умолчанию в столбец NOT NULL ушёл бы NULL.
+    updated = models.DateTimeField(default=timezone.now, editable=False)
+    # Пишется пачками из news/views_count.py, а не на каждый просмотр.
+    views_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ('-date',)
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
+        # Главная и архив идут по (-date, -pk) обратным проходом индекса.
+        indexes = (models.Index(fields=('date', 'id')),)
 
     def __str__(self):
         return self.title
 
+    def update_excerpt(self):
+        """Пересчитывает excerpt; для вставок в обход сигналов."""
+        self.excerpt = make_excerpt(self.text)
+
+    def save(self, *args, **kwargs):
+        # excerpt пересчитывает news.signals.fill_precomputed_text.
+        self.updated = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = {*update_fields, 'updated'}
+            if 'text' in update_fields:
+                update_fields.add('excerpt')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+
+class CommentQuerySet(models.QuerySet):
+
+    def bulk_delete(self):
+        """Удаляет комментарии одной инструкцией DELETE без сигналов.
+
+        QuerySet.delete() из-за подписчиков post_delete удаляет
+        комментарии поштучно, обновляя счётчик на каждый. Здесь
+        счётчики меняются одним UPDATE по новостям, поколение кэша —
+        один раз. Поисковый индекс обновляют триггеры БД.
+        """
+        from .cache import bump_generation
+        from .rankings import change_activity, queryset_activity
+        from .signals import change_comment_counts
+
+        # self.db вне транзакции — база для чтения, она может быть
+        # репликой только для чтения.
+        using = router.db_for_write(self.model)
+        comments = self.using(using).order_by()
+        with transaction.atomic(using=using):
+            deltas = Counter()
+            for news_id, count in comments.values_list(
+                'news_id'
+            ).annotate(count=models.Count('pk')):
+                deltas[news_id] -= count
+            activity = queryset_activity(comments, sign=-1)
+            deleted = comments._raw_delete(using)
+            change_comment_counts(deltas)
+            change_activity(activity)
+        bump_generation()
+        return deleted
+
 
 class Comment(models.Model):
+    # Отдельный индекс по news не нужен: его заменяет составной
+    # индекс (news, created, id) из Meta.
     news = models.ForeignKey(
         News,
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False,
     )
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
     text = models.TextField()
-    created = models.DateTimeField(auto_now_add=True)
+    # Не auto_now_add: bulk_create при загрузке и отложенной записи
+    # должен сохранять переданное время создания.
+    created = models.DateTimeField(default=timezone.now, editable=False)
+    # Готовый HTML текста: шаблоны не вызывают linebreaksbr.
+    text_html = models.TextField(default='', editable=False)
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         ordering = ('created',)
+        indexes = (models.Index(fields=('news', 'created', 'id')),)
 
     def __str__(self):
         return self.text[:50]
+
+    def update_text_html(self):
+        """Пересчитывает text_html; для вставок в обход сигналов."""
+        self.text_html = render_text_html(self.text)
+
+    def save(self, *args, **kwargs):
+        # text_html пересчитывает news.signals.fill_precomputed_text.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'text_html'}
+        super().save(*args, **kwargs)
+
+
+class NewsActivity(models.Model):
+    """Число комментариев новости за час.
+
+    Ведётся на каждое создание и удаление комментария, см.
+    news/rankings.py; хранятся только часы окна рейтингов.
+    """
+    news = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    hour = models.DateTimeField()
+    comments = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Активность новости'
+        verbose_name_plural = 'Активность новостей'
+        constraints = (models.UniqueConstraint(
+            fields=('news', 'hour'), name='news_activity_news_hour'
+        ),)
+        indexes = (models.Index(fields=('hour',)),)
+
+
+class NewsRanking(models.Model):
+    """Рейтинги новости, которую обсуждали за последнюю неделю.
+
+    Пересчитывается по NewsActivity командой update_rankings; списки
+    рейтингов читают только эту таблицу и новости по первичному ключу.
+    """
+    news = models.OneToOneField(
+        News,
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    comments_day = models.PositiveIntegerField(default=0)
+    comments_week = models.PositiveIntegerField(default=0)
+    # Сумма комментариев, вес которых вдвое падает каждые
+    # NEWS_RANKING_HALF_LIFE часов.
+    score = models.FloatField(default=0)
+    last_comment = models.DateTimeField(null=True)
+
+    class Meta:
+        verbose_name = 'Рейтинг новости'
+        verbose_name_plural = 'Рейтинги новостей'
+        # Списки идут по (-поле, -news) обратным проходом индекса.
+        indexes = (
+            models.Index(fields=('comments_day', 'news')),
+            models.Index(fields=('comments_week', 'news')),
+            models.Index(fields=('score', 'news')),
+            models.Index(fields=('last_comment', 'news')),
+        )
@@ -0,0 +1,151 @@
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q, QuerySet
+from django.http import Http404
+from django.utils.functional import cached_property
+
+CURSOR_SALT = 'news.pagination.cursor'
+
+
+def sign_cursor(values, salt=CURSOR_SALT):
+    """Упаковывает значения ключа в подписанную непрозрачную строку."""
+    return signing.dumps([str(value) for value in values], salt=salt)
+
+
+def unsign_cursor(cursor, salt=CURSOR_SALT):
+    """Проверяет подпись курсора и возвращает значения ключа строками.
+
+    Подделанный или повреждённый курсор приводит к 404.
+    """
+    try:
+        return signing.loads(cursor, salt=salt)
+    except signing.BadSignature:
+        raise Http404('Некорректный курсор.')
+
+
+@dataclass
+class KeysetPage:
+    object_list: List[Any]
+    next_cursor: Optional[str]
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+
+class KeysetPaginator:
+    """Постраничный вывод по ключу (keyset), без OFFSET.
+
+    keys — упорядочивающие поля с направлением, например
+    ('-date', '-pk'). Последнее поле должно быть уникальным, чтобы
+    порядок был однозначным. Следующая страница выбирается условием
+    «строго после последней записи», поэтому стоимость любой страницы
+    одинакова при наличии индекса по этим полям.
+    """
+
+    def __init__(self, queryset, keys, per_page, salt=CURSOR_SALT):
+        self.queryset = queryset
+        self.keys = tuple(keys)
+        self.per_page = per_page
+        self.salt = salt
+        meta = queryset.model._meta
+        self.fields = [
+            meta.pk if name == 'pk' else meta.get_field(name)
+            for name in self.field_names
+        ]
+
+    @property
+    def field_names(self):
+        return [key.lstrip('-') for key in self.keys]
+
+    def _after(self, values):
+        """Условие «запись идёт после values» для составного ключа.
+
+        Нестрогая граница по первому полю дублирует условие OR: по ней
+        СУБД начинает проход индекса с курсора, а не с начала.
+        """
+        condition = Q()
+        names = self.field_names
+        for index, key in enumerate(self.keys):
+            lookup = 'lt' if key.startswith('-') else 'gt'
+            filters = dict(zip(names[:index], values[:index]))
+            filters[f'{names[index]}__{lookup}'] = values[index]
+            condition |= Q(**filters)
+        bound = 'lte' if self.keys[0].startswith('-') else 'gte'
+        return Q(**{f'{names[0]}__{bound}': values[0]}) & condition
+
+    def _decode(self, cursor):
+        raw_values = unsign_cursor(cursor, self.salt)
+        if len(raw_values) != len(self.fields):
+            raise Http404('Некорректный курсор.')
+        return [
+            field.to_python(value)
+            for field, value in zip(self.fields, raw_values)
+        ]
+
+    def _key_of(self, obj):
+        if isinstance(obj, dict):
+            return [obj[name] for name in self.field_names]
+        return [getattr(obj, name) for name in self.field_names]
+
+    def get_page(self, cursor=None):
+        queryset = self.queryset.order_by(*self.keys)
+        if cursor:
+            queryset = queryset.filter(self._after(self._decode(cursor)))
+        # Одна лишняя запись показывает, есть ли следующая страница.
+        object_list = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[:self.per_page]
+            next_cursor = sign_cursor(
+                self._key_of(object_list[-1]), self.salt
+            )
+        return KeysetPage(object_list, next_cursor)
+
+
+def estimate_count(model, using):
+    """Оценка числа строк таблицы без COUNT(*).
+
+    На PostgreSQL берётся статистика планировщика, на остальных СУБД —
+    максимальный первичный ключ: оценка завышена на число удалённых
+    строк.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else None
+    return model._default_manager.using(using).aggregate(
+        max_pk=Max('pk')
+    )['max_pk'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator для списков админки по большим таблицам.
+
+    Число строк неотфильтрованного списка оценивается через
+    estimate_count. Отфильтрованные списки и таблицы меньше
+    exact_below строк считаются точно.
+    """
+
+    exact_below = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= self.exact_below:
+                return estimate
+        return super().count
@@ -0,0 +1,169 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text):
+    """Приводит текст к виду, в котором ищутся запрещённые слова."""
+    return text.lower().replace('ё', 'е')
+
+
+def is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class Automaton:
+    """Автомат Ахо — Корасик для поиска множества слов за один проход.
+
+    Строится один раз по списку слов; поиск стоит O(длины текста)
+    независимо от размера словаря.
+    """
+
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        # Длины слов, оканчивающихся в узле, включая суффиксные.
+        self.outputs = [()]
+        for word in words:
+            word = normalize(word.strip())
+            if word:
+                self._add(word)
+        self._build_links()
+
+    def _add(self, word):
+        node = 0
+        for char in word:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append(())
+            node = next_node
+        if len(word) not in self.outputs[node]:
+            self.outputs[node] += (len(word),)
+
+    def _build_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                fail = self.goto[fail].get(char, 0)
+                self.fail[child] = fail
+                self.outputs[child] += self.outputs[fail]
+
+    def find(self, text, whole_words=False):
+        """Первое найденное слово из словаря или None.
+
+        В режиме whole_words совпадение засчитывается, только если
+        слово не окружено буквами, цифрами или подчёркиванием.
+        """
+        text = normalize(text)
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length in outputs[node]:
+                start = end - length
+                if not whole_words or (
+                    (start == 0 or not is_word_char(text[start - 1]))
+                    and (end == len(text) or not is_word_char(text[end]))
+                ):
+                    return text[start:end]
+        return None
+
+
+def read_words(path):
+    """Слова из файла: по одному на строку, # — комментарий."""
+    with open(path, encoding='utf-8') as words_file:
+        return [
+            line.strip() for line in words_file
+            if line.strip() and not line.startswith('#')
+        ]
+
+
+class ProfanityFilter:
+    """Автомат запрещённых слов с горячей перезагрузкой словаря.
+
+    Словарь берётся из файла settings.BAD_WORDS_FILE, а если он не
+    задан — из default_words. Изменение файла замечается по mtime не
+    чаще раза в BAD_WORDS_RELOAD_INTERVAL секунд; до окончания
+    пересборки запросы обслуживает прежний автомат. Если файл не
+    удаётся прочитать, остаётся прежний автомат, а до первой успешной
+    загрузки — автомат default_words.
+    """
+
+    def __init__(self, default_words):
+        self.default_words = default_words
+        self._automaton = None
+        self._source = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def _current_source(self):
+        path = settings.BAD_WORDS_FILE
+        if not path:
+            return None
+        try:
+            return os.fspath(path), os.stat(path).st_mtime_ns
+        except OSError:
+            logger.warning(
+                'Нет доступа к словарю запрещённых слов %s', path,
+                exc_info=True,
+            )
+            return self._source
+
+    def _words(self, source):
+        if source is None:
+            return self.default_words
+        try:
+            return read_words(source[0])
+        except OSError:
+            logger.warning(
+                'Не удалось прочитать словарь запрещённых слов %s',
+                source[0], exc_info=True,
+            )
+            return None
+
+    def _rebuild(self, source):
+        words = self._words(source)
+        if words is None:
+            if self._automaton is not None:
+                # Прежний автомат остаётся до следующей проверки файла.
+                return
+            words, source = self.default_words, None
+        self._automaton = Automaton(words)
+        self._source = source
+
+    def get_automaton(self):
+        now = time.monotonic()
+        if (
+            self._automaton is not None
+            and now - self._checked_at < settings.BAD_WORDS_RELOAD_INTERVAL
+        ):
+            return self._automaton
+        source = self._current_source()
+        if self._automaton is None or source != self._source:
+            with self._lock:
+                if self._automaton is None or source != self._source:
+                    self._rebuild(source)
+        self._checked_at = now
+        return self._automaton
+
+    def find(self, text):
+        return self.get_automaton().find(
+            text, whole_words=settings.BAD_WORDS_WHOLE_WORDS
+        )
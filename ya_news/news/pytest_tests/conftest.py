@@ -1,14 +1,29 @@
 from datetime import datetime, timedelta
 
 import pytest
+from django.core.cache import cache  # type: ignore
 from django.test.client import Client  # type: ignore
 from django.utils import timezone  # type: ignore
 from django.conf import settings  # type: ignore
 from django.urls import reverse  # type: ignore
 
+from news import views_count
 from news.models import News, Comment
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш общий на процесс: тесты не должны видеть чужие фрагменты."""
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_views_count():
+    """Просмотры, не записанные тестом, не должны достаться другому."""
+    yield
+    views_count.counter.take()
+
+
 @pytest.fixture
 def author(django_user_model):
     return django_user_model.objects.create(username='Автор')
@@ -109,3 +124,18 @@ def logout_url():
 @pytest.fixture
 def signup_url():
     return reverse('users:signup')
+
+
+@pytest.fixture
+def archive_url():
+    return reverse('news:archive')
+
+
+@pytest.fixture
+def comments_url(news):
+    return reverse('news:comments', args=(news.id,))
+
+
+@pytest.fixture
+def search_url():
+    return reverse('news:search')
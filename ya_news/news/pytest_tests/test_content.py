@@ -1,8 +1,22 @@
+import json
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from io import StringIO
+
 import pytest
 from pytest_lazyfixture import lazy_fixture  # type: ignore
 from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.core.management import call_command  # type: ignore
+from django.db import connection  # type: ignore
+from django.template import Context, Template  # type: ignore
+from django.urls import reverse  # type: ignore
 
+from news import sitemaps, views_count
+from news.cache import bump_generation, cached_fragment
 from news.forms import CommentForm
+from news.models import Comment, News
+from news.rankings import update_rankings
 
 
 @pytest.mark.django_db
@@ -66,3 +80,331 @@ def test_author_can_get_and_other_user_cant_get_form_for_comment(
         assert isinstance(response.context['form'], CommentForm)
     else:
         assert 'form' not in response.context
+
+
+def test_home_page_does_not_load_comments(
+    news_count_on_home_page, ten_comments_fixture, client, home_url,
+    django_assert_num_queries
+):
+    """Тест: Главная страница строится одним запросом к БД,
+    комментарии при этом не загружаются.
+    """
+    with django_assert_num_queries(1) as captured:
+        response = client.get(home_url)
+    assert 'news_comment' not in captured.captured_queries[0]['sql']
+    assert 'Комментариев: 10' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_archive_pages_cover_all_news(client, archive_url, settings):
+    """Тест: Архив постранично отдаёт все новости от новых к старым
+    без пропусков и повторов.
+    """
+    settings.NEWS_COUNT_ON_ARCHIVE_PAGE = 3
+    today = datetime.today()
+    # Несколько новостей с одинаковой датой проверяют разрешение
+    # равенства по pk.
+    for index in range(8):
+        News.objects.create(
+            title=f'Новость{index}', text='Текст',
+            date=today - timedelta(days=index // 2)
+        )
+    expected = list(
+        News.objects.order_by('-date', '-pk').values_list('pk', flat=True)
+    )
+    seen = []
+    cursor = None
+    while True:
+        params = {'cursor': cursor} if cursor else {}
+        page = client.get(archive_url, params).context['page']
+        seen.extend(news.pk for news in page)
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    assert seen == expected
+
+
+def test_archive_rejects_tampered_cursor(client, archive_url):
+    """Тест: Подделанный курсор архива приводит к 404."""
+    response = client.get(archive_url, {'cursor': '["2022-01-01","1"]:x'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_detail_comments_are_paged_and_projected(
+    ten_comments_fixture, client, detail_url, comments_url, settings,
+    django_assert_num_queries
+):
+    """Тест: Комментарии на странице новости выводятся постранично,
+    из БД читаются только нужные шаблону поля, следующая страница
+    доступна через фрагмент.
+    """
+    settings.COMMENTS_COUNT_ON_DETAIL_PAGE = 4
+    # Валидаторы условного GET, новость и страница комментариев.
+    with django_assert_num_queries(3) as captured:
+        response = client.get(detail_url)
+    comments_sql = captured.captured_queries[-1]['sql']
+    assert '"auth_user"."username"' in comments_sql
+    assert '"auth_user"."password"' not in comments_sql
+
+    pages = [response.context['comments']]
+    while pages[-1].has_next:
+        pages.append(client.get(
+            comments_url, {'cursor': pages[-1].next_cursor}
+        ).context['comments'])
+    timestamps = [comment.created for page in pages for comment in page]
+
+    assert [len(page.object_list) for page in pages] == [4, 4, 2]
+    assert timestamps == sorted(timestamps)
+
+
+def test_home_page_is_cached_until_news_change(
+    news, client, home_url, author, django_assert_num_queries
+):
+    """Тест: Повторный запрос главной не обращается к БД, а новый
+    комментарий инвалидирует закэшированный список.
+    """
+    client.get(home_url)
+    with django_assert_num_queries(0):
+        client.get(home_url)
+
+    Comment.objects.create(news=news, author=author, text='Текст')
+    response = client.get(home_url)
+
+    assert 'Комментариев: 1' in response.content.decode()
+
+
+def test_stale_fragment_served_while_other_worker_rebuilds(news, settings):
+    """Тест: В режиме stale-while-revalidate после инвалидации
+    фрагмент пересобирает только владелец блокировки.
+    """
+    settings.NEWS_CACHE_STALE_WHILE_REVALIDATE = True
+    assert cached_fragment('test', lambda: 'старый') == 'старый'
+    bump_generation()
+    cache.add('news:fragment:test:lock', 1)
+
+    assert cached_fragment('test', lambda: 'новый') == 'старый'
+    cache.delete('news:fragment:test:lock')
+    assert cached_fragment('test', lambda: 'новый') == 'новый'
+
+
+def test_search_finds_news_and_comments(news, author, client, search_url):
+    """Тест: Поиск находит новость по другой форме слова и комментарий,
+    удалённый комментарий из выдачи пропадает.
+    """
+    News.objects.create(title='Ёлочные новости', text='Про ёлку')
+    comment = Comment.objects.create(
+        news=news, author=author, text='Нарядили ёлку <b>во дворе</b>'
+    )
+    results = list(client.get(search_url, {'q': 'елками'}).context['page'])
+
+    assert len(results) == 2
+    assert results[0].news.title == 'Ёлочные новости'
+    assert results[1].is_comment and results[1].news == news
+    assert '<mark>елку</mark>' in results[1].snippet
+    assert '&lt;b&gt;' in results[1].snippet
+
+    comment.delete()
+    results = list(client.get(search_url, {'q': 'двор'}).context['page'])
+    assert results == []
+
+
+@pytest.mark.django_db
+def test_search_pages_and_rebuild(client, search_url, settings):
+    """Тест: Выдача поиска листается курсором без повторов, а индекс
+    восстанавливается командой rebuild_search_index.
+    """
+    settings.NEWS_COUNT_ON_SEARCH_PAGE = 2
+    for index in range(5):
+        News.objects.create(title=f'Выпуск {index}', text='Погода')
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM news_search')
+    call_command('rebuild_search_index', stdout=StringIO())
+
+    seen = []
+    params = {'q': 'погоде'}
+    while True:
+        page = client.get(search_url, params).context['page']
+        seen.extend(result.news.pk for result in page)
+        if not page.has_next:
+            break
+        params['cursor'] = page.next_cursor
+
+    assert sorted(seen) == sorted(News.objects.values_list('pk', flat=True))
+
+
+@pytest.mark.django_db
+def test_precomputed_text_matches_filters(client, home_url, author):
+    """Тест: excerpt и text_html совпадают с выводом фильтров
+    truncatewords и linebreaksbr и обновляются при сохранении.
+    """
+    text = ' '.join(f'слово{index}' for index in range(30))
+    news = News.objects.create(title='Длинная', text=text)
+    comment = Comment.objects.create(
+        news=news, author=author, text='<b>раз</b>\nдва'
+    )
+    assert news.excerpt == Template(
+        '{{ text|truncatewords:15 }}'
+    ).render(Context({'text': text}, autoescape=False))
+    assert comment.text_html == '&lt;b&gt;раз&lt;/b&gt;<br>два'
+
+    comment.text = 'три\nчетыре'
+    comment.save(update_fields=['text'])
+    comment.refresh_from_db()
+    assert comment.text_html == 'три<br>четыре'
+
+    content = client.get(home_url).content.decode()
+    assert 'слово14 …' in content
+    assert 'слово15' not in content
+
+
+@pytest.mark.django_db
+def test_api_feed_pages_with_etag(news_count_on_home_page, client, settings):
+    """Тест: Лента API отдаёт все новости по страницам от новых к
+    старым и отвечает 304 на совпавший ETag.
+    """
+    settings.NEWS_API_PAGE_SIZE = 4
+    url = reverse('news:api_news_list')
+    ids = []
+    while url:
+        response = client.get(url)
+        data = response.json()
+        ids.extend(item['id'] for item in data['results'])
+        url = data['next']
+
+    assert ids == list(
+        News.objects.order_by('-date', '-pk').values_list('pk', flat=True)
+    )
+    response = client.get(
+        reverse('news:api_news_list'), HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert response.status_code == HTTPStatus.OK
+    first_page = client.get(reverse('news:api_news_list'))
+    response = client.get(
+        reverse('news:api_news_list'),
+        HTTP_IF_NONE_MATCH=first_page['ETag'],
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_api_export_streams_comments(ten_comments_fixture, author, client):
+    """Тест: Выгрузка комментариев идёт потоком NDJSON по строке
+    на комментарий.
+    """
+    response = client.get(
+        reverse('news:api_export', args=('comments',))
+    )
+    assert response.streaming
+    rows = [
+        json.loads(line)
+        for line in b''.join(response.streaming_content).splitlines()
+    ]
+
+    assert [row['id'] for row in rows] == list(
+        Comment.objects.order_by('pk').values_list('pk', flat=True)
+    )
+    assert {row['author_username'] for row in rows} == {author.username}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ('news:feed_rss', 'news:feed_atom'))
+def test_feeds_list_latest_news(news_count_on_home_page, client, name):
+    """Тест: Ленты RSS и Atom содержат последние новости и отвечают
+    304 на совпавший ETag.
+    """
+    response = client.get(reverse(name))
+    content = response.content.decode()
+
+    assert all(
+        news.title in content
+        for news in News.objects.order_by('-date')[:settings.NEWS_FEED_SIZE]
+    )
+    response = client.get(reverse(name), HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_sitemap_partitions_rebuild_only_when_changed(
+    news_count_on_home_page, client, monkeypatch
+):
+    """Тест: Индекс карты сайта ссылается на карты месяцев, карта
+    месяца пересобирается, только когда меняются её новости.
+    """
+    built = []
+    month_lines = sitemaps.month_lines
+
+    def counting_month_lines(*args):
+        built.append(args)
+        return month_lines(*args)
+
+    monkeypatch.setattr(sitemaps, 'month_lines', counting_month_lines)
+    index = client.get(reverse('news:sitemap')).content.decode()
+    news = News.objects.latest('date')
+    month_url = reverse('news:sitemap_month', kwargs={
+        'year': f'{news.date.year:04d}', 'month': f'{news.date.month:02d}',
+    })
+
+    assert month_url in index
+    assert reverse('news:detail', args=(news.pk,)) in client.get(
+        month_url
+    ).content.decode()
+    client.get(month_url)
+    assert len(built) == 1
+
+    news.title = 'Новый заголовок'
+    news.save()
+    client.get(month_url)
+    assert len(built) == 2
+
+
+@pytest.mark.django_db
+def test_sitemap_index_is_cached_by_generation(
+    news_count_on_home_page, client, django_assert_num_queries
+):
+    """Тест: Сводка по месяцам для индекса карты сайта берётся из кэша
+    до изменения новостей.
+    """
+    client.get(reverse('news:sitemap'))
+    with django_assert_num_queries(0):
+        client.get(reverse('news:sitemap'))
+
+    News.objects.create(title='Старая', text='Текст', date=date(2001, 2, 3))
+    index = client.get(reverse('news:sitemap')).content.decode()
+
+    assert reverse('news:sitemap_month', kwargs={
+        'year': '2001', 'month': '02',
+    }) in index
+
+
+@pytest.mark.django_db
+def test_detail_shows_flushed_views_count(client, news, detail_url):
+    """Тест: Страница новости выводит записанное число просмотров,
+    и после записи её ETag меняется.
+    """
+    etag = client.get(detail_url)['ETag']
+    views_count.counter.flush()
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'Просмотров: 1' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_rankings_list_most_discussed_news(
+    news_count_on_home_page, author, client
+):
+    """Тест: Рейтинг за сутки упорядочен по числу комментариев,
+    неизвестный рейтинг отвечает 404.
+    """
+    for count, news in enumerate(News.objects.order_by('pk')[:3], 1):
+        for _ in range(count):
+            Comment.objects.create(news=news, author=author, text='Текст')
+    update_rankings()
+    response = client.get(reverse('news:rankings', args=('day',)))
+
+    assert [
+        ranking.comments_day for ranking in response.context['object_list']
+    ] == [3, 2, 1]
+    assert client.get(
+        reverse('news:rankings', args=('unknown',))
+    ).status_code == HTTPStatus.NOT_FOUND
@@ -1,9 +1,40 @@
+import gzip
+import json
+import os
+from datetime import timedelta
 from http import HTTPStatus
+from io import StringIO
 
+import pytest
+from django.contrib.staticfiles.storage import (  # type: ignore
+    staticfiles_storage
+)
+from django.core.management import (  # type: ignore
+    CommandError, call_command
+)
+from django.core.management.base import SystemCheckError  # type: ignore
+from django.db import (  # type: ignore
+    OperationalError, connection, connections
+)
+from django.template import engines  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+from django.urls import reverse  # type: ignore
+from django.utils import timezone  # type: ignore
 from pytest_django.asserts import assertFormError  # type: ignore
 
+from news import ingest
 from news.forms import WARNING, BAD_WORDS
-from news.models import Comment
+from news.management.commands import load_news
+from news.models import Comment, News, NewsActivity, NewsRanking
+from news.pagination import EstimatedCountPaginator
+from news.profanity import Automaton, ProfanityFilter
+from news.rankings import rebuild_activity, update_rankings
+from shared.querybudget import QueryBudgetExceeded, fingerprint
+from shared.routers import ReadReplicaRouter
+from shared.sqlite.base import DatabaseWrapper
+from shared.staticfiles import serve_precompressed
+from shared.warmup import warm_up
+from yanews import settings_production
 
 FORM_DATA = {'text': 'Новый текст New'}
 
@@ -123,3 +154,616 @@ def test_author_cant_use_bad_words(
     assert comment.news == news
     assert comment.author == author
     assert comment.created == comment_from_db.created
+
+
+def test_comment_count_follows_comments(author_client, news, detail_url):
+    """Тест: Счётчик комментариев новости меняется при создании
+    и удалении комментариев, в том числе массовом.
+    """
+    author_client.post(detail_url, data={'text': 'Первый'})
+    author_client.post(detail_url, data={'text': 'Второй'})
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+    Comment.objects.filter(news=news).delete()
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
+def test_views_are_counted_in_batches(
+    client, news_count_on_home_page, settings
+):
+    """Тест: Просмотры, включая 304, копятся в памяти и записываются
+    одним UPDATE на все новости, когда их набирается
+    NEWS_VIEWS_FLUSH_HITS.
+    """
+    settings.NEWS_VIEWS_FLUSH_HITS = 4
+    settings.NEWS_VIEWS_FLUSH_INTERVAL = 60
+    first, second = News.objects.order_by('pk')[:2]
+    response = client.get(reverse('news:detail', args=(first.pk,)))
+    client.get(
+        reverse('news:detail', args=(first.pk,)),
+        HTTP_IF_NONE_MATCH=response['ETag'],
+    )
+    client.get(reverse('news:detail', args=(second.pk,)))
+    client.head(reverse('news:detail', args=(second.pk,)))
+    client.get(reverse('news:detail', args=(0,)))
+
+    assert set(News.objects.values_list('views_count', flat=True)) == {0}
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(reverse('news:detail', args=(second.pk,)))
+    updates = [
+        query['sql'] for query in queries
+        if query['sql'].startswith('UPDATE')
+    ]
+
+    assert len(updates) == 1 and 'CASE' in updates[0]
+    assert dict(News.objects.filter(
+        pk__in=(first.pk, second.pk)
+    ).values_list('pk', 'views_count')) == {first.pk: 2, second.pk: 2}
+
+
+def test_rankings_follow_comment_activity(
+    author, news_count_on_home_page
+):
+    """Тест: Почасовая активность ведётся при создании и удалении
+    комментариев, совпадает с пересчётом с нуля, а рейтинги учитывают
+    только свои окна.
+    """
+    now = timezone.now()
+    first, second, third = News.objects.order_by('pk')[:3]
+    for news, age in (
+        (first, timedelta(hours=1)),
+        (first, timedelta(hours=2)),
+        (first, timedelta(days=10)),
+        (second, timedelta(days=3)),
+        (second, timedelta(days=3)),
+        (second, timedelta(days=3)),
+        (third, timedelta(minutes=5)),
+    ):
+        Comment.objects.create(
+            news=news, author=author, text='Текст', created=now - age
+        )
+    Comment.objects.filter(news=third).delete()
+    activity = set(NewsActivity.objects.values_list(
+        'news_id', 'hour', 'comments'
+    ))
+    rebuild_activity()
+
+    assert set(NewsActivity.objects.filter(comments__gt=0).values_list(
+        'news_id', 'hour', 'comments'
+    )) == {row for row in activity if row[2]}
+
+    update_rankings()
+    rankings = {
+        ranking.news_id: ranking for ranking in NewsRanking.objects.all()
+    }
+
+    assert set(rankings) == {first.pk, second.pk}
+    assert (rankings[first.pk].comments_day,
+            rankings[first.pk].comments_week) == (2, 2)
+    assert (rankings[second.pk].comments_day,
+            rankings[second.pk].comments_week) == (0, 3)
+    assert rankings[first.pk].score > rankings[second.pk].score
+    assert rankings[first.pk].last_comment > rankings[second.pk].last_comment
+
+
+@pytest.mark.django_db(transaction=True)
+def test_news_with_recent_comments_can_be_deleted(author):
+    """Тест: Удаление новости со свежими комментариями не оставляет
+    строк активности, ссылающихся на неё.
+    """
+    news = News.objects.create(title='Заголовок', text='Текст')
+    Comment.objects.create(news=news, author=author, text='Текст')
+    news.delete()
+
+    assert not NewsActivity.objects.exists()
+
+
+def test_recount_comments_command(comment, news):
+    """Тест: Команда recount_comments восстанавливает счётчик."""
+    News.objects.update(comment_count=42)
+    call_command('recount_comments', stdout=StringIO())
+    news.refresh_from_db()
+
+    assert news.comment_count == 1
+
+
+def test_automaton_finds_overlapping_words():
+    """Тест: Автомат находит слова, вложенные друг в друга,
+    и не различает ё и е.
+    """
+    automaton = Automaton(('hers', 'she', 'Ёжик'))
+
+    assert automaton.find('ushers') == 'she'
+    assert automaton.find('Туманный ежик') == 'ежик'
+    assert automaton.find('ничего такого') is None
+
+
+def test_automaton_whole_words_mode():
+    """Тест: В режиме целых слов часть другого слова не считается."""
+    automaton = Automaton(('кот', 'котик'))
+
+    assert automaton.find('скотина', whole_words=True) is None
+    assert automaton.find('вот котик!', whole_words=True) == 'котик'
+
+
+def test_bad_words_file_is_reloaded(tmp_path, settings):
+    """Тест: Изменённый файл словаря подхватывается без перезапуска."""
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('# словарь\nбука\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = words_file
+    settings.BAD_WORDS_RELOAD_INTERVAL = 0
+    profanity_filter = ProfanityFilter(BAD_WORDS)
+    assert profanity_filter.find('злая бука') == 'бука'
+    assert profanity_filter.find(BAD_WORDS[0]) is None
+
+    words_file.write_text('злюка\n', encoding='utf-8')
+    os.utime(words_file, ns=(0, 0))
+
+    assert profanity_filter.find('злая бука') is None
+    assert profanity_filter.find('злюка') == 'злюка'
+
+
+def test_missing_bad_words_file_keeps_automaton(tmp_path, settings, caplog):
+    """Тест: Пропавший файл словаря не ломает проверку: остаётся
+    прежний автомат, а до первой загрузки — словарь по умолчанию.
+    """
+    words_file = tmp_path / 'bad_words.txt'
+    settings.BAD_WORDS_FILE = words_file
+    settings.BAD_WORDS_RELOAD_INTERVAL = 0
+    profanity_filter = ProfanityFilter(BAD_WORDS)
+    assert profanity_filter.find(BAD_WORDS[0]) == BAD_WORDS[0]
+
+    words_file.write_text('бука\n', encoding='utf-8')
+    assert profanity_filter.find('злая бука') == 'бука'
+    words_file.unlink()
+
+    assert profanity_filter.find('злая бука') == 'бука'
+    assert 'Нет доступа к словарю' in caplog.text
+
+
+def test_query_budget_exceeded_raises(client, detail_url, settings):
+    """Тест: Превышение бюджета SQL-запросов приводит к исключению."""
+    settings.QUERY_BUDGET_PER_VIEW = {'news:detail': 1}
+    settings.QUERY_BUDGET_RAISE = True
+
+    with pytest.raises(QueryBudgetExceeded, match='news:detail'):
+        client.get(detail_url)
+
+
+def test_query_stats_are_aggregated(
+    client, detail_url, home_url, tmp_path, settings
+):
+    """Тест: Статистика запросов пишется в файл и сводится командой."""
+    settings.QUERY_BUDGET_STATS_FILE = tmp_path / 'stats.ndjson'
+    client.get(home_url)
+    client.get(detail_url)
+    client.get(detail_url)
+    out = StringIO()
+    call_command('query_stats', stdout=out)
+
+    assert 'news:detail: запросов 2' in out.getvalue()
+    assert 'news:home: запросов 1' in out.getvalue()
+
+
+def test_fingerprint_ignores_literals():
+    """Тест: Запросы, различающиеся только значениями, совпадают."""
+    assert fingerprint(
+        "SELECT * FROM t WHERE id = 5 AND name = 'a''b'"
+    ) == fingerprint("SELECT *  FROM t WHERE id = 17 AND name = 'c'")
+    assert fingerprint('WHERE id IN (%s, %s)') == 'WHERE id IN (...)'
+
+
+def test_load_news_from_ndjson(author, tmp_path):
+    """Тест: load_news загружает NDJSON, сохраняет время создания
+    комментариев и ведёт счётчик комментариев.
+    """
+    records = [
+        {'model': 'news.news', 'pk': 100,
+         'fields': {'title': 'Загружена', 'text': 'Текст'}},
+        {'model': 'news.comment',
+         'fields': {'news': 100, 'author': author.username, 'text': 'Раз',
+                    'created': '2020-01-01T10:00:00Z'}},
+        {'model': 'news.comment',
+         'fields': {'news': 100, 'author': [author.username],
+                    'text': 'Два'}},
+    ]
+    path = tmp_path / 'news.ndjson'
+    path.write_text(
+        '\n'.join(json.dumps(record) for record in records),
+        encoding='utf-8',
+    )
+    call_command('load_news', str(path), batch_size=2, stdout=StringIO())
+    news = News.objects.get(pk=100)
+
+    assert news.comment_count == 2
+    assert news.comment_set.get(text='Раз').created.year == 2020
+
+
+def test_load_news_streams_json_array(author, tmp_path, monkeypatch):
+    """Тест: JSON-массив разбирается по частям."""
+    monkeypatch.setattr(load_news, 'READ_SIZE', 16)
+    records = [
+        {'model': 'news.news', 'pk': pk,
+         'fields': {'title': f'Новость {pk}', 'text': 'Текст'}}
+        for pk in range(1, 6)
+    ]
+    path = tmp_path / 'news.json'
+    path.write_text(json.dumps(records, indent=2), encoding='utf-8')
+    call_command(
+        'load_news', str(path), transaction_size=2, stdout=StringIO()
+    )
+
+    assert News.objects.count() == 5
+
+
+def test_load_news_rejects_malformed_json(db, tmp_path, monkeypatch):
+    """Тест: Строки NDJSON с ошибкой пропускаются и считаются, а
+    испорченная запись JSON-массива останавливает разбор сразу, не
+    дочитывая файл в буфер.
+    """
+    news = {'model': 'news.news', 'fields': {'title': 'З', 'text': 'Т'}}
+    path = tmp_path / 'news.ndjson'
+    path.write_text(
+        f'{json.dumps(news)}\n{{"model": oops}}\n{json.dumps(news)}\n',
+        encoding='utf-8',
+    )
+    stderr = StringIO()
+    call_command('load_news', str(path), stdout=StringIO(), stderr=stderr)
+
+    assert News.objects.count() == 2
+    assert 'некорректным JSON: 1, первая — строка 2' in stderr.getvalue()
+
+    monkeypatch.setattr(load_news, 'READ_SIZE', 64)
+    stream = StringIO('[{"model": oops}, ' + json.dumps([news] * 1000)[1:])
+    reads = []
+    read = stream.read
+    monkeypatch.setattr(stream, 'read', lambda size: reads.append(size)
+                        or read(size))
+
+    with pytest.raises(CommandError, match='Некорректный JSON'):
+        list(load_news.iter_json_array(stream))
+    assert len(reads) == 1
+
+
+def test_loaddata_loads_news_fixture(db):
+    """Тест: Фикстура news/fixtures/news.json загружается loaddata."""
+    call_command('loaddata', 'news.json', stdout=StringIO())
+
+    assert News.objects.exists()
+    assert not News.objects.filter(updated__isnull=True).exists()
+
+
+def test_loaddata_fills_precomputed_text(author, tmp_path):
+    """Тест: loaddata заполняет excerpt новостей и text_html
+    комментариев, хотя сохраняет в обход save().
+    """
+    call_command('loaddata', 'news.json', stdout=StringIO())
+    path = tmp_path / 'comments.json'
+    path.write_text(json.dumps([
+        {'model': 'news.news', 'pk': 1000,
+         'fields': {'title': 'З', 'text': 'Текст новости'}},
+        {'model': 'news.comment',
+         'fields': {'news': 1000, 'author': author.pk,
+                    'text': 'Строка\nвторая'}},
+    ]), encoding='utf-8')
+    call_command('loaddata', str(path), stdout=StringIO())
+
+    assert not News.objects.filter(excerpt='').exists()
+    assert Comment.objects.get().text_html == 'Строка<br>вторая'
+
+
+def test_generate_news_skews_comments(author):
+    """Тест: generate_news распределяет комментарии неравномерно
+    и ведёт счётчик комментариев.
+    """
+    call_command(
+        'generate_news', users=5, news=20, comments=400, seed=1,
+        stdout=StringIO(),
+    )
+    counts = sorted(
+        News.objects.values_list('comment_count', flat=True), reverse=True
+    )
+
+    assert sum(counts) == Comment.objects.count() == 400
+    assert counts[0] > 4 * counts[len(counts) // 2]
+
+
+def test_queued_comment_is_visible_to_author_until_drained(
+    author_client, not_author_client, news, detail_url, tmp_path, settings
+):
+    """Тест: В режиме очереди комментарий сразу виден автору,
+    а в БД попадает после разбора очереди.
+    """
+    settings.COMMENT_QUEUE_FILE = tmp_path / 'comments.ndjson'
+    form_data = {'text': 'Комментарий из очереди'}
+    response = author_client.post(detail_url, data=form_data)
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.count() == 0
+    assert form_data['text'] in author_client.get(detail_url).content.decode()
+    assert form_data['text'] not in not_author_client.get(
+        detail_url
+    ).content.decode()
+
+    call_command('drain_comment_queue', stdout=StringIO())
+    news.refresh_from_db()
+
+    assert news.comment_count == 1
+    assert Comment.objects.get().text == form_data['text']
+    assert author_client.get(detail_url).content.decode().count(
+        form_data['text']
+    ) == 1
+    assert not author_client.session['pending_comments']
+
+
+def test_drain_resumes_from_offset(author, news, tmp_path, settings):
+    """Тест: Разбор после сбоя продолжается с последней
+    зафиксированной пачки и отбрасывает недописанную строку.
+    """
+    queue = tmp_path / 'comments.ndjson'
+    settings.COMMENT_QUEUE_FILE = queue
+    for index in range(3):
+        ingest.enqueue(Comment(
+            news=news, author=author, text=f'Текст {index}',
+            created=timezone.now(),
+        ))
+    lines = queue.read_bytes().splitlines(keepends=True)
+    (tmp_path / 'comments.ndjson.draining').write_bytes(
+        b''.join(lines) + b'{"news": '
+    )
+    queue.unlink()
+    (tmp_path / 'comments.ndjson.offset').write_text(str(len(lines[0])))
+
+    assert ingest.drain(batch_size=1) == 2
+    assert set(Comment.objects.values_list('text', flat=True)) == {
+        'Текст 1', 'Текст 2'
+    }
+    assert not list(tmp_path.glob('comments.ndjson.draining'))
+
+
+def test_torn_queue_line_does_not_block_drain(
+    author, news, tmp_path, settings
+):
+    """Тест: Запись после оборванной падением строки начинается с новой
+    строки, а разбор пропускает оборванную и записывает остальные.
+    """
+    queue = tmp_path / 'comments.ndjson'
+    settings.COMMENT_QUEUE_FILE = queue
+    queue.write_bytes(b'{"news": ')
+    ingest.enqueue(Comment(
+        news=news, author=author, text='После сбоя', created=timezone.now(),
+    ))
+
+    assert ingest.drain() == 1
+    assert Comment.objects.get().text == 'После сбоя'
+
+
+def test_admin_bulk_delete_keeps_counters(
+    admin_client, news, author, not_author
+):
+    """Тест: Массовое удаление комментариев в админке обновляет
+    счётчики новостей; удаление всех комментариев авторов ждёт
+    подтверждения.
+    """
+    comments = [
+        Comment.objects.create(news=news, author=user, text='Текст')
+        for user in (author, author, not_author)
+    ]
+    admin_client.post(reverse('admin:news_comment_changelist'), {
+        'action': 'delete_selected',
+        '_selected_action': [comments[0].pk],
+        'post': 'yes',
+    })
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+    data = {
+        'action': 'delete_all_comments_by_authors',
+        '_selected_action': [comments[1].pk],
+    }
+    response = admin_client.post(
+        reverse('admin:news_comment_changelist'), data
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['count'] == 1
+    assert Comment.objects.filter(author=author).exists()
+
+    admin_client.post(
+        reverse('admin:news_comment_changelist'), {**data, 'post': 'yes'}
+    )
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    assert Comment.objects.get().author == not_author
+
+
+def test_estimated_count_paginator(news, settings):
+    """Тест: Большая неотфильтрованная таблица считается по оценке,
+    отфильтрованный список — точно.
+    """
+    News.objects.create(pk=50000, title='Последняя', text='Текст')
+    paginator = EstimatedCountPaginator(News.objects.all(), 20)
+    assert paginator.count == 50000
+
+    paginator = EstimatedCountPaginator(
+        News.objects.filter(title='Последняя'), 20
+    )
+    assert paginator.count == 1
+
+
+def test_warm_up_compiles_templates_and_urls(settings):
+    """Тест: Прогрев компилирует все шаблоны проекта в кэширующий
+    загрузчик и строит таблицы URL.
+    """
+    settings.TEMPLATES = settings_production.TEMPLATES
+    templates_dir = settings.BASE_DIR / 'templates'
+    stats = warm_up()
+    loader, = engines['django'].engine.template_loaders
+    cached = {name.split('-')[0] for name in loader.get_template_cache}
+
+    assert {
+        path.relative_to(templates_dir).as_posix()
+        for path in templates_dir.rglob('*.html')
+    } <= cached
+    assert stats['urls'] >= 7
+
+
+def test_sqlite_backend_applies_pragmas(db, tmp_path):
+    """Тест: Соединения получают PRAGMA из настроек, соединение только
+    для чтения не может писать.
+    """
+    settings_dict = {
+        **connection.settings_dict,
+        'NAME': tmp_path / 'db.sqlite3',
+        'OPTIONS': {'pragmas': {'cache_size': -1000}},
+    }
+    primary = DatabaseWrapper(settings_dict, 'primary')
+    replica = DatabaseWrapper({
+        **settings_dict,
+        'OPTIONS': {**settings_dict['OPTIONS'], 'read_only': True},
+    }, 'replica')
+    try:
+        with primary.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id integer)')
+            for pragma, expected in (
+                ('journal_mode', 'wal'),
+                ('cache_size', -1000),
+                ('busy_timeout', 5000),
+            ):
+                cursor.execute(f'PRAGMA {pragma}')
+                assert cursor.fetchone()[0] == expected
+        with replica.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM item')
+            with pytest.raises(OperationalError):
+                cursor.execute('INSERT INTO item VALUES (1)')
+    finally:
+        primary.close()
+        replica.close()
+
+
+def test_read_replica_router(db, monkeypatch):
+    """Тест: Чтение вне транзакции идёт в реплику, запись и чтение
+    внутри транзакции — в основную базу.
+    """
+    router = ReadReplicaRouter()
+
+    assert router.db_for_read(News) == 'default'
+    monkeypatch.setattr(connection, 'in_atomic_block', False)
+    assert router.db_for_read(News) == 'replica'
+    assert router.db_for_write(News) == 'default'
+    assert not router.allow_migrate('replica', 'news')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_delete_writes_to_primary_with_read_replica(settings, author):
+    """Тест: Массовое удаление комментариев вне транзакции пишет
+    в основную базу, а не в реплику только для чтения.
+    """
+    news = News.objects.create(title='Заголовок', text='Текст')
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Текст {number}')
+        for number in range(3)
+    )
+    News.objects.update(comment_count=3)
+    replica = DatabaseWrapper({
+        **connection.settings_dict,
+        'OPTIONS': {**connection.settings_dict['OPTIONS'], 'read_only': True},
+    }, 'replica')
+    connections['replica'] = replica
+    settings.DATABASE_ROUTERS = ['shared.routers.ReadReplicaRouter']
+    try:
+        comments = Comment.objects.filter(news=news)
+        assert comments.db == 'replica'
+        comments.bulk_delete()
+        news.refresh_from_db()
+
+        assert not Comment.objects.exists()
+        assert news.comment_count == 0
+    finally:
+        replica.close()
+        del connections['replica']
+
+
+def test_anonymous_fast_path_skips_session(client, author_client, detail_url):
+    """Тест: Анонимная страница новости обслуживается без сессии и
+    кэшируется публично, с cookie сессии — обычным путём.
+    """
+    response = client.get(detail_url)
+
+    assert response.status_code == HTTPStatus.OK
+    assert not hasattr(response.wsgi_request, 'session')
+    assert 'Cookie' in response['Vary']
+    assert 'public' in response['Cache-Control']
+    assert response['X-Frame-Options'] == 'DENY'
+
+    response = author_client.get(detail_url)
+
+    assert response.wsgi_request.user.is_authenticated
+    assert 'form' in response.context
+    assert 'public' not in response.get('Cache-Control', '')
+
+
+def test_collectstatic_serves_precompressed_files(settings, tmp_path, rf):
+    """Тест: collectstatic сохраняет сжатые копии файлов с хэшем в
+    имени, и они отдаются клиентам, принимающим gzip.
+    """
+    css = b'body { color: black; }\n' * 50
+    (tmp_path / 'static' / 'css').mkdir(parents=True)
+    (tmp_path / 'static' / 'css' / 'site.css').write_bytes(css)
+    settings.STATICFILES_DIRS = [tmp_path / 'static']
+    settings.STATIC_ROOT = tmp_path / 'root'
+    settings.STATICFILES_STORAGE = (
+        'shared.staticfiles.CompressedManifestStaticFilesStorage'
+    )
+    call_command(
+        'collectstatic', interactive=False, verbosity=0,
+        ignore_patterns=['admin'],
+    )
+    name = staticfiles_storage.stored_name('css/site.css')
+
+    response = serve_precompressed(
+        rf.get(f'/static/{name}', HTTP_ACCEPT_ENCODING='gzip, deflate'), name
+    )
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response['Cache-Control']
+    assert gzip.decompress(b''.join(response.streaming_content)) == css
+    response.file_to_stream.close()
+
+    response = serve_precompressed(
+        rf.get('/static/css/site.css'), 'css/site.css'
+    )
+    assert not response.has_header('Content-Encoding')
+    assert 'no-cache' in response['Cache-Control']
+    response.file_to_stream.close()
+
+
+@pytest.mark.django_db
+def test_missing_vendored_static_fails_deploy_check(
+    settings, tmp_path, client, home_url
+):
+    """Тест: пока сторонний файл не загружен vendor_static, check
+    --deploy падает, а с DEBUG страницы ссылаются на его источник с
+    хэшем SRI.
+    """
+    name = 'vendor/bootstrap-5.0.1/bootstrap.min.css'
+    (tmp_path / 'static').mkdir()
+    settings.STATICFILES_DIRS = [tmp_path / 'static']
+    settings.STATIC_ROOT = tmp_path / 'root'
+    settings.STATICFILES_STORAGE = (
+        'shared.staticfiles.CompressedManifestStaticFilesStorage'
+    )
+    call_command(
+        'collectstatic', interactive=False, verbosity=0,
+        ignore_patterns=['admin'],
+    )
+
+    with pytest.raises(SystemCheckError, match='shared.E001'):
+        call_command('check', deploy=True, stdout=StringIO())
+
+    settings.DEBUG = True
+    response = client.get(home_url)
+    url, integrity = settings.VENDORED_STATIC[name]
+    assert response.status_code == HTTPStatus.OK
+    assert f'href="{url}" integrity="{integrity}"' in response.content.decode()
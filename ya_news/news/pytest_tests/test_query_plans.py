@@ -0,0 +1,209 @@
+import re
+
+import pytest
+from django.db import connection  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+from django.urls import reverse  # type: ignore
+from pytest_lazyfixture import lazy_fixture  # type: ignore
+
+from news.rankings import RANKINGS, update_rankings
+
+# Проход таблицы или индекса от начала: SCAN без индекса или
+# SCAN ... USING (COVERING) INDEX. Поиск по индексу (SEARCH) и проход
+# по виртуальной таблице FTS5 допустимы.
+FULL_SCAN_RE = re.compile(r'^SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$')
+TEMP_SORT = 'USE TEMP B-TREE'
+# Первые LIMIT строк списка без условий.
+TOP_N_RE = re.compile(r'^SELECT (?:(?! WHERE ).)* LIMIT \d+$')
+
+pytestmark = pytest.mark.django_db
+
+
+def is_top_n_walk(detail, sql, top_n):
+    """Проход индекса таблицы из top_n за первыми строками списка."""
+    match = FULL_SCAN_RE.match(detail)
+    return (
+        match.group(1) in top_n and 'INDEX' in detail
+        and TOP_N_RE.match(sql) is not None
+    )
+
+
+def bad_plan_steps(queries, top_n=()):
+    """Шаги планов SELECT-запросов с полным сканом или сортировкой.
+
+    top_n — таблицы, для которых допустим проход индекса с начала
+    в запросе первых строк списка без условий.
+    """
+    steps = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            for *_, detail in cursor.fetchall():
+                if TEMP_SORT in detail or (
+                    FULL_SCAN_RE.match(detail)
+                    and not is_top_n_walk(detail, sql, top_n)
+                ):
+                    steps.append(f'{detail}: {sql}')
+    return steps
+
+
+def assert_indexed(client, url, top_n=()):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    steps = bad_plan_steps(context.captured_queries, top_n)
+    assert not steps, '\n'.join(steps)
+
+
+def assert_seeks(client, url, table, field):
+    """Запрос страницы по курсору ищет начало в индексе по field."""
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    seek_re = re.compile(rf'^SEARCH {table} .*\b{field}[<>]')
+    details = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            if query['sql'].startswith('SELECT'):
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                details += [detail for *_, detail in cursor.fetchall()]
+    assert any(seek_re.match(detail) for detail in details), details
+
+
+@pytest.mark.parametrize(
+    'url, top_n',
+    (
+        (lazy_fixture('home_url'), ('news_news',)),
+        (lazy_fixture('archive_url'), ('news_news',)),
+        (lazy_fixture('detail_url'), ()),
+        (lazy_fixture('comments_url'), ()),
+        (lazy_fixture('edit_url'), ()),
+        (lazy_fixture('delete_url'), ()),
+    )
+)
+def test_views_use_indexes(author_client, url, top_n, ten_comments_fixture):
+    """Тест: Запросы страниц новостей обходятся без полного скана
+    таблиц и временной сортировки; главная и первая страница архива
+    читают первые строки индекса по дате.
+    """
+    assert_indexed(author_client, url, top_n)
+
+
+def test_next_pages_use_indexes(
+    author_client, news, ten_comments_fixture, news_count_on_home_page,
+    settings
+):
+    """Тест: Следующие страницы архива и комментариев по курсору
+    и поиск используют индексы.
+    """
+    settings.NEWS_COUNT_ON_ARCHIVE_PAGE = 2
+    settings.COMMENTS_COUNT_ON_DETAIL_PAGE = 2
+    archive_url = reverse('news:archive')
+    comments_url = reverse('news:comments', args=(news.pk,))
+    archive_cursor = author_client.get(
+        archive_url
+    ).context['page'].next_cursor
+    comments_cursor = author_client.get(
+        comments_url
+    ).context['comments'].next_cursor
+
+    assert_indexed(author_client, f'{archive_url}?cursor={archive_cursor}')
+    assert_indexed(author_client, f'{comments_url}?cursor={comments_cursor}')
+    assert_indexed(author_client, reverse('news:search') + '?q=Текст')
+
+
+def test_api_uses_indexes(client, news, ten_comments_fixture):
+    """Тест: JSON API, ленты и карта сайта обходятся без полного скана
+    и временной сортировки.
+    """
+    for url, top_n in (
+        (reverse('news:api_news_list'), ('news_news',)),
+        (reverse('news:api_news_detail', args=(news.pk,)), ()),
+        (reverse('news:api_comments', args=(news.pk,)), ()),
+        (reverse('news:feed_atom'), ('news_news',)),
+        (reverse('news:sitemap_month', kwargs={
+            'year': f'{news.date.year:04d}',
+            'month': f'{news.date.month:02d}',
+        }), ()),
+    ):
+        assert_indexed(client, url, top_n)
+
+
+def test_sitemap_index_groups_by_date_index(client, news):
+    """Тест: Индекс карты сайта — единственный проход всей таблицы
+    новостей — группирует по индексу даты без временной сортировки.
+    """
+    with CaptureQueriesContext(connection) as context:
+        client.get(reverse('news:sitemap'))
+    steps = bad_plan_steps(context.captured_queries)
+    group_by_date_re = re.compile(
+        r'^SCAN news_news USING INDEX news_news_date_\w+: SELECT .*'
+        r' GROUP BY "news_news"."date" ORDER BY "news_news"."date" ASC$'
+    )
+
+    assert len(steps) == 1 and group_by_date_re.match(steps[0]), steps
+
+
+def test_rankings_use_indexes(client, news, ten_comments_fixture):
+    """Тест: Списки рейтингов читают первые строки индексов
+    NewsRanking.
+    """
+    update_rankings()
+    for kind in RANKINGS:
+        assert_indexed(
+            client, reverse('news:rankings', args=(kind,)),
+            ('news_newsranking',),
+        )
+
+
+def test_news_cursor_pages_seek(client, news_count_on_home_page, settings):
+    """Тест: Следующие страницы архива и API новостей начинают проход
+    индекса с курсора, а не с начала.
+    """
+    settings.NEWS_COUNT_ON_ARCHIVE_PAGE = 2
+    settings.NEWS_API_PAGE_SIZE = 2
+    archive_url = reverse('news:archive')
+    api_url = reverse('news:api_news_list')
+    archive_cursor = client.get(archive_url).context['page'].next_cursor
+    next_api_url = client.get(api_url).json()['next']
+
+    assert_seeks(
+        client, f'{archive_url}?cursor={archive_cursor}', 'news_news', 'date'
+    )
+    assert_seeks(client, next_api_url, 'news_news', 'date')
+
+
+def test_comment_cursor_pages_seek(
+    client, news, ten_comments_fixture, settings
+):
+    """Тест: Следующие страницы комментариев на сайте и в API начинают
+    проход индекса (news, created, id) с курсора.
+    """
+    settings.COMMENTS_COUNT_ON_DETAIL_PAGE = 2
+    settings.NEWS_API_PAGE_SIZE = 2
+    comments_url = reverse('news:comments', args=(news.pk,))
+    api_url = reverse('news:api_comments', args=(news.pk,))
+    cursor = client.get(comments_url).context['comments'].next_cursor
+    next_api_url = client.get(api_url).json()['next']
+
+    assert_seeks(
+        client, f'{comments_url}?cursor={cursor}', 'news_comment', 'created'
+    )
+    assert_seeks(client, next_api_url, 'news_comment', 'created')
+
+
+def test_admin_comment_changelist_does_not_sort(
+    admin_client, news, ten_comments_fixture
+):
+    """Тест: Список комментариев в админке идёт по первичному ключу
+    без временной сортировки и без выборки дат для date_hierarchy.
+    """
+    with CaptureQueriesContext(connection) as context:
+        admin_client.get(reverse('admin:news_comment_changelist'))
+    steps = [
+        step for step in bad_plan_steps(context.captured_queries)
+        if TEMP_SORT in step or 'django_datetime_trunc' in step
+    ]
+
+    assert not steps, '\n'.join(steps)
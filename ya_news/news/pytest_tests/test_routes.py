@@ -1,9 +1,19 @@
+import re
 from http import HTTPStatus
 
 import pytest
+from asgiref.sync import async_to_sync  # type: ignore
+from django.core.checks.urls import (  # type: ignore
+    check_url_namespaces_unique
+)
+from django.test import AsyncClient  # type: ignore
+from django.urls import reverse  # type: ignore
+from django.utils import timezone  # type: ignore
+from django.utils.http import http_date  # type: ignore
 from pytest_lazyfixture import lazy_fixture  # type: ignore
 from pytest_django.asserts import assertRedirects  # type: ignore
 
+from news.models import Comment, News
 from .test_logic import FORM_DATA
 
 
@@ -79,3 +89,181 @@ def test_redirect(client, name, detail_url, edit_url, delete_url, login_url):
     elif name == detail_url:
         response = client.post(name, data=FORM_DATA)
     assertRedirects(response, expected_url)
+
+
+def test_detail_conditional_get(
+    comment, author_client, not_author_client, detail_url, author,
+    django_assert_num_queries
+):
+    """Тест: Страница новости отдаёт 304 при совпадении ETag, а после
+    нового комментария и для другого пользователя — полную страницу.
+    """
+    etag = author_client.get(detail_url)['ETag']
+    # Сессия, пользователь и один агрегатный запрос валидаторов.
+    with django_assert_num_queries(3):
+        response = author_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert 'Cookie' in response['Vary']
+
+    response = not_author_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+    author_client.post(detail_url, data={'text': 'Ещё комментарий'})
+    response = author_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_detail_not_modified_only_by_etag(comment, author_client, news):
+    """Тест: Страница новости и её API не отдают Last-Modified и не
+    отвечают 304 по If-Modified-Since после удаления комментария.
+    """
+    urls = (
+        reverse('news:detail', args=(news.pk,)),
+        reverse('news:api_news_detail', args=(news.pk,)),
+    )
+    for url in urls:
+        assert not author_client.get(url).has_header('Last-Modified')
+    since = http_date(timezone.now().timestamp())
+    comment.delete()
+
+    for url in urls:
+        response = author_client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == HTTPStatus.OK
+
+
+def test_etags_share_one_format(comment, client, news):
+    """Тест: Страница новости, API, лента и карта сайта отдают ETag
+    одного формата.
+    """
+    etag_re = re.compile(r'^"[0-9a-f]{32}"$')
+    for url in (
+        reverse('news:detail', args=(news.pk,)),
+        reverse('news:api_news_list'),
+        reverse('news:api_comments', args=(news.pk,)),
+        reverse('news:feed_rss'),
+        reverse('news:sitemap'),
+        reverse('news:sitemap_month', kwargs={
+            'year': f'{news.date.year:04d}',
+            'month': f'{news.date.month:02d}',
+        }),
+    ):
+        assert etag_re.match(client.get(url)['ETag']), url
+
+
+@pytest.mark.urls('yanews.urls_async')
+@pytest.mark.django_db(transaction=True)
+def test_async_read_views(author, detail_url, home_url):
+    """Тест: Асинхронные главная и страница новости отдают те же
+    данные и поддерживают условный GET.
+    """
+    client = AsyncClient()
+
+    @async_to_sync
+    async def get(path, **extra):
+        return await client.get(path, **extra)
+
+    news = News.objects.get()
+    Comment.objects.create(news=news, author=author, text='Асинхронно')
+
+    response = get(home_url)
+    assert response.status_code == HTTPStatus.OK
+    assert news.title in response.content.decode()
+
+    response = get(detail_url)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Асинхронно' in response.content.decode()
+    assert 'public' in response['Cache-Control']
+
+    response = get(
+        detail_url, **{'if-none-match': response['ETag']}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = get(
+        reverse('news:detail', args=(news.pk + 1,))
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.urls('yanews.urls_async')
+@pytest.mark.parametrize('method', ('delete', 'put', 'options'))
+def test_async_read_views_reject_other_methods(
+    method, detail_url, home_url
+):
+    """Тест: Асинхронные главная и страница новости отвечают 405
+    на методы, кроме чтения и отправки комментария.
+    """
+    client = AsyncClient()
+
+    @async_to_sync
+    async def request(path):
+        return await getattr(client, method)(path)
+
+    for url in (home_url, detail_url):
+        assert request(url).status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+@pytest.mark.urls('yanews.urls_async')
+def test_async_urlconf_namespaces_are_unique():
+    """Тест: urlconf для ASGI подключает маршруты news один раз."""
+    assert check_url_namespaces_unique(None) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_streams_export(comment):
+    """Тест: Под ASGI выгрузка NDJSON читает БД не в цикле событий."""
+    from yanews.asgi import application
+
+    path = reverse('news:api_export', args=('comments',))
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(application)(scope, receive, send)
+
+    assert messages[0]['status'] == HTTPStatus.OK
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    assert comment.text in body.decode()
+
+
+@pytest.mark.django_db
+def test_admin_news_pages_do_not_grow_with_comments(
+    admin_client, news, author, django_assert_max_num_queries
+):
+    """Тест: Страница новости в админке показывает только последние
+    комментарии, число запросов не зависит от их количества.
+    """
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(50)
+    )
+    change_url = reverse('admin:news_news_change', args=(news.pk,))
+    with django_assert_max_num_queries(12):
+        response = admin_client.get(change_url)
+
+    assert response.status_code == HTTPStatus.OK
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert len(formset.forms) == formset.limit
+
+    for url in (
+        reverse('admin:news_news_changelist'),
+        reverse('admin:news_comment_changelist'),
+    ):
+        with django_assert_max_num_queries(12):
+            assert admin_client.get(url).status_code == HTTPStatus.OK
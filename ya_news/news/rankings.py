@@ -0,0 +1,190 @@
+"""Рейтинги новостей: самые обсуждаемые за сутки и за неделю, горячие
+и недавно обсуждавшиеся.
+
+Комментарии считаются по часам в NewsActivity: создание и удаление
+комментария меняют счётчик своего часа: создание — одним UPSERT,
+удаление — одним UPDATE существующей строки, массовые вставки и
+удаления — одним executemany на пачку. Периодическая команда
+update_rankings удаляет часы старше недели и пересчитывает NewsRanking
+по оставшимся: это не больше 168 строк на новость вместо всех её
+комментариев. Списки рейтингов читают только NewsRanking, поэтому
+отстают от комментариев не больше чем на период запуска команды.
+
+Окна суток и недели начинаются с целого часа. Горячесть — сумма
+комментариев с весом, который вдвое падает каждые
+NEWS_RANKING_HALF_LIFE часов.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import Comment, News, NewsActivity, NewsRanking
+
+WINDOW = timedelta(days=7)
+DAY = timedelta(days=1)
+HOUR = timedelta(hours=1)
+
+# Вид рейтинга: (поле NewsRanking, заголовок списка).
+RANKINGS = {
+    'day': ('comments_day', 'Самые обсуждаемые за сутки'),
+    'week': ('comments_week', 'Самые обсуждаемые за неделю'),
+    'hot': ('score', 'Горячие'),
+    'recent': ('last_comment', 'Недавно обсуждавшиеся'),
+}
+
+UPSERT_SQL = """
+    INSERT INTO news_newsactivity (news_id, hour, comments)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (news_id, hour)
+    DO UPDATE SET comments = comments + excluded.comments
+"""
+# Уменьшение только меняет существующую строку: при удалении новости
+# Django сначала удаляет её NewsActivity, а потом комментарии, и UPSERT
+# вставил бы строку, ссылающуюся на удаляемую новость.
+DECREMENT_SQL = """
+    UPDATE news_newsactivity SET comments = comments + %s
+    WHERE news_id = %s AND hour = %s
+"""
+
+
+def hour_of(moment):
+    # Загрузка фикстур может дать наивное время: Django сохранил бы
+    # его в часовом поясе по умолчанию.
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def window_start(now):
+    return hour_of(now - WINDOW)
+
+
+def comment_activity(comments, sign=1):
+    """Приращения {(news_id, час): delta} для комментариев."""
+    return Counter({
+        key: sign * count for key, count in Counter(
+            (comment.news_id, hour_of(comment.created))
+            for comment in comments
+        ).items()
+    })
+
+
+def hourly_counts(comments):
+    """(news_id, час, число) по queryset комментариев."""
+    return comments.order_by().annotate(
+        hour=Trunc('created', 'hour', tzinfo=timezone.utc)
+    ).values_list('news_id', 'hour').annotate(count=Count('pk'))
+
+
+def queryset_activity(comments, sign=1):
+    return Counter({
+        (news_id, hour): sign * count
+        for news_id, hour, count in hourly_counts(comments)
+    })
+
+
+def change_activity(deltas):
+    """Меняет счётчики часов: {(news_id, час): delta}.
+
+    Часы старше окна рейтингов пропускаются: команда их всё равно
+    удалит.
+    """
+    start = window_start(timezone.now())
+    adapt = connection.ops.adapt_datetimefield_value
+    increments = []
+    decrements = []
+    for (news_id, hour), delta in deltas.items():
+        if hour < start:
+            continue
+        if delta > 0:
+            increments.append((news_id, adapt(hour), delta))
+        elif delta < 0:
+            decrements.append((delta, news_id, adapt(hour)))
+    with connection.cursor() as cursor:
+        if increments:
+            cursor.executemany(UPSERT_SQL, increments)
+        if decrements:
+            cursor.executemany(DECREMENT_SQL, decrements)
+
+
+def rebuild_activity(now=None):
+    """Заново считает NewsActivity по комментариям окна.
+
+    Полный проход по комментариям: для первого запуска и ремонта.
+    """
+    start = window_start(now or timezone.now())
+    with transaction.atomic():
+        NewsActivity.objects.all().delete()
+        NewsActivity.objects.bulk_create(
+            (
+                NewsActivity(news_id=news_id, hour=hour, comments=count)
+                for news_id, hour, count in hourly_counts(
+                    Comment.objects.filter(created__gte=start)
+                )
+            ),
+            batch_size=500,
+        )
+
+
+def last_comments(news_ids, chunk_size=500):
+    """{news_id: время последнего комментария} с конца индекса
+    (news, created, id).
+    """
+    last = Comment.objects.filter(news_id=OuterRef('pk')).order_by(
+        '-created', '-pk'
+    ).values('created')[:1]
+    news_ids = list(news_ids)
+    result = {}
+    for start in range(0, len(news_ids), chunk_size):
+        chunk = news_ids[start:start + chunk_size]
+        result.update(News.objects.filter(pk__in=chunk).order_by().annotate(
+            last_comment=Subquery(last)
+        ).values_list('pk', 'last_comment'))
+    return result
+
+
+def update_rankings(now=None):
+    """Пересчитывает NewsRanking; возвращает число новостей в нём."""
+    now = now or timezone.now()
+    day_start = now - DAY
+    half_life = settings.NEWS_RANKING_HALF_LIFE * 3600
+    rankings = {}
+    with transaction.atomic():
+        NewsActivity.objects.filter(hour__lt=window_start(now)).delete()
+        for news_id, hour, comments in NewsActivity.objects.values_list(
+            'news_id', 'hour', 'comments'
+        ).iterator():
+            ranking = rankings.setdefault(news_id, NewsRanking(
+                news_id=news_id
+            ))
+            ranking.comments_week += comments
+            if hour + HOUR > day_start:
+                ranking.comments_day += comments
+            age = max((now - hour).total_seconds(), 0)
+            ranking.score += comments * 0.5 ** (age / half_life)
+        # Строки, все комментарии которых удалены, остаются с нулём.
+        rankings = {
+            news_id: ranking for news_id, ranking in rankings.items()
+            if ranking.comments_week > 0
+        }
+        for news_id, last_comment in last_comments(rankings).items():
+            ranking = rankings[news_id]
+            ranking.last_comment = last_comment
+            ranking.comments_day = max(ranking.comments_day, 0)
+            ranking.score = max(ranking.score, 0)
+        NewsRanking.objects.all().delete()
+        NewsRanking.objects.bulk_create(rankings.values(), batch_size=500)
+    return len(rankings)
+
+
+def ranked_news(kind):
+    """Первые NEWS_RANKING_SIZE строк рейтинга kind."""
+    field, _ = RANKINGS[kind]
+    return NewsRanking.objects.select_related('news').defer(
+        'news__text', 'news__excerpt'
+    ).order_by(f'-{field}', '-news_id')[:settings.NEWS_RANKING_SIZE]
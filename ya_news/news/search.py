@@ -0,0 +1,116 @@
+import re
+from dataclasses import dataclass
+from importlib import import_module
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import News
+from .pagination import KeysetPage, sign_cursor, unsign_cursor
+
+SEARCH_CURSOR_SALT = 'news.search.cursor'
+
+# SQL индекса заморожен в миграции, которая его создала: команда
+# rebuild_search_index перестраивает индекс тем же выражением.
+REBUILD_SQL = import_module('news.migrations.0003_search_index').REBUILD_SQL
+
+SEARCH_SQL = """
+    SELECT rowid, news_id, rank,
+           snippet(news_search, -1, char(2), char(3), '…', 16)
+    FROM news_search
+    WHERE news_search MATCH %s {after}
+    ORDER BY rank, rowid
+    LIMIT %s
+"""
+AFTER_SQL = 'AND (rank > %s OR (rank = %s AND rowid > %s))'
+
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile('[а-я]')
+# Окончания русских слов, от длинных к коротким. Стемминг грубый:
+# основа ищется как префикс, поэтому лишнее отсечение лишь расширяет
+# выдачу. Английские слова стеммит токенизатор porter.
+RUSSIAN_ENDINGS = sorted((
+    'иями', 'ями', 'ами', 'ией', 'иям', 'ием', 'иях', 'ого', 'его', 'ому',
+    'ему', 'ыми', 'ими', 'ешь', 'ете', 'ишь', 'ите', 'ала', 'ила', 'ыла',
+    'ать', 'ять', 'еть', 'ить', 'уть', 'ость', 'ости', 'ах', 'ях', 'ам',
+    'ям', 'ом', 'ем', 'ев', 'ов', 'ей', 'ой', 'ий', 'ый', 'ая', 'яя', 'ое',
+    'ее', 'ие', 'ые', 'ую', 'юю', 'их', 'ых', 'ию', 'ью', 'ия', 'ья',
+    'ье', 'ии', 'ал', 'ил', 'ыл', 'ут', 'ют', 'ат', 'ят', 'ет', 'ит',
+    'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+), key=len, reverse=True)
+MIN_STEM_LENGTH = 3
+
+
+def stem(word):
+    """Отсекает у русского слова самое длинное подходящее окончание."""
+    for ending in RUSSIAN_ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[:-len(ending)]
+    return word
+
+
+def build_match_query(query):
+    """Запрос FTS5 из пользовательской строки.
+
+    Каждое слово берётся в кавычки, поэтому синтаксис FTS5 в запросе
+    пользователя не интерпретируется. Русские слова ищутся по основе
+    как префиксу: «новостями» находит «новости» и «новостей».
+    """
+    terms = []
+    for word in WORD_RE.findall(query.lower().replace('ё', 'е')):
+        if CYRILLIC_RE.search(word):
+            terms.append(f'"{stem(word)}"*')
+        else:
+            terms.append(f'"{word}"')
+    return ' '.join(terms)
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet).replace('\x02', '<mark>').replace('\x03', '</mark>')
+    )
+
+
+@dataclass
+class SearchResult:
+    news: News
+    is_comment: bool
+    snippet: str
+
+
+def search(query, cursor=None, per_page=20):
+    """Страница результатов, упорядоченных по релевантности (bm25).
+
+    Пагинация по ключу (rank, rowid), без OFFSET.
+    """
+    match = build_match_query(query)
+    if not match:
+        return KeysetPage([], None)
+    params = [match]
+    after = ''
+    if cursor:
+        rank, rowid = unsign_cursor(cursor, SEARCH_CURSOR_SALT)
+        after = AFTER_SQL
+        params += [float(rank), float(rank), int(rowid)]
+    params.append(per_page + 1)
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(SEARCH_SQL.format(after=after), params)
+        rows = db_cursor.fetchall()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        rowid, news_id, rank, snippet = rows[-1]
+        next_cursor = sign_cursor((rank, rowid), SEARCH_CURSOR_SALT)
+    news = News.objects.only('title').in_bulk({row[1] for row in rows})
+    return KeysetPage(
+        [
+            SearchResult(news[news_id], rowid % 2 == 1, highlight(snippet))
+            for rowid, news_id, rank, snippet in rows
+            if news_id in news
+        ],
+        next_cursor,
+    )
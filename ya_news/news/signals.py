@@ -0,0 +1,76 @@
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_generation
+from .models import Comment, News
+from .rankings import change_activity, comment_activity
+
+
+def change_comment_count(news_id, delta):
+    """Атомарно меняет счётчик комментариев новости на delta."""
+    News.objects.filter(pk=news_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+def change_counters(field, deltas, chunk_size=500):
+    """Прибавляет к счётчику field многих новостей: {news_id: delta}.
+
+    Одна инструкция UPDATE с CASE на chunk_size новостей.
+    """
+    deltas = [(pk, delta) for pk, delta in deltas.items() if delta]
+    for start in range(0, len(deltas), chunk_size):
+        chunk = deltas[start:start + chunk_size]
+        News.objects.filter(pk__in=[pk for pk, _ in chunk]).update(**{
+            field: F(field) + Case(
+                *(When(pk=pk, then=Value(delta)) for pk, delta in chunk),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        })
+
+
+def change_comment_counts(deltas, chunk_size=500):
+    """Меняет счётчики комментариев многих новостей: {news_id: delta}.
+
+    Для вставок в обход сигналов (bulk_create).
+    """
+    change_counters('comment_count', deltas, chunk_size)
+
+
+@receiver(pre_save, sender=News)
+@receiver(pre_save, sender=Comment)
+def fill_precomputed_text(sender, instance, **kwargs):
+    """Пересчитывает excerpt и text_html перед записью.
+
+    Сигнал, а не save(): loaddata сохраняет в обход save(), но pre_save
+    отправляет и для raw-записи.
+    """
+    if sender is News:
+        instance.update_excerpt()
+    else:
+        instance.update_text_html()
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        change_comment_count(instance.news_id, 1)
+        change_activity(comment_activity([instance]))
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    # Срабатывает и для удаления через QuerySet.delete() и в админке:
+    # при наличии подписчиков Django удаляет объекты поштучно с сигналами.
+    change_comment_count(instance.news_id, -1)
+    change_activity(comment_activity([instance], sign=-1))
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def news_changed(sender, **kwargs):
+    bump_generation()
@@ -0,0 +1,139 @@
+"""Карта сайта: индекс и дочерние карты по месяцам News.date.
+
+Сводка по месяцам для индекса считается по всей таблице, поэтому
+кэшируется по поколению данных новостей, как списки новостей.
+Дочерняя карта собирается проходом по новостям месяца пачками
+NEWS_SITEMAP_CHUNK_SIZE и кэшируется вместе с версией: числом новостей
+месяца и временем изменения самой свежей из них. Пока версия та же,
+карта не пересобирается.
+"""
+from datetime import date
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.timezone import localdate
+from django.views.decorators.http import condition, require_safe
+
+from shared.etags import make_etag
+from .cache import cached_fragment, cached_version
+from .models import News
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+
+
+def month_range(year, month):
+    try:
+        start = date(int(year), int(month), 1)
+    except ValueError:
+        raise Http404('Нет такого месяца.')
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, end
+
+
+def version_of(request, *values):
+    """Версия карты; адрес сайта входит в неё: он есть в <loc>."""
+    return make_etag(request.build_absolute_uri('/'), *values)
+
+
+def count_months():
+    """Число новостей и последнее изменение по месяцам.
+
+    Группировка идёт по дате вдоль индекса (date, id), месяцы
+    складываются уже здесь: группировка по месяцу потребовала бы
+    сортировки во временном B-дереве.
+    """
+    months = {}
+    for day, count, updated in News.objects.order_by('date').values(
+        'date'
+    ).annotate(
+        count=Count('id'), updated=Max('updated')
+    ).values_list('date', 'count', 'updated'):
+        total, latest = months.get((day.year, day.month), (0, updated))
+        months[day.year, day.month] = (total + count, max(latest, updated))
+    return months
+
+
+def monthly_stats(request):
+    """{(год, месяц): (новостей, последнее изменение)} из кэша
+    текущего поколения.
+    """
+    if not hasattr(request, '_sitemap_months'):
+        request._sitemap_months = cached_fragment(
+            'sitemap:months', count_months
+        )
+    return request._sitemap_months
+
+
+def index_etag(request):
+    return version_of(request, *sorted(monthly_stats(request).items()))
+
+
+def month_etag(request, year, month):
+    """Версия карты месяца; None, если новостей в месяце нет."""
+    if not hasattr(request, '_sitemap_version'):
+        start, end = month_range(year, month)
+        stats = News.objects.filter(date__gte=start, date__lt=end).aggregate(
+            count=Count('id'), updated=Max('updated')
+        )
+        request._sitemap_version = None
+        if stats['count']:
+            request._sitemap_version = version_of(
+                request, stats['count'], stats['updated']
+            )
+    return request._sitemap_version
+
+
+@require_safe
+@condition(etag_func=index_etag)
+def sitemap_index(request):
+    lines = [XML_HEADER, f'<sitemapindex xmlns="{SITEMAP_NS}">\n']
+    months = sorted(monthly_stats(request).items())
+    for (year, month), (_, updated) in months:
+        loc = request.build_absolute_uri(reverse(
+            'news:sitemap_month',
+            kwargs={'year': f'{year:04d}', 'month': f'{month:02d}'},
+        ))
+        lastmod = localdate(updated).isoformat()
+        lines.append(
+            f'<sitemap><loc>{escape(loc)}</loc>'
+            f'<lastmod>{lastmod}</lastmod></sitemap>\n'
+        )
+    lines.append('</sitemapindex>\n')
+    return HttpResponse(''.join(lines), content_type=CONTENT_TYPE)
+
+
+def month_lines(request, start, end):
+    yield XML_HEADER
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    rows = News.objects.filter(date__gte=start, date__lt=end).order_by(
+        'date', 'pk'
+    ).values_list('pk', 'updated').iterator(
+        chunk_size=settings.NEWS_SITEMAP_CHUNK_SIZE
+    )
+    for pk, updated in rows:
+        loc = request.build_absolute_uri(reverse('news:detail', args=(pk,)))
+        lastmod = localdate(updated).isoformat()
+        yield (
+            f'<url><loc>{escape(loc)}</loc>'
+            f'<lastmod>{lastmod}</lastmod></url>\n'
+        )
+    yield '</urlset>\n'
+
+
+@require_safe
+@condition(etag_func=month_etag)
+def sitemap_month(request, year, month):
+    version = month_etag(request, year, month)
+    if version is None:
+        raise Http404('В этом месяце новостей нет.')
+    start, end = month_range(year, month)
+    content = cached_version(
+        f'sitemap:{year}-{month}', version,
+        lambda: ''.join(month_lines(request, start, end)),
+    )
+    return HttpResponse(content, content_type=CONTENT_TYPE)
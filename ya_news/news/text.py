@@ -0,0 +1,21 @@
+"""Предвычисляемые представления текста новостей и комментариев.
+
+Функции повторяют фильтры шаблонов truncatewords и linebreaksbr, чтобы
+результат сохранялся при записи, а не считался при каждом рендеринге.
+Используются моделями и миграцией заполнения, поэтому не зависят от
+моделей.
+"""
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 15
+
+
+def make_excerpt(text):
+    """Начало новости для списков, как text|truncatewords:15."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def render_text_html(text):
+    """Экранированный текст с <br> на месте переводов строк."""
+    return str(linebreaksbr(text))
@@ -1,16 +1,44 @@
-from django.urls import path
+from django.urls import path, re_path
 
-from news import views
+from news import api, feeds, sitemaps, views
 
 app_name = 'news'
 
 urlpatterns = [
     path('', views.NewsList.as_view(), name='home'),
+    path('archive/', views.NewsArchive.as_view(), name='archive'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path(
+        'rankings/<slug:kind>/',
+        views.NewsRankingList.as_view(),
+        name='rankings'
+    ),
     path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsComments.as_view(),
+        name='comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
         name='delete'
     ),
     path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
+    path('api/news/', api.news_list, name='api_news_list'),
+    path('api/news/<int:pk>/', api.news_detail, name='api_news_detail'),
+    path(
+        'api/news/<int:pk>/comments/',
+        api.news_comments,
+        name='api_comments'
+    ),
+    path('api/export/<str:kind>.ndjson', api.export, name='api_export'),
+    path('feeds/rss/', feeds.rss, name='feed_rss'),
+    path('feeds/atom/', feeds.atom, name='feed_atom'),
+    path('sitemap.xml', sitemaps.sitemap_index, name='sitemap'),
+    re_path(
+        r'^sitemap-(?P<year>\d{4})-(?P<month>\d{2})\.xml$',
+        sitemaps.sitemap_month,
+        name='sitemap_month'
+    ),
 ]
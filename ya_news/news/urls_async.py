@@ -0,0 +1,12 @@
+"""Маршруты news для ASGI: чтение главной и новости асинхронное."""
+from django.urls import path
+
+from news import async_views
+from news.urls import app_name, urlpatterns as sync_urlpatterns  # noqa: F401
+
+# Асинхронные маршруты стоят первыми и перекрывают синхронные
+# с теми же путями; остальные маршруты приложения не меняются.
+urlpatterns = [
+    path('', async_views.news_list, name='home'),
+    path('news/<int:pk>/', async_views.news_detail, name='detail'),
+] + sync_urlpatterns
@@ -1,11 +1,33 @@
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import F
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
+from . import ingest, views_count
+from .cache import cached_fragment
+from .conditional import news_etag
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import KeysetPaginator
+from .rankings import RANKINGS, ranked_news
+from .search import search
+
+
+def render_home_news_list(object_list):
+    """Список новостей главной из кэша текущего поколения новостей."""
+    return cached_fragment(
+        'home',
+        lambda: render_to_string(
+            'includes/news_list.html', {'object_list': object_list}
+        ),
+    )
 
 
 class NewsList(generic.ListView):
@@ -18,10 +40,96 @@ class NewsList(generic.ListView):
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Число комментариев берётся из денормализованного поля
+        comment_count, сами комментарии не загружаются. Полный текст
+        не нужен: выводится готовый excerpt.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        return self.model.objects.defer('text')[
+            :settings.NEWS_COUNT_ON_HOME_PAGE
+        ]
+
+    def get_context_data(self, **kwargs):
+        """Queryset ленивый, поэтому при попадании в кэш запросов нет."""
+        context = super().get_context_data(**kwargs)
+        context['news_list'] = render_home_news_list(context['object_list'])
+        return context
+
+
+class NewsArchive(generic.TemplateView):
+    """Архив новостей: постраничный вывод по ключу (date, pk)."""
+    template_name = 'news/archive.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = KeysetPaginator(
+            News.objects.defer('text', 'excerpt'),
+            keys=('-date', '-pk'),
+            per_page=settings.NEWS_COUNT_ON_ARCHIVE_PAGE,
+        )
+        page = paginator.get_page(self.request.GET.get('cursor'))
+        context['page'] = page
+        context['object_list'] = page.object_list
+        return context
+
+
+class NewsSearch(generic.TemplateView):
+    """Полнотекстовый поиск по новостям и комментариям."""
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        context['query'] = query
+        context['page'] = search(
+            query,
+            self.request.GET.get('cursor'),
+            settings.NEWS_COUNT_ON_SEARCH_PAGE,
+        )
+        return context
+
+
+class NewsRankingList(generic.ListView):
+    """Рейтинг новостей из таблицы NewsRanking."""
+    template_name = 'news/rankings.html'
+
+    def get_queryset(self):
+        if self.kwargs['kind'] not in RANKINGS:
+            raise Http404('Нет такого рейтинга.')
+        return ranked_news(self.kwargs['kind'])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['kind'] = self.kwargs['kind']
+        context['rankings'] = [
+            (kind, title) for kind, (_, title) in RANKINGS.items()
+        ]
+        context['title'] = RANKINGS[self.kwargs['kind']][1]
+        return context
+
+
+def get_comments_page(news_pk, cursor=None):
+    """Страница комментариев новости по ключу (created, pk).
+
+    Загружаются только поля, которые выводятся в шаблоне, имя автора
+    подтягивается join-ом без создания объектов User.
+    """
+    comments = Comment.objects.filter(news_id=news_pk).only(
+        'pk', 'author', 'created', 'text_html'
+    ).annotate(author_username=F('author__username'))
+    paginator = KeysetPaginator(
+        comments,
+        keys=('created', 'pk'),
+        per_page=settings.COMMENTS_COUNT_ON_DETAIL_PAGE,
+    )
+    return paginator.get_page(cursor)
+
+
+def add_pending_comments(request, news_pk, comments):
+    """Дописывает на последнюю страницу комментарии автора из очереди."""
+    if not comments.has_next:
+        pending = ingest.pending_comments(request, news_pk)
+        if pending:
+            comments.object_list = list(comments.object_list) + pending
 
 
 class NewsDetail(generic.DetailView):
@@ -29,19 +137,35 @@ class NewsDetail(generic.DetailView):
     template_name = 'news/detail.html'
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
+        return get_object_or_404(self.model, pk=self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['comments'] = get_comments_page(self.object.pk)
+        add_pending_comments(
+            self.request, self.object.pk, context['comments']
+        )
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
         return context
 
 
+class NewsComments(generic.TemplateView):
+    """Фрагмент со следующей страницей комментариев новости."""
+    template_name = 'includes/comments.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['news_pk'] = self.kwargs['pk']
+        context['comments'] = get_comments_page(
+            self.kwargs['pk'], self.request.GET.get('cursor')
+        )
+        add_pending_comments(
+            self.request, self.kwargs['pk'], context['comments']
+        )
+        return context
+
+
 class NewsComment(
         LoginRequiredMixin,
         generic.detail.SingleObjectMixin,
@@ -59,20 +183,32 @@ class NewsComment(
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
-        comment.save()
+        if ingest.is_enabled():
+            comment.created = timezone.now()
+            ingest.remember_pending(self.request, ingest.enqueue(comment))
+        else:
+            comment.save()
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
 
-    def get(self, request, *args, **kwargs):
+    @method_decorator(condition(etag_func=news_etag))
+    def show(self, request, *args, **kwargs):
         view = NewsDetail.as_view()
         return view(request, *args, **kwargs)
 
+    def get(self, request, *args, **kwargs):
+        """Ответ 304 тоже считается просмотром."""
+        response = self.show(request, *args, **kwargs)
+        views_count.count_view(request, kwargs['pk'], response)
+        return response
+
     def post(self, request, *args, **kwargs):
         view = NewsComment.as_view()
         return view(request, *args, **kwargs)
@@ -83,9 +219,8 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
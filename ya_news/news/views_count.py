@@ -0,0 +1,98 @@
+"""Буферизованный счётчик просмотров новостей.
+
+Просмотр страницы новости не пишет в БД: приращения копятся в памяти
+процесса по pk новости и записываются одним UPDATE с CASE, когда
+накопилось NEWS_VIEWS_FLUSH_HITS просмотров или с прошлой записи прошло
+NEWS_VIEWS_FLUSH_INTERVAL секунд. Остаток записывается при штатном
+завершении процесса (atexit). Процессы прибавляют свои приращения
+к значению в БД, поэтому не затирают друг друга.
+
+Запись идёт через QuerySet.update() без сигналов и не сбрасывает кэш
+новостей. Просмотром считается GET с ответом 200 или 304.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from http import HTTPStatus
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from .signals import change_counters
+
+logger = logging.getLogger(__name__)
+
+COUNTED_STATUSES = (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED)
+
+
+class ViewCounter:
+    """Накопитель просмотров {news_id: число} одного процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._hits = 0
+        self._flushed_at = time.monotonic()
+
+    def hit(self, news_id):
+        """Учитывает просмотр; True, если пора записать накопленное."""
+        with self._lock:
+            self._pending[news_id] += 1
+            self._hits += 1
+            return (
+                self._hits >= settings.NEWS_VIEWS_FLUSH_HITS
+                or time.monotonic() - self._flushed_at
+                >= settings.NEWS_VIEWS_FLUSH_INTERVAL
+            )
+
+    def take(self):
+        """Забирает накопленные приращения, обнуляя накопитель."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._hits = 0
+            self._flushed_at = time.monotonic()
+        return pending
+
+    def flush(self):
+        """Записывает накопленное в БД; возвращает число просмотров.
+
+        Если БД недоступна, приращения возвращаются в накопитель
+        и будут записаны следующим сбросом.
+        """
+        pending = self.take()
+        if not pending:
+            return 0
+        try:
+            with transaction.atomic():
+                change_counters('views_count', pending)
+        except DatabaseError:
+            logger.warning(
+                'Не удалось записать %d просмотров', sum(pending.values()),
+                exc_info=True,
+            )
+            with self._lock:
+                self._pending.update(pending)
+                self._hits += sum(pending.values())
+            return 0
+        return sum(pending.values())
+
+
+counter = ViewCounter()
+atexit.register(counter.flush)
+
+
+def hit(request, news_id, response):
+    """Учитывает ответ страницы новости; True, если пора сбросить."""
+    return (
+        settings.NEWS_VIEWS_COUNT
+        and request.method == 'GET'
+        and response.status_code in COUNTED_STATUSES
+        and counter.hit(news_id)
+    )
+
+
+def count_view(request, news_id, response):
+    if hit(request, news_id, response):
+        counter.flush()
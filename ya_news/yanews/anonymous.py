@@ -0,0 +1,84 @@
+"""Быстрый путь для анонимных посетителей публичных страниц.
+
+GET и HEAD без cookie сессии к маршрутам ANONYMOUS_FAST_PATH_VIEWS
+вызывают представление напрямую, минуя сессии, аутентификацию, CSRF
+и сообщения: request.user — AnonymousUser, request.session нет.
+Ответ помечается Vary: Cookie и, если не ставит cookie, кэшируется
+публично на ANONYMOUS_CACHE_MAX_AGE секунд.
+
+Middleware ставится сразу после SecurityMiddleware и работает под ASGI.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+from django.urls import Resolver404, get_resolver, set_urlconf
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def resolve_fast_path(request):
+    """Маршрут запроса, если его можно обслужить без сессии."""
+    if (
+        request.method not in SAFE_METHODS
+        or settings.SESSION_COOKIE_NAME in request.COOKIES
+    ):
+        return None
+    urlconf = getattr(request, 'urlconf', None)
+    if urlconf is not None:
+        set_urlconf(urlconf)
+    try:
+        match = get_resolver(urlconf).resolve(request.path_info)
+    except Resolver404:
+        return None
+    if match.view_name not in settings.ANONYMOUS_FAST_PATH_VIEWS:
+        return None
+    request.resolver_match = match
+    request.user = AnonymousUser()
+    return match
+
+
+class AnonymousFastPathMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.x_frame_options = XFrameOptionsMiddleware(get_response)
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        match = resolve_fast_path(request)
+        if match is None:
+            return self.get_response(request)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response = response.render()
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        match = resolve_fast_path(request)
+        if match is None:
+            return await self.get_response(request)
+        view = match.func
+        if not asyncio.iscoroutinefunction(view):
+            view = sync_to_async(view)
+        response = await view(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response = await sync_to_async(response.render)()
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        patch_vary_headers(response, ('Cookie',))
+        if not response.cookies and response.status_code in (200, 304):
+            patch_cache_control(
+                response, public=True,
+                max_age=settings.ANONYMOUS_CACHE_MAX_AGE,
+            )
+        return self.x_frame_options.process_response(request, response)
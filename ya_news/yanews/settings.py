@@ -1,9 +1,14 @@
+import sys
 from pathlib import Path
 
 from django.urls import reverse_lazy
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Общий для проектов пакет shared лежит в корне репозитория.
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.append(str(BASE_DIR.parent))
+
 SECRET_KEY = 'django-insecure-7)dgs++2!#==aye4rd=5)c)bw0eokiyqx0hts6#t80!$c&$s+('
 
 DEBUG = True
@@ -17,11 +22,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'shared.apps.SharedConfig',
     'news.apps.NewsConfig',
 ]
 
 MIDDLEWARE = [
+    'shared.querybudget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'yanews.anonymous.AnonymousFastPathMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -50,11 +58,21 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yanews.wsgi.application'
 
+ASGI_URLCONF = 'yanews.urls_async'
+
 
+# PRAGMA соединений задаются в OPTIONS['pragmas'], см. shared/sqlite.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'shared.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -74,9 +92,103 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# Сторонние файлы в STATICFILES_DIRS: путь -> (источник, хэш SRI).
+# Загружаются командой vendor_static.
+VENDORED_STATIC = {
+    'vendor/bootstrap-5.0.1/bootstrap.min.css': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.0.1/dist/css/'
+        'bootstrap.min.css',
+        'sha384-+0n0xVW2eSR5OomGNYDnhzAbDsOXxcvSN1TPprVMTNDbiYZCxYbOOl7+AMvyTG2x',
+    ),
+}
+
+# Раздавать STATIC_ROOT из процесса приложения, см. shared/staticfiles.py.
+SERVE_STATIC = False
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+NEWS_COUNT_ON_ARCHIVE_PAGE = 20
+
+COMMENTS_COUNT_ON_DETAIL_PAGE = 50
+
+NEWS_COUNT_ON_SEARCH_PAGE = 20
+
+# JSON API: размер страницы ленты и комментариев, пачка строк выгрузки.
+NEWS_API_PAGE_SIZE = 50
+NEWS_API_EXPORT_CHUNK_SIZE = 2000
+
+# Ленты RSS/Atom и карта сайта, см. news/feeds.py и news/sitemaps.py.
+NEWS_FEED_SIZE = 50
+NEWS_SITEMAP_CHUNK_SIZE = 2000
+
+# Счётчик просмотров новостей, см. news/views_count.py: запись в БД раз
+# в NEWS_VIEWS_FLUSH_HITS просмотров или NEWS_VIEWS_FLUSH_INTERVAL секунд.
+NEWS_VIEWS_COUNT = True
+NEWS_VIEWS_FLUSH_HITS = 1000
+NEWS_VIEWS_FLUSH_INTERVAL = 10
+
+# Рейтинги новостей, см. news/rankings.py: длина списка и период
+# полураспада веса комментария для горячих новостей, в часах.
+NEWS_RANKING_SIZE = 20
+NEWS_RANKING_HALF_LIFE = 24
+
+# Размер пула потоков для обращений к БД из асинхронных представлений.
+NEWS_ASYNC_DB_WORKERS = 8
+
+# Кэш фрагментов новостей. Для нескольких процессов нужен общий бэкенд,
+# например django.core.cache.backends.filebased.FileBasedCache.
+NEWS_CACHE_ALIAS = 'default'
+NEWS_CACHE_TIMEOUT = 60 * 60
+NEWS_CACHE_STALE_WHILE_REVALIDATE = False
+NEWS_CACHE_LOCK_TIMEOUT = 30
+
+# Словарь запрещённых слов: файл по слову на строку. Если не задан,
+# используется news.forms.BAD_WORDS.
+BAD_WORDS_FILE = None
+BAD_WORDS_RELOAD_INTERVAL = 5
+BAD_WORDS_WHOLE_WORDS = False
+
+# Бюджет SQL-запросов на HTTP-запрос, см. shared/querybudget.py.
+QUERY_BUDGET = 10
+QUERY_BUDGET_PER_VIEW = {}
+QUERY_BUDGET_REPEATED_THRESHOLD = 3
+QUERY_BUDGET_RAISE = False
+QUERY_BUDGET_STATS_FILE = None
+
+# Отложенная запись комментариев, см. news/ingest.py. Если файл очереди
+# задан, комментарии дописываются в него, а в БД их переносит команда
+# drain_comment_queue. Файл локальный: при нескольких серверах команда
+# запускается на каждом. Неразобранные комментарии автора хранятся
+# в его сессии.
+COMMENT_QUEUE_FILE = None
+COMMENT_QUEUE_BATCH_SIZE = 500
+COMMENT_QUEUE_PENDING_LIMIT = 20
+
+# Анонимные GET без cookie сессии к этим маршрутам обслуживаются без
+# сессий, аутентификации и CSRF, см. yanews/anonymous.py.
+ANONYMOUS_FAST_PATH_VIEWS = (
+    'news:home',
+    'news:rankings',
+    'news:detail',
+    'news:api_news_list',
+    'news:api_news_detail',
+    'news:api_comments',
+    'news:api_export',
+    'news:feed_rss',
+    'news:feed_atom',
+    'news:sitemap',
+    'news:sitemap_month',
+)
+ANONYMOUS_CACHE_MAX_AGE = 60
+
+# Прогрев шаблонов и URL при старте процесса, см. shared/warmup.py.
+WARMUP_ON_START = False
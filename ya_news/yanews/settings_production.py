@@ -0,0 +1,61 @@
+"""Настройки для боевого запуска.
+
+DJANGO_SETTINGS_MODULE=yanews.settings_production. Шаблоны компилируются
+один раз и хранятся кэширующим загрузчиком, процесс прогревается при
+старте (DJANGO_WARMUP=0 отключает прогрев). Чтение идёт через отдельное
+соединение только для чтения (DJANGO_REPLICA_DB задаёт другой файл,
+например копию, которую поддерживает репликация), запись — в основное.
+Сессии читаются из кэша и только при промахе из БД.
+Статика собирается collectstatic с хэшами в именах и сжатыми копиями
+и раздаётся самим приложением (DJANGO_SERVE_STATIC=0 отключает).
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, TEMPLATES
+
+DEBUG = False
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+DATABASES = {
+    **DATABASES,
+    'replica': {
+        **DATABASES['default'],
+        'NAME': os.environ.get(
+            'DJANGO_REPLICA_DB', DATABASES['default']['NAME']
+        ),
+        'OPTIONS': {
+            **DATABASES['default'].get('OPTIONS', {}),
+            'read_only': True,
+        },
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['shared.routers.ReadReplicaRouter']
+
+# 'django.contrib.sessions.backends.signed_cookies' совсем не обращается
+# к БД, но хранит очередь неразобранных комментариев в cookie.
+SESSION_ENGINE = os.environ.get(
+    'DJANGO_SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db'
+)
+
+STATICFILES_STORAGE = (
+    'shared.staticfiles.CompressedManifestStaticFilesStorage'
+)
+SERVE_STATIC = os.environ.get('DJANGO_SERVE_STATIC', '1') != '0'
+
+WARMUP_ON_START = os.environ.get('DJANGO_WARMUP', '1') != '0'
@@ -4,8 +4,9 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path
 from django.views.generic import CreateView
 
-urlpatterns = [
-    path('', include('news.urls')),
+# Маршруты сайта вне приложения news: их же подключает
+# yanews/urls_async.py.
+site_urlpatterns = [
     path('admin/', admin.site.urls),
 ]
 
@@ -33,4 +34,8 @@ auth_urls = ([
     ),
 ], 'users')
 
-urlpatterns += [path('auth/', include(auth_urls))]
+site_urlpatterns += [path('auth/', include(auth_urls))]
+
+urlpatterns = [
+    path('', include('news.urls')),
+] + site_urlpatterns
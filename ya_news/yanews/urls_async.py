@@ -0,0 +1,8 @@
+"""Корневой urlconf для ASGI, см. yanews/asgi.py."""
+from django.urls import include, path
+
+from .urls import site_urlpatterns
+
+urlpatterns = [
+    path('', include('news.urls_async')),
+] + site_urlpatterns
@@ -0,0 +1,44 @@
+from django.db.models import Count, Max
+
+from shared.etags import make_etag
+from .models import Note
+
+
+def notes_list_etag(request):
+    """Штамп ETag списка заметок: изменения заметок автора.
+
+    Последнее изменение и число заметок автора читаются одним
+    агрегатным запросом: число ловит удаление заметок, время —
+    создание и правку. Last-Modified не отдаётся: после удаления
+    самой новой заметки последнее изменение уходит назад.
+    """
+    if not hasattr(request, '_notes_list_etag'):
+        stamp = Note.objects.filter(author=request.user).aggregate(
+            last_updated=Max('updated'), count=Count('pk')
+        )
+        request._notes_list_etag = make_etag(
+            request.user.pk, stamp['count'], stamp['last_updated']
+        )
+    return request._notes_list_etag
+
+
+def note_validators(request, slug):
+    """Валидаторы отдельной заметки автора; None, если её нет."""
+    if not hasattr(request, '_notes_validators'):
+        row = Note.objects.filter(
+            author=request.user, slug=slug
+        ).values_list('pk', 'updated').first()
+        request._notes_validators = row and (
+            make_etag(request.user.pk, *row), row[1]
+        )
+    return request._notes_validators
+
+
+def note_etag(request, slug):
+    validators = note_validators(request, slug)
+    return validators and validators[0]
+
+
+def note_last_modified(request, slug):
+    validators = note_validators(request, slug)
+    return validators and validators[1]
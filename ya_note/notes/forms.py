@@ -1,7 +1,4 @@
-from pytils.translit import slugify
-
 from django import forms
-from django.core.exceptions import ValidationError
 
 from .models import Note
 
@@ -9,21 +6,27 @@ WARNING = ' - такой slug уже существует, придумайте
 
 
 class NoteForm(forms.ModelForm):
-    """Форма для создания или обновления заметки."""
+    """Форма для создания или обновления заметки.
+
+    Уникальность slug не проверяется запросом: занятый slug обнаружит
+    вставка, а пустой выделит Note.save.
+    """
 
     class Meta:
         model = Note
         fields = ('title', 'text', 'slug')
 
-    def clean_slug(self):
-        """Обрабатывает случай, если slug не уникален."""
-        cleaned_data = super().clean()
-        slug = cleaned_data.get('slug')
-        if not slug:
-            title = cleaned_data.get('title')
-            slug = slugify(title)[:100]
-        if Note.objects.filter(
-                slug=slug
-        ).exclude(id=self.instance.pk).exists():
-            raise ValidationError(slug + WARNING)
-        return slug
+    def validate_unique(self):
+        """Проверяет уникальность полей формы, кроме slug.
+
+        Поля вне формы исключаются явно: ошибку по ним нельзя показать
+        в форме.
+        """
+        exclude = [
+            field.name for field in Note._meta.fields
+            if field.name not in self.fields or field.name == 'slug'
+        ]
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except forms.ValidationError as error:
+            self.add_error(None, error)
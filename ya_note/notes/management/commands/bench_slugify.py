@@ -0,0 +1,57 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from pytils.translit import slugify as pytils_slugify
+
+from notes.translit import slugify
+from shared.synthetic import sentence
+from .generate_notes import WORDS
+
+LONG_TITLE = (
+    'Съешь же ещё этих мягких французских булок, да выпей чаю — '
+    '«Щука» и Ёжик'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Скорость slugify: pytils против notes.translit без кэша и с ним, '
+        'на одном длинном заголовке и на пачке заголовков.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20000)
+        parser.add_argument('--titles', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def timed(self, func, values):
+        started = time.perf_counter()
+        for value in values:
+            func(value)
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        titles = [
+            sentence(rng, WORDS, rng.randint(2, 12))[:100]
+            for _ in range(options['titles'])
+        ]
+        cases = (
+            ('Длинный заголовок', [LONG_TITLE] * options['repeat']),
+            (f'{len(titles)} заголовков, различных {len(set(titles))}',
+             titles),
+        )
+        for name, values in cases:
+            slugify.cache_clear()
+            results = (
+                ('pytils', self.timed(pytils_slugify, values)),
+                ('таблица', self.timed(slugify.__wrapped__, values)),
+                ('таблица с кэшем', self.timed(slugify, values)),
+            )
+            base = results[0][1]
+            self.stdout.write(f'{name}: ' + '; '.join(
+                f'{label} {elapsed / len(values) * 1e6:.2f} мкс '
+                f'(x{base / elapsed:.1f})'
+                for label, elapsed in results
+            ))
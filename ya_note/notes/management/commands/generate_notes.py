@@ -0,0 +1,71 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from notes.models import Note
+from notes.slugs import bulk_create_with_free_slugs
+from shared.synthetic import sentence, zipf_cum_weights
+
+User = get_user_model()
+
+WORDS = (
+    'купить', 'позвонить', 'прочитать', 'записать', 'проверить', 'отправить',
+    'молоко', 'хлеб', 'отчёт', 'письмо', 'книгу', 'врачу', 'маме', 'задачу',
+    'завтра', 'вечером', 'срочно', 'потом', 'обязательно', 'до пятницы',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетических пользователей и заметки. Число заметок '
+        'на автора распределено по Zipf: немногие активные авторы '
+        'пишут большую часть заметок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--notes', type=int, default=10000)
+        parser.add_argument('--zipf', type=float, default=1.1)
+        parser.add_argument('--user-prefix', default='user')
+        parser.add_argument('--password', default='password')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        prefix = options['user_prefix']
+        # Хеш пароля считается один раз: он намеренно медленный.
+        password = make_password(options['password'])
+        with transaction.atomic():
+            User.objects.bulk_create(
+                (
+                    User(username=f'{prefix}{index}', password=password)
+                    for index in range(options['users'])
+                ),
+                batch_size,
+                ignore_conflicts=True,
+            )
+            user_ids = list(User.objects.filter(
+                username__startswith=prefix
+            ).values_list('pk', flat=True))
+            rng.shuffle(user_ids)
+            cum_weights = zipf_cum_weights(len(user_ids), options['zipf'])
+            notes = [
+                Note(
+                    title=sentence(rng, WORDS, rng.randint(2, 5))[:100],
+                    text=sentence(rng, WORDS, rng.randint(5, 30)),
+                    author_id=author_id,
+                )
+                for author_id in (rng.choices(
+                    user_ids, cum_weights=cum_weights, k=options['notes']
+                ) if user_ids else ())
+            ]
+            # Адреса из заголовков, совпадения получают суффиксы.
+            bulk_create_with_free_slugs(Note, notes, batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Пользователей: {len(user_ids)}, заметок: {len(notes)}'
+        ))
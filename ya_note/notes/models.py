@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.db import models
 
-from pytils.translit import slugify
+from .slugs import save_with_free_slug
 
 
 class Note(models.Model):
@@ -23,16 +23,25 @@ class Note(models.Model):
         help_text=('Укажите адрес для страницы заметки. Используйте только '
                    'латиницу, цифры, дефисы и знаки подчёркивания')
     )
+    # Отдельный индекс по author не нужен: его заменяет составной
+    # индекс (author, id) из Meta.
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Все представления выбирают заметки автора.
+        indexes = (models.Index(fields=('author', 'id')),)
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """Пустой slug выделяется из заголовка, см. notes/slugs.py."""
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_free_slug(self, super().save, *args, **kwargs)
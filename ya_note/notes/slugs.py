@@ -0,0 +1,121 @@
+"""Выделение свободного slug заметки без предварительной проверки.
+
+Заметка сразу сохраняется со slug из заголовка. Если он занят, вставка
+падает с IntegrityError в своей точке сохранения, и одним запросом по
+уникальному индексу читаются сам slug и занятые slug вида
+«slug-…»; выбирается первый свободный суффикс -2, -3… Одновременные
+вставки разрешаются той же ошибкой: проигравший берёт следующий
+суффикс.
+"""
+from itertools import count
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import Q
+
+from .translit import slugify
+
+# Место под суффикс '-<число>' в slug максимальной длины.
+SUFFIX_LENGTH = 11
+# Сколько раз пробовать вставку, если суффикс успели занять. Каждый
+# круг кто-то из одновременных писателей выигрывает, поэтому проигрышей
+# подряд меньше, чем писателей с тем же заголовком.
+ATTEMPTS = 20
+# Slug из заголовка без букв и цифр.
+DEFAULT_SLUG = 'note'
+
+
+def title_slug(title, max_length):
+    return slugify(title)[:max_length] or DEFAULT_SLUG
+
+
+def with_suffix(base, number, max_length):
+    suffix = f'-{number}'
+    return base[:max_length - len(suffix)] + suffix
+
+
+def taken_slugs(model, base, max_length, using=None):
+    """Занятые slug: сам base и slug, начинающиеся с base и дефиса.
+
+    Диапазон вместо LIKE 'base-%': LIKE в SQLite не регистрозависим
+    и не использует индекс. Длинную основу суффикс обрезает, поэтому
+    для неё диапазон берётся по началу, которое суффикс не затрагивает.
+    """
+    if len(base) + SUFFIX_LENGTH <= max_length:
+        prefix = base + '-'
+    else:
+        prefix = base[:max_length - SUFFIX_LENGTH]
+    return set(model._default_manager.using(using).filter(
+        Q(slug=base) | Q(slug__gte=prefix, slug__lt=prefix + '\U0010ffff')
+    ).values_list('slug', flat=True))
+
+
+def free_slug(base, taken, max_length):
+    if base not in taken:
+        return base
+    for number in count(2):
+        slug = with_suffix(base, number, max_length)
+        if slug not in taken:
+            return slug
+
+
+def save_with_free_slug(note, save, *args, **kwargs):
+    """Сохраняет заметку со slug из заголовка, при конфликте — с первым
+    свободным суффиксом.
+
+    save — метод сохранения, обычно super().save из Note.save.
+    """
+    max_length = note._meta.get_field('slug').max_length
+    base = title_slug(note.title, max_length)
+    note.slug = base
+    using = kwargs.get('using') or router.db_for_write(type(note))
+    for attempt in range(ATTEMPTS):
+        try:
+            with transaction.atomic(using=using):
+                return save(*args, **kwargs)
+        except IntegrityError:
+            taken = taken_slugs(type(note), base, max_length, using)
+            # Ошибка не из-за slug, или попытки кончились.
+            if note.slug not in taken or attempt == ATTEMPTS - 1:
+                raise
+            note.slug = free_slug(base, taken, max_length)
+
+
+def assign_free_slugs(model, notes, using=None):
+    """Раздаёт slug из заголовков заметкам для bulk_create.
+
+    Занятые основы находятся одним запросом на пачку, диапазон
+    суффиксов читается только для основ, которые уже заняты в БД или
+    в этой же пачке.
+    """
+    max_length = model._meta.get_field('slug').max_length
+    bases = [title_slug(note.title, max_length) for note in notes]
+    existing = set(model._default_manager.using(using).filter(
+        slug__in=set(bases)
+    ).values_list('slug', flat=True))
+    taken = set()
+    read = set()
+    for note, base in zip(notes, bases):
+        if (base in existing or base in taken) and base not in read:
+            taken |= taken_slugs(model, base, max_length, using)
+            read.add(base)
+        note.slug = free_slug(base, taken, max_length)
+        taken.add(note.slug)
+
+
+def bulk_create_with_free_slugs(model, notes, batch_size):
+    """bulk_create пачками со slug из заголовков.
+
+    Если slug из пачки успели занять, пачка получает slug заново.
+    """
+    using = router.db_for_write(model)
+    for start in range(0, len(notes), batch_size):
+        batch = notes[start:start + batch_size]
+        for attempt in range(ATTEMPTS):
+            assign_free_slugs(model, batch, using)
+            try:
+                with transaction.atomic(using=using):
+                    model._default_manager.using(using).bulk_create(batch)
+                break
+            except IntegrityError:
+                if attempt == ATTEMPTS - 1:
+                    raise
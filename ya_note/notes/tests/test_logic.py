@@ -1,10 +1,29 @@
 from http import HTTPStatus  # type: ignore
+from io import StringIO
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from threading import Barrier, Thread
 from pytils.translit import slugify  # type: ignore
 
+from django.conf import settings  # type: ignore
 from django.contrib.auth import get_user_model  # type: ignore
+from django.core.management import CommandError, call_command  # type: ignore
+from django.db import connection  # type: ignore
+from django.template import engines  # type: ignore
+from django.test import (  # type: ignore
+    SimpleTestCase, TransactionTestCase, override_settings
+)
+from django.test.utils import CaptureQueriesContext  # type: ignore
 
+from notes import translit
 from notes.models import Note
-from notes.forms import WARNING
+from notes.slugs import taken_slugs
+from notes.forms import WARNING, NoteForm
+from shared.sqlite.base import DEFAULT_PRAGMAS
+from shared.vendored import check_vendored_static, sri_hash
+from shared.warmup import warm_up
+from yanote import settings_production
 from .base_fixtures import NotesBaseTestCase
 
 User = get_user_model()
@@ -64,6 +83,15 @@ class TestLogic(NotesBaseTestCase):
             errors=self.slug + (WARNING)
         )
 
+    def test_form_does_not_query_taken_slug(self):
+        """Тест: Форма не проверяет занятость slug запросом, занятый
+        slug обнаруживает вставка
+        """
+        form = NoteForm(data={**self.form_data, 'slug': self.notes.slug})
+
+        with self.assertNumQueries(0):
+            self.assertTrue(form.is_valid())
+
     def test_slug_can_create_automaticly(self):
         """Тест: Если при создании заметки
         не заполнен slug, то он формируется
@@ -79,6 +107,43 @@ class TestLogic(NotesBaseTestCase):
 
         self.assertEqual(expected_slug, note_from_db.slug)
 
+    def test_slug_collision_gets_free_suffix(self):
+        """Тест: Заметка с занятым slug из заголовка получает первый
+        свободный суффикс; без конфликта вставка идёт без проверок,
+        с конфликтом добавляется один запрос занятых slug
+        """
+        self.form_data.pop('slug')
+        with CaptureQueriesContext(connection) as first:
+            Note.objects.create(author=self.author, **self.form_data)
+        Note.objects.create(author=self.author, **self.form_data)
+        with CaptureQueriesContext(connection) as third:
+            Note.objects.create(author=self.author, **self.form_data)
+        expected_slug = slugify(self.form_data['title'])
+
+        self.assertEqual(
+            set(Note.objects.filter(
+                title=self.form_data['title']
+            ).values_list('slug', flat=True)),
+            {expected_slug, f'{expected_slug}-2', f'{expected_slug}-3'}
+        )
+        for queries, selects in ((first, 0), (third, 1)):
+            self.assertEqual(selects, sum(
+                query['sql'].startswith('SELECT') for query in queries
+            ))
+
+    def test_taken_slugs_reads_only_suffixed_slugs(self):
+        """Тест: При конфликте читаются только сам slug и slug с
+        дефисом после него, а не все slug с тем же началом
+        """
+        for slug in ('note', 'note-2', 'notebook', 'notes', 'nota'):
+            Note.objects.create(
+                author=self.author, title='З', text='Т', slug=slug
+            )
+
+        self.assertEqual(
+            taken_slugs(Note, 'note', 100), {'note', 'note-2'}
+        )
+
     def test_author_can_delete_note(self):
         """Тест: Пользователь может  удалять свои заметки"""
         note_slug = self.notes.slug
@@ -134,3 +199,187 @@ class TestLogic(NotesBaseTestCase):
         self.assertEqual(self.notes.text, notes_from_db.text)
         self.assertEqual(self.notes.slug, notes_from_db.slug)
         self.assertEqual(self.notes.author, notes_from_db.author)
+
+    def test_generate_notes_command(self):
+        """Тест: generate_notes создаёт пользователей и заметки,
+        повторный запуск не конфликтует по slug
+        """
+        for _ in range(2):
+            call_command('generate_notes', users=5, notes=50,
+                         user_prefix='gen', seed=1, stdout=StringIO())
+
+        self.assertEqual(
+            User.objects.filter(username__startswith='gen').count(), 5
+        )
+        self.assertEqual(
+            Note.objects.filter(author__username__startswith='gen').count(),
+            100
+        )
+
+    def test_connection_uses_configured_pragmas(self):
+        """Тест: Соединение с БД получает PRAGMA бэкенда shared.sqlite"""
+        with connection.cursor() as cursor:
+            for pragma in ('cache_size', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {pragma}')
+                self.assertEqual(cursor.fetchone()[0], DEFAULT_PRAGMAS[pragma])
+
+
+class TestWarmUp(SimpleTestCase):
+    """Прогрев процесса для боевых настроек."""
+
+    @override_settings(TEMPLATES=settings_production.TEMPLATES)
+    def test_warm_up_compiles_templates_and_urls(self):
+        """Тест: Прогрев компилирует все шаблоны проекта в кэширующий
+        загрузчик и строит таблицы URL
+        """
+        templates_dir = settings.BASE_DIR / 'templates'
+        stats = warm_up()
+        loader, = engines['django'].engine.template_loaders
+
+        self.assertLessEqual(
+            {
+                path.relative_to(templates_dir).as_posix()
+                for path in templates_dir.rglob('*.html')
+            },
+            set(loader.get_template_cache),
+        )
+        self.assertGreaterEqual(stats['urls'], 7)
+
+
+class TestVendorStatic(SimpleTestCase):
+    """Проверка сторонней статики без обращения к сети."""
+
+    def test_vendor_static_check(self):
+        """Тест: vendor_static --check принимает файл с верным хэшем SRI
+        и отвергает изменённый
+        """
+        data = b'body { color: black; }'
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'vendor' / 'site.css'
+            path.parent.mkdir()
+            path.write_bytes(data)
+            with override_settings(
+                STATICFILES_DIRS=[directory],
+                VENDORED_STATIC={'vendor/site.css': (
+                    'https://example.invalid/site.css',
+                    sri_hash(data, 'sha384'),
+                )},
+            ):
+                call_command('vendor_static', '--check', stdout=StringIO())
+                path.write_bytes(data + b' ')
+                with self.assertRaises(CommandError):
+                    call_command(
+                        'vendor_static', '--check', stdout=StringIO()
+                    )
+
+    def test_vendored_stylesheet_url(self):
+        """Тест: ссылка ведёт на свою статику, если файл загружен, а
+        на источник из VENDORED_STATIC — только с DEBUG, пока его нет
+        """
+        template = engines['django'].from_string(
+            "{% load vendored %}{% vendored_stylesheet 'vendor/site.css' %}"
+        )
+        source = 'https://example.invalid/site.css'
+        local = f'href="{settings.STATIC_URL}vendor/site.css"'
+        with TemporaryDirectory() as directory, override_settings(
+            STATICFILES_DIRS=[directory],
+            VENDORED_STATIC={'vendor/site.css': (source, 'sha384-x')},
+        ):
+            self.assertIn(local, template.render())
+            with override_settings(DEBUG=True):
+                self.assertIn(f'href="{source}"', template.render())
+                path = Path(directory) / 'vendor' / 'site.css'
+                path.parent.mkdir()
+                path.write_bytes(b'')
+                self.assertIn(local, template.render())
+
+    def test_deploy_check_reports_missing_vendored_file(self):
+        """Тест: check --deploy сообщает о незагруженном файле и о
+        файле с неверным хэшем
+        """
+        data = b'body { color: black; }'
+        with TemporaryDirectory() as directory, override_settings(
+            STATICFILES_DIRS=[directory],
+            VENDORED_STATIC={'vendor/site.css': (
+                'https://example.invalid/site.css',
+                sri_hash(data, 'sha384'),
+            )},
+        ):
+            self.assertEqual(
+                [error.id for error in check_vendored_static(None)],
+                ['shared.E001'],
+            )
+            path = Path(directory) / 'vendor' / 'site.css'
+            path.parent.mkdir()
+            path.write_bytes(data + b' ')
+            self.assertEqual(len(check_vendored_static(None)), 1)
+            path.write_bytes(data)
+            self.assertEqual(check_vendored_static(None), [])
+
+
+class TestSlugConcurrency(TransactionTestCase):
+    """Одновременное создание заметок с одним заголовком"""
+
+    def test_concurrent_creates_get_distinct_slugs(self):
+        """Тест: Потоки, одновременно создающие заметки с одним
+        заголовком, получают разные slug без ошибок
+        """
+        author = User.objects.create(username='Автор')
+        threads_count = 8
+        barrier = Barrier(threads_count)
+        errors = []
+
+        def create():
+            try:
+                barrier.wait()
+                Note.objects.create(
+                    title='Одинаковый заголовок', text='Текст', author=author
+                )
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [Thread(target=create) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        base = slugify('Одинаковый заголовок')
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            set(Note.objects.values_list('slug', flat=True)),
+            {base} | {f'{base}-{number}' for number in range(2, 9)}
+        )
+
+
+class TestTranslit(SimpleTestCase):
+    """Совместимость notes.translit.slugify с pytils"""
+
+    # Символы, на которых slugify pytils ведёт себя по-разному:
+    # кириллица, разделители, кавычки и тире, '&', символы, которые
+    # lower() превращает в несколько или в латиницу.
+    CORPUS_ALPHABET = (
+        'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+        'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
+        'abcxyzABCXYZ0129 \t\n\u00a0\u2003-_.,!?\'"`#&'
+        '‘’«»“”–—‒−…№İ\u212a\u0301😀'
+    )
+
+    def test_slugify_matches_pytils(self):
+        """Тест: slugify совпадает с pytils на всех символах до U+3000
+        и на случайных строках
+        """
+        plain = translit.slugify.__wrapped__
+        for start in range(0, 0x3000, 64):
+            value = ''.join(map(chr, range(start, start + 64)))
+            self.assertEqual(plain(value), slugify(value), hex(start))
+        rng = Random(25)
+        for _ in range(2000):
+            value = ''.join(rng.choices(
+                self.CORPUS_ALPHABET, k=rng.randint(0, 80)
+            ))
+            if rng.random() < 0.2:
+                value = value.replace('&', '&amp;')
+            self.assertEqual(plain(value), slugify(value), repr(value))
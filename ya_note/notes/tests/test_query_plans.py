@@ -0,0 +1,59 @@
+import re
+
+from django.db import connection  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+
+from .base_fixtures import NotesBaseTestCase
+
+# Проход таблицы или индекса от начала: SCAN без индекса или
+# SCAN ... USING (COVERING) INDEX. Допустим только поиск (SEARCH).
+FULL_SCAN_RE = re.compile(
+    r'^SCAN \w+(?: USING (?:COVERING )?INDEX \w+)?$'
+)
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+def bad_plan_steps(queries):
+    """Шаги планов SELECT-запросов с полным сканом или сортировкой."""
+    steps = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            for *_, detail in cursor.fetchall():
+                if FULL_SCAN_RE.match(detail) or TEMP_SORT in detail:
+                    steps.append(f'{detail}: {sql}')
+    return steps
+
+
+class TestQueryPlans(NotesBaseTestCase):
+    """Планы запросов страниц заметок."""
+
+    def test_views_use_indexes(self):
+        """Тест: Запросы страниц заметок обходятся без полного скана
+        таблиц и временной сортировки
+        """
+        for url in (
+            self.home_url,
+            self.list_url,
+            self.add_url,
+            self.detail_url,
+            self.edit_url,
+            self.delete_url,
+            self.success_url,
+        ):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    self.author_client.get(url)
+                steps = bad_plan_steps(context.captured_queries)
+                self.assertFalse(steps, '\n'.join(steps))
+
+    def test_slug_collision_uses_index(self):
+        """Тест: Поиск свободного суффикса slug идёт по индексу"""
+        data = {'title': self.notes.title, 'text': 'Текст'}
+        with CaptureQueriesContext(connection) as context:
+            self.author_client.post(self.add_url, data=data)
+        steps = bad_plan_steps(context.captured_queries)
+        self.assertFalse(steps, '\n'.join(steps))
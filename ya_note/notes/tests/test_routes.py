@@ -1,7 +1,11 @@
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model  # type: ignore
+from django.urls import reverse  # type: ignore
+from django.utils.http import http_date  # type: ignore
 
+from notes.models import Note
+from shared.querybudget import QueryBudgetExceeded
 from .base_fixtures import NotesBaseTestCase
 
 User = get_user_model()
@@ -68,3 +72,59 @@ class TestRoutes(NotesBaseTestCase):
                 redirect_url = f'{self.login_url}?next={name}'
                 response = self.client.get(name)
                 self.assertRedirects(response, redirect_url)
+
+    def test_conditional_get_for_list_and_detail(self):
+        """Тест: список и заметка отдают 304 при совпадении ETag,
+        после изменения заметки и для другого пользователя — 200
+        """
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                etag = self.author_client.get(url)['ETag']
+                response = self.author_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+                response = self.reader_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertNotEqual(response.status_code,
+                                    HTTPStatus.NOT_MODIFIED)
+
+        etag = self.author_client.get(self.list_url)['ETag']
+        self.author_client.post(self.edit_url, data={
+            'title': self.notes.title,
+            'text': self.NEW_COMMENT_TEXT,
+            'slug': self.notes.slug,
+        })
+        response = self.author_client.get(
+            self.list_url, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_list_not_modified_only_by_etag(self):
+        """Тест: список заметок не отдаёт Last-Modified и не отвечает
+        304 по If-Modified-Since после удаления самой новой заметки
+        """
+        newest = Note.objects.create(
+            title='Новая', text='Текст', author=self.author
+        )
+        response = self.author_client.get(self.list_url)
+        self.assertFalse(response.has_header('Last-Modified'))
+        self.author_client.post(
+            reverse('notes:delete', args=(newest.slug,))
+        )
+        response = self.author_client.get(
+            self.list_url,
+            HTTP_IF_MODIFIED_SINCE=http_date(newest.updated.timestamp()),
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_query_budget_exceeded_raises(self):
+        """Тест: превышение бюджета SQL-запросов приводит к исключению"""
+        with self.settings(
+            QUERY_BUDGET_PER_VIEW={'notes:list': 1},
+            QUERY_BUDGET_RAISE=True,
+        ):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.author_client.get(self.list_url)
@@ -0,0 +1,49 @@
+"""Быстрый slugify, совместимый с pytils.translit.slugify.
+
+pytils проверяет вхождение каждого символа в список алфавита и
+прогоняет строку через сотню str.replace. Все шаги его slugify после
+замены пробелов дефисами работают посимвольно, поэтому здесь они
+сведены к одному регулярному выражению, выбрасывающему символы вне
+алфавита, и одной таблице str.translate. Таблица строится при импорте
+из таблицы самого pytils. Результаты для повторяющихся заголовков
+запоминаются.
+"""
+import re
+from functools import lru_cache
+
+from pytils.translit import ALPHABET, TRANSTABLE
+
+CACHE_SIZE = 4096
+
+AMPERSAND_RE = re.compile(r'&amp;|&')
+SEPARATORS_RE = re.compile(r'[-\s]+')
+# После translify pytils удаляет всё, кроме букв, цифр, пробелов и '-'.
+REMOVED_RE = re.compile(r'[^\w\s-]')
+
+
+def build_table():
+    """Символ алфавита -> его итог в slug pytils."""
+    table = {}
+    for symbol, replacement in TRANSTABLE:
+        # translify применяет замены по порядку: действует первая.
+        if len(symbol) == 1 and ord(symbol) not in table:
+            table[ord(symbol)] = REMOVED_RE.sub('', replacement).lower()
+    for symbol in ALPHABET:
+        # Символы английской части алфавита остаются как есть.
+        if len(symbol) == 1 and ord(symbol) not in table:
+            table[ord(symbol)] = REMOVED_RE.sub('', symbol).lower()
+    return table
+
+
+TABLE = build_table()
+NOT_IN_ALPHABET_RE = re.compile(
+    '[^' + ''.join(re.escape(chr(code)) for code in sorted(TABLE)) + ']+'
+)
+
+
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def slugify(value):
+    """Slug строки, посимвольно совпадающий с pytils."""
+    value = AMPERSAND_RE.sub(' and ', str(value).lower())
+    value = SEPARATORS_RE.sub('-', value)
+    return NOT_IN_ALPHABET_RE.sub('', value).translate(TABLE)
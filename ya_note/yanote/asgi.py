@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
 
 application = get_asgi_application()
+
+if settings.SERVE_STATIC:
+    from shared.staticfiles import ASGIPrecompressedStaticFilesHandler
+
+    application = ASGIPrecompressedStaticFilesHandler(application)
+
+if settings.WARMUP_ON_START:
+    from shared.warmup import warm_up
+
+    warm_up()
@@ -1,9 +1,14 @@
+import sys
 from pathlib import Path
 
 from django.urls import reverse_lazy
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Общий для проектов пакет shared лежит в корне репозитория.
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.append(str(BASE_DIR.parent))
+
 SECRET_KEY = 'django-insecure-yipnj$#j!ajarq%k55z4kuf3x79)91h0h42o9!1ho(z=!%mt=#'
 
 DEBUG = False
@@ -18,10 +23,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'shared.apps.SharedConfig',
     'notes.apps.NotesConfig'
 ]
 
 MIDDLEWARE = [
+    'shared.querybudget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,10 +59,16 @@ TEMPLATES = [
 WSGI_APPLICATION = 'yanote.wsgi.application'
 
 
+# PRAGMA соединений задаются в OPTIONS['pragmas'], см. shared/sqlite.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'shared.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        # Тестовая БД в файле: в памяти SQLite блокирует таблицу целиком,
+        # и одновременные записи из потоков сразу падают, не дожидаясь
+        # busy_timeout.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
@@ -83,7 +96,34 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# Сторонние файлы в STATICFILES_DIRS: путь -> (источник, хэш SRI).
+# Загружаются командой vendor_static.
+VENDORED_STATIC = {
+    'vendor/bootstrap-5.0.1/bootstrap.min.css': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.0.1/dist/css/'
+        'bootstrap.min.css',
+        'sha384-+0n0xVW2eSR5OomGNYDnhzAbDsOXxcvSN1TPprVMTNDbiYZCxYbOOl7+AMvyTG2x',
+    ),
+}
+
+# Раздавать STATIC_ROOT из процесса приложения, см. shared/staticfiles.py.
+SERVE_STATIC = False
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+# Бюджет SQL-запросов на HTTP-запрос, см. shared/querybudget.py.
+QUERY_BUDGET = 10
+QUERY_BUDGET_PER_VIEW = {}
+QUERY_BUDGET_REPEATED_THRESHOLD = 3
+QUERY_BUDGET_RAISE = False
+QUERY_BUDGET_STATS_FILE = None
+
+# Прогрев шаблонов и URL при старте процесса, см. shared/warmup.py.
+WARMUP_ON_START = False
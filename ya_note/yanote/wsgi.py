@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
 
 application = get_wsgi_application()
+
+if settings.SERVE_STATIC:
+    from shared.staticfiles import PrecompressedStaticFilesHandler
+
+    application = PrecompressedStaticFilesHandler(application)
+
+if settings.WARMUP_ON_START:
+    from shared.warmup import warm_up
+
+    warm_up()